@@ -0,0 +1,262 @@
+"""Per-field accuracy and latency scorecard over a labelled resume corpus.
+
+Runs ResumeProcessor.process_resume over every file listed in a corpus's
+labels.jsonl and reports, for each field, precision and recall against the
+labels next to the extractor's p50/p95 latency, so a speed-up and any
+accuracy it costs show up in one table. Labels are one JSON object per line,
+as resume_corpus.py writes them; hand-labelled corpora use the same format,
+with null or a missing key for fields a file does not state:
+
+    {"file": "cv_001.pdf", "fields": {"name": "Sara Kamel", "age": 31, "email": null}}
+
+--save stores the scorecard; --baseline prints the change in every figure
+against a stored one and exits non-zero when a field's F1 drops by more
+than --max-f1-drop:
+
+    python benchmarks/accuracy_scorecard.py --generate 400 --save scorecard.json
+    python benchmarks/accuracy_scorecard.py corpus/ --baseline scorecard.json
+
+--min-f1 FIELD=F1 fails the run when a field scores below a fixed floor;
+with --layout and --format it checks one kind of resume. Table-layout DOCX
+files, whose label and value cells must stay on one line, are checked with:
+
+    python benchmarks/accuracy_scorecard.py --generate 40 --layout table --format docx \
+        --min-f1 name=1 --min-f1 current_residence=1 --min-f1 nationality=1
+"""
+import argparse
+import json
+import re
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'bin'))
+
+from Resume_Processor import FIELD_EXTRACTORS, ResumeProcessor  # noqa: E402
+from Telemetry import TELEMETRY  # noqa: E402
+from resume_corpus import FORMATS, LAYOUTS, age_on, generate_corpus  # noqa: E402
+
+
+def normalize(value) -> str:
+    """Casefolded words, without punctuation or extra spaces"""
+    return ' '.join(re.sub(r'[^\w@.+]+', ' ', str(value)).casefold().split())
+
+
+def same_text(predicted, expected) -> bool:
+    return normalize(predicted) == normalize(expected)
+
+
+def overlapping_text(predicted, expected) -> bool:
+    """Either contains the other, as "Cairo" does "Cairo, Egypt"; fragments under 3 characters don't count"""
+    predicted, expected = normalize(predicted), normalize(expected)
+    if len(predicted) < 3:
+        return False
+    return predicted in expected or expected in predicted
+
+
+def same_phone(predicted, expected) -> bool:
+    """Same number, allowing one side to leave out the country code"""
+    predicted, expected = re.sub(r'\D', '', str(predicted)), re.sub(r'\D', '', str(expected))
+    if len(predicted) < 7 or len(expected) < 7:
+        return False
+    shorter, longer = sorted((predicted, expected), key=len)
+    return longer.endswith(shorter.lstrip('0'))
+
+
+def same_age(predicted, expected) -> bool:
+    return int(predicted) == int(expected)
+
+
+# How a predicted value is compared with its label, per field
+MATCHERS: Dict[str, Callable] = {
+    'name': same_text,
+    'age': same_age,
+    'education': overlapping_text,
+    'current_role': overlapping_text,
+    'current_residence': overlapping_text,
+    'nationality': overlapping_text,
+    'email': same_text,
+    'phone': same_phone,
+}
+
+
+def expected_value(fields: Dict, field: str, today: date):
+    """A file's label for a field; the age of a labelled date of birth is worked out as of today"""
+    if field == 'age' and fields.get('age') is None and fields.get('birth_date'):
+        return age_on(date.fromisoformat(fields['birth_date']), today)
+    return fields.get(field)
+
+
+class FieldScore:
+    """Precision and recall of one field over the corpus"""
+
+    def __init__(self, field: str):
+        self.matcher = MATCHERS[field]
+        self.true_positives = 0
+        self.false_positives = 0
+        self.false_negatives = 0
+        # (file, predicted, expected) of every wrong, missing or unexpected value
+        self.misses = []
+
+    def add(self, file: str, predicted, expected):
+        """Score one value; a wrong value counts against both precision and recall"""
+        found = predicted not in (None, '', 0)
+        labelled = expected not in (None, '')
+        if found and labelled and self.matcher(predicted, expected):
+            self.true_positives += 1
+            return
+        if found:
+            self.false_positives += 1
+        if labelled:
+            self.false_negatives += 1
+        if found or labelled:
+            self.misses.append((file, predicted, expected))
+
+    @property
+    def precision(self) -> float:
+        found = self.true_positives + self.false_positives
+        return self.true_positives / found if found else 0.0
+
+    @property
+    def recall(self) -> float:
+        labelled = self.true_positives + self.false_negatives
+        return self.true_positives / labelled if labelled else 0.0
+
+    @property
+    def f1(self) -> float:
+        total = self.precision + self.recall
+        return 2 * self.precision * self.recall / total if total else 0.0
+
+
+def load_labels(corpus_dir: Path) -> List[Dict]:
+    with open(corpus_dir / 'labels.jsonl', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def score_corpus(corpus_dir: Path, labels: List[Dict], today: date) -> Dict:
+    """Process every labelled file and score each field, with the latencies the stage timers recorded"""
+    processor = ResumeProcessor()  # No cache: every field is really extracted
+    scores = {field: FieldScore(field) for field in FIELD_EXTRACTORS}
+    TELEMETRY.reset()
+
+    for record in labels:
+        profile = processor.process_resume(str(corpus_dir / record['file']))
+        for field, score in scores.items():
+            if field in record['fields']:
+                score.add(record['file'], getattr(profile, field),
+                          expected_value(record['fields'], field, today))
+
+    stages = TELEMETRY.take()
+    report = {}
+    for field, score in scores.items():
+        stats = stages.get(FIELD_EXTRACTORS[field])
+        report[field] = {
+            'precision': round(score.precision, 4),
+            'recall': round(score.recall, 4),
+            'f1': round(score.f1, 4),
+            'labelled': score.true_positives + score.false_negatives,
+            'p50_ms': round(stats.quantile(0.5) * 1000, 4) if stats else 0.0,
+            'p95_ms': round(stats.quantile(0.95) * 1000, 4) if stats else 0.0,
+            'misses': [{'file': file, 'predicted': predicted, 'expected': expected}
+                       for file, predicted, expected in score.misses],
+        }
+    text = stages.get('text')
+    return {
+        'files': len(labels),
+        'fields': report,
+        'text_p50_ms': round(text.quantile(0.5) * 1000, 4) if text else 0.0,
+        'text_p95_ms': round(text.quantile(0.95) * 1000, 4) if text else 0.0,
+    }
+
+
+def print_scorecard(scorecard: Dict, baseline: Dict = None, show_misses: int = 0):
+    before = (baseline or {}).get('fields', {})
+    columns = ('precision', 'recall', 'f1', 'p50_ms', 'p95_ms')
+    width = 19 if baseline else 11
+    print(f"\n{'field':<20}{'labelled':>9}" + ''.join(f"{column:>{width}}" for column in columns))
+    for field, row in scorecard['fields'].items():
+        cells = []
+        for column in columns:
+            cell = f"{row[column]:.3f}"
+            if field in before:
+                cell += f" ({row[column] - before[field][column]:+.3f})"
+            cells.append(f"{cell:>{width}}")
+        print(f"{field:<20}{row['labelled']:>9}" + ''.join(cells))
+        for miss in row['misses'][:show_misses]:
+            print(f"    {miss['file']}: got {miss['predicted']!r}, expected {miss['expected']!r}")
+    print(f"\nText extraction p50 {scorecard['text_p50_ms']:.1f} ms, p95 {scorecard['text_p95_ms']:.1f} ms "
+          f"over {scorecard['files']} files. Latencies are the field extractors' own, from the stage timers.")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus', nargs='?', help="Directory holding the resumes and their labels.jsonl")
+    parser.add_argument('--generate', type=int, metavar='COUNT',
+                        help="Score a synthetic corpus of COUNT resumes instead")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the synthetic corpus")
+    parser.add_argument('--layout', action='append', choices=LAYOUTS, dest='layouts',
+                        help="Layout of the synthetic corpus (repeatable; default: all)")
+    parser.add_argument('--format', action='append', choices=FORMATS, dest='formats',
+                        help="Format of the synthetic corpus (repeatable; default: all)")
+    parser.add_argument('--show-misses', type=int, default=0, metavar='N',
+                        help="Print up to N wrong or missing values per field")
+    parser.add_argument('--save', metavar='PATH', help="Store the scorecard as JSON")
+    parser.add_argument('--baseline', metavar='PATH', help="Scorecard to compare against")
+    parser.add_argument('--max-f1-drop', type=float, default=0.0,
+                        help="Largest F1 drop of a field against the baseline that still passes")
+    parser.add_argument('--min-f1', action='append', default=[], metavar='FIELD=F1',
+                        help="Lowest F1 a field may score (repeatable)")
+    args = parser.parse_args(argv)
+
+    if not args.corpus and not args.generate:
+        parser.error("give a labelled corpus directory or --generate COUNT")
+    floors = {}
+    for floor in args.min_f1:
+        field, _, value = floor.partition('=')
+        if field not in FIELD_EXTRACTORS:
+            parser.error(f"unknown field in --min-f1: {field}")
+        try:
+            floors[field] = float(value)
+        except ValueError:
+            parser.error(f"--min-f1 needs FIELD=F1, got {floor}")
+
+    with tempfile.TemporaryDirectory(prefix='resume_corpus_') as generated_dir:
+        if args.generate:
+            generate_corpus(generated_dir, args.generate, args.seed, args.formats or list(FORMATS),
+                            args.layouts or list(LAYOUTS))
+        corpus_dir = Path(generated_dir if args.generate else args.corpus)
+        try:
+            labels = load_labels(corpus_dir)
+        except OSError as e:
+            print(f"Cannot read labels: {e}", file=sys.stderr)
+            return 1
+        print(f"Scoring {len(labels)} labelled resumes...")
+        scorecard = score_corpus(corpus_dir, labels, date.today())
+
+    baseline = None
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+    print_scorecard(scorecard, baseline, args.show_misses)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(scorecard, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        print(f"Scorecard saved to {args.save}")
+
+    failed = False
+    if baseline:
+        dropped = [field for field, row in scorecard['fields'].items()
+                   if field in baseline['fields'] and baseline['fields'][field]['f1'] - row['f1'] > args.max_f1_drop]
+        if dropped:
+            print(f"F1 dropped for: {', '.join(dropped)}")
+            failed = True
+    below = [field for field, floor in floors.items() if scorecard['fields'][field]['f1'] < floor]
+    if below:
+        print(f"F1 below its floor for: {', '.join(below)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""Extraction microbenchmarks with stored baselines and regression checks.
+
+Times extract_text_from_file per file format, every field extractor in
+FIELD_EXTRACTORS, and process_resume end to end, over resume files or
+directories, or over a synthetic corpus from resume_corpus.py (--generate).
+--save stores the results as a baseline JSON. --baseline compares against
+one and exits non-zero when a benchmark's median per call got slower by
+more than --threshold (and by more than --min-delta-ms, so microsecond
+jitter does not count):
+
+    python benchmarks/extraction_bench.py --generate 400 --save benchmarks/baseline.json
+    python benchmarks/extraction_bench.py --generate 400 --baseline benchmarks/baseline.json
+"""
+import argparse
+import gc
+import json
+import math
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'bin'))
+
+from Resume_Processor import FIELD_EXTRACTORS, ResumeProcessor  # noqa: E402
+from Section_Segmenter import segment_sections  # noqa: E402
+from Text_Backends import SUPPORTED_EXTENSIONS  # noqa: E402
+from resume_config import FIELD_SECTIONS  # noqa: E402
+from resume_corpus import generate_corpus  # noqa: E402
+
+
+def iter_resumes(paths: List[str]):
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(child for child in path.rglob('*') if child.suffix.lower() in SUPPORTED_EXTENSIONS)
+        elif path.is_file():
+            yield path
+
+
+def best_time(call: Callable, repeats: int) -> float:
+    best = math.inf
+    for _ in range(repeats):
+        started = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def summarize(times: List[float]) -> Dict:
+    times = sorted(times)
+    return {
+        'count': len(times),
+        'median_seconds': times[len(times) // 2],
+        'p95_seconds': times[min(int(len(times) * 0.95), len(times) - 1)],
+        'total_seconds': sum(times),
+    }
+
+
+def run_benchmarks(files: List[Path], repeats: int) -> Dict[str, Dict]:
+    """Per-call timings of each benchmark, keeping the best of `repeats` calls per file"""
+    processor = ResumeProcessor()  # No cache: every call does the full work
+    timings: Dict[str, List[float]] = {}
+    texts = []
+
+    # Warm up lazy imports and backends, so the first file of each format isn't charged for them
+    for path in {path.suffix.lower(): path for path in files}.values():
+        processor.process_resume(str(path))
+    gc.collect()
+
+    for path in files:
+        text = processor.extract_text_from_file(str(path))
+        elapsed = best_time(lambda: processor.extract_text_from_file(str(path)), repeats)
+        timings.setdefault(f"text/{path.suffix.lower().lstrip('.')}", []).append(elapsed)
+        if text:
+            texts.append(text)
+    gc.collect()
+
+    for field, method in FIELD_EXTRACTORS.items():
+        extractor = getattr(processor, method)
+        for text in texts:
+            # Called as extract_fields calls it; segmenting is not charged to the extractor
+            options = {'sections': segment_sections(text)} if field in FIELD_SECTIONS else {}
+            timings.setdefault(f"field/{method}", []).append(
+                best_time(lambda: extractor(text, **options), repeats))
+    gc.collect()
+
+    for path in files:
+        timings.setdefault('process_resume', []).append(
+            best_time(lambda: processor.process_resume(str(path)), repeats))
+
+    return {name: summarize(times) for name, times in sorted(timings.items())}
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float, min_delta: float) -> List[str]:
+    """Print each benchmark against its baseline; return the names of the regressions"""
+    regressions = []
+    print(f"\n{'benchmark':<40}{'baseline':>12}{'now':>12}{'change':>10}")
+    for name, stats in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<40}{'-':>12}{stats['median_seconds'] * 1000:>10.3f}ms{'new':>10}")
+            continue
+        old, new = before['median_seconds'], stats['median_seconds']
+        change = (new - old) / old if old else 0.0
+        regressed = change > threshold and new - old > min_delta
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<40}{old * 1000:>10.3f}ms{new * 1000:>10.3f}ms{change:>+9.0%}{' REGRESSED' if regressed else ''}")
+    return regressions
+
+
+def environment() -> Dict:
+    return {'python': platform.python_version(), 'machine': platform.machine(),
+            'processor': platform.processor(), 'system': platform.system()}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='*', help="Resume files or directories to benchmark")
+    parser.add_argument('--generate', type=int, metavar='COUNT',
+                        help="Benchmark a synthetic corpus of COUNT resumes instead")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the synthetic corpus")
+    parser.add_argument('--repeats', type=int, default=3, help="Calls per file and benchmark; the best time is kept")
+    parser.add_argument('--save', metavar='PATH', help="Store the results as a baseline")
+    parser.add_argument('--baseline', metavar='PATH', help="Baseline to compare against")
+    parser.add_argument('--threshold', type=float, default=0.3,
+                        help="Slowdown of a median that counts as a regression (0.3 = 30%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=0.05,
+                        help="Smallest absolute slowdown of a median that counts as a regression")
+    args = parser.parse_args(argv)
+
+    if not args.paths and not args.generate:
+        parser.error("give resume paths or --generate COUNT")
+
+    with tempfile.TemporaryDirectory(prefix='resume_corpus_') as corpus_dir:
+        if args.generate:
+            generate_corpus(corpus_dir, args.generate, args.seed)
+            files = list(iter_resumes([corpus_dir]))
+            corpus = {'generated': args.generate, 'seed': args.seed}
+        else:
+            files = list(iter_resumes(args.paths))
+            corpus = {'paths': args.paths, 'files': len(files)}
+        if not files:
+            print("No resume files found", file=sys.stderr)
+            return 1
+        print(f"Benchmarking {len(files)} resumes, best of {args.repeats} calls each...")
+        results = run_benchmarks(files, args.repeats)
+
+    print(f"\n{'benchmark':<40}{'calls':>7}{'median':>12}{'p95':>12}{'total':>10}")
+    for name, stats in results.items():
+        print(f"{name:<40}{stats['count']:>7}{stats['median_seconds'] * 1000:>10.3f}ms"
+              f"{stats['p95_seconds'] * 1000:>10.3f}ms{stats['total_seconds']:>9.2f}s")
+
+    run = {'environment': environment(), 'corpus': corpus, 'repeats': args.repeats, 'benchmarks': results}
+    if args.save:
+        Path(args.save).write_text(json.dumps(run, indent=2) + '\n', encoding='utf-8')
+        print(f"\nBaseline saved to {args.save}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        if baseline.get('environment') != run['environment'] or baseline.get('corpus') != corpus:
+            print("\nWarning: the baseline was recorded on another machine, interpreter or corpus; "
+                  "differences may not be regressions", file=sys.stderr)
+        regressions = compare(results, baseline['benchmarks'], args.threshold, args.min_delta_ms / 1000)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: "
+                  + ', '.join(regressions))
+            return 1
+        print("\nNo regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Side-by-side speed and text-fidelity benchmark for the PDF text backends.
+
+Reads every page of every PDF with each backend and reports the time taken
+and how closely the words match pdfplumber's output (1.00 = identical
+word sequence). Also reports which files the 'auto' backend handed over to
+pdfplumber because the fast output looked broken:
+
+    python benchmarks/pdf_backends.py resumes/ --repeats 3
+
+Speed alone does not decide the backend: a backend passes the fidelity gate
+only when its worst file keeps at least --min-similarity of pdfplumber's
+word order, and the script exits non-zero when one it compared does not.
+Run it over a sample of your own resumes before changing PDF_TEXT_BACKEND.
+"""
+import argparse
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'bin'))
+
+from Text_Backends import PDF_BACKENDS, looks_broken  # noqa: E402
+from resume_config import PDF_FAST_MIN_SIMILARITY  # noqa: E402
+
+REFERENCE_BACKEND = 'pdfplumber'
+
+
+def iter_pdfs(paths: List[str]):
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(child for child in path.rglob('*') if child.suffix.lower() == '.pdf')
+        elif path.is_file():
+            yield path
+
+
+def read_pages(backend: str, pdf: Path, repeats: int):
+    """Pages read by a backend and its best time over the repeats"""
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        pages = list(PDF_BACKENDS[backend].iter_pages(pdf))
+        best = min(best, time.perf_counter() - started)
+    return pages, best
+
+
+def word_similarity(text: str, reference: str) -> float:
+    return SequenceMatcher(None, text.split(), reference.split(), autojunk=False).ratio()
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+', help="PDF files or directories to read")
+    parser.add_argument('--backend', action='append', choices=sorted(PDF_BACKENDS),
+                        help="Backend to compare (repeatable; default: all)")
+    parser.add_argument('--repeats', type=int, default=1, help="Reads per file and backend; the best time is kept")
+    parser.add_argument('--min-similarity', type=float, default=PDF_FAST_MIN_SIMILARITY,
+                        help="Lowest word-order similarity to pdfplumber a backend may have on any file")
+    args = parser.parse_args(argv)
+
+    backends = args.backend or sorted(PDF_BACKENDS)
+    pdfs = list(iter_pdfs(args.paths))
+    if not pdfs:
+        print("No PDF files found", file=sys.stderr)
+        return 1
+
+    totals: Dict[str, float] = {backend: 0.0 for backend in backends}
+    fidelity: Dict[str, List[float]] = {backend: [] for backend in backends}
+    print(f"{'file':<40}{'pages':>6}" + ''.join(f"{backend:>22}" for backend in backends))
+
+    for pdf in pdfs:
+        reference_pages, _ = read_pages(REFERENCE_BACKEND, pdf, 1)
+        reference = '\n'.join(reference_pages)
+        cells = []
+        for backend in backends:
+            pages, elapsed = read_pages(backend, pdf, args.repeats)
+            similarity = word_similarity('\n'.join(pages), reference)
+            totals[backend] += elapsed
+            fidelity[backend].append(similarity)
+            broken = '!' if any(looks_broken(page) for page in pages) else ' '
+            cells.append(f"{elapsed * 1000:>11.1f}ms {similarity:>6.2f}{broken}")
+        print(f"{pdf.name[:39]:<40}{len(reference_pages):>6}" + ''.join(f"{cell:>22}" for cell in cells))
+
+    print(f"\n{'total':<46}" + ''.join(
+        f"{totals[backend]:>13.2f}s {sum(fidelity[backend]) / len(pdfs):>6.2f} " for backend in backends))
+    print("Times are the best of --repeats reads; similarity is against pdfplumber; "
+          "'!' marks output with pages that look broken.")
+
+    failed = []
+    print(f"\nFidelity gate (every file at least {args.min_similarity:.2f} similar to {REFERENCE_BACKEND}):")
+    for backend in backends:
+        if backend == REFERENCE_BACKEND:
+            continue
+        worst = min(fidelity[backend])
+        below = sum(similarity < args.min_similarity for similarity in fidelity[backend])
+        verdict = 'pass' if not below else f"FAIL ({below} of {len(pdfs)} files below)"
+        print(f"  {backend:<12} worst {worst:.2f}  {verdict}")
+        if below:
+            failed.append(backend)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
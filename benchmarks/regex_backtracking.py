@@ -0,0 +1,133 @@
+"""Adversarial regex benchmark for the resume_config pattern families.
+
+Times every pattern against generated worst-case inputs (very long lines,
+repeated headers, mixed Arabic/Latin text, runs of capitalized words) at
+growing sizes. Exits non-zero when a pattern's running time grows faster
+than --max-exponent with input size, or when it hits its execution budget:
+
+    python benchmarks/regex_backtracking.py --size 2000
+"""
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'bin'))
+
+from Regex_Guard import PatternBudget, RegexBudgetExceeded  # noqa: E402
+import Resume_Processor  # noqa: E402
+
+PACKS = {
+    'NAME_PATTERNS': Resume_Processor.NAME_PACK,
+    'BILINGUAL_PATTERNS': Resume_Processor.BILINGUAL_PACK,
+    'TABLE_PATTERNS': Resume_Processor.TABLE_PACK,
+    'EDUCATION_PATTERNS': Resume_Processor.EDUCATION_PACK,
+    'ROLE_PATTERNS': Resume_Processor.ROLE_PACK,
+    'LOCATION_LABEL_PATTERNS': Resume_Processor.LOCATION_LABEL_PACK,
+    'NATIONALITY_PATTERNS': Resume_Processor.NATIONALITY_PACK,
+}
+
+
+def long_line(n: int) -> str:
+    """One line of n words with no line break, as pdfplumber emits for broken layouts"""
+    words = ['Name', 'Education', 'Experience', 'Position', 'Bachelor', 'Address', 'Nationality', 'of', 'in']
+    return ' '.join(words[i % len(words)] for i in range(n))
+
+
+def repeated_headers(n: int) -> str:
+    """Section headers repeated n times with nothing under them"""
+    block = "Name\nEducation\nQualification\nExperience\nCurrent Position\nNationality\nAddress\n"
+    return block * max(n // 8, 1)
+
+
+def mixed_scripts(n: int) -> str:
+    """Arabic labels interleaved with Latin text on the same and following lines"""
+    block = "االسم\nName\nالاسم الكامل Full Name\nالمؤهل Education البكالوريوس\nالجنسية Nationality\n"
+    return block * max(n // 10, 1)
+
+
+def capitalized_run(n: int) -> str:
+    """n capitalized words after a label, the worst case for name patterns"""
+    return "Name: " + ' '.join('Abcdef' for _ in range(n)) + "\n"
+
+
+def unterminated_fields(n: int) -> str:
+    """Labels followed by long text that never reaches the expected terminator"""
+    return ''.join(f"Degree in: {'x' * 40} \nPosition: " for _ in range(max(n // 8, 1)))
+
+
+INPUTS: Dict[str, Callable[[int], str]] = {
+    'long_line': long_line,
+    'repeated_headers': repeated_headers,
+    'mixed_scripts': mixed_scripts,
+    'capitalized_run': capitalized_run,
+    'unterminated_fields': unterminated_fields,
+}
+
+
+def time_pattern(pattern, text: str, label: str, budget: float, repeats: int) -> float:
+    """Best time to run the pattern over the whole text, like re.findall"""
+    best = math.inf
+    for _ in range(repeats):
+        guard = PatternBudget(label, budget)
+        start = time.perf_counter()
+        guard.run(lambda: sum(1 for _ in pattern.finditer(text)))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def growth_exponent(sizes: List[int], timings: List[float]) -> float:
+    """Slope of log(time) against log(size): 1 is linear, 2 quadratic"""
+    floor = 1e-5  # below this the timings are noise
+    if timings[-1] < floor:
+        return 0.0
+    first = max(timings[0], floor)
+    return math.log(timings[-1] / first) / math.log(sizes[-1] / sizes[0])
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time every resume pattern against worst-case inputs")
+    parser.add_argument('--size', type=int, default=2000, help="Smallest input size, doubled twice")
+    parser.add_argument('--repeats', type=int, default=3, help="Runs per measurement, the best is kept")
+    parser.add_argument('--budget', type=float, default=5.0, help="Seconds a pattern may take on one input")
+    parser.add_argument('--max-exponent', type=float, default=1.5,
+                        help="Largest acceptable growth exponent (default: %(default)s)")
+    parser.add_argument('--family', action='append', choices=sorted(PACKS), help="Only benchmark these families")
+    args = parser.parse_args(argv)
+
+    sizes = [args.size, args.size * 2, args.size * 4]
+    failures = []
+    print(f"{'pattern':<28}{'input':<22}" + ''.join(f"{f'n={size}':>12}" for size in sizes) + f"{'exponent':>10}")
+
+    for family in args.family or PACKS:
+        pack = PACKS[family]
+        for index, pattern in enumerate(pack.compiled):
+            label = f"{family}[{index}]"
+            for input_name, generate in INPUTS.items():
+                timings = []
+                try:
+                    for size in sizes:
+                        timings.append(time_pattern(pattern, generate(size), label, args.budget, args.repeats))
+                except RegexBudgetExceeded:
+                    failures.append(f"{label} on {input_name}: exceeded the {args.budget}s budget")
+                    print(f"{label:<28}{input_name:<22}{'budget exceeded':>36}")
+                    continue
+
+                exponent = growth_exponent(sizes, timings)
+                print(f"{label:<28}{input_name:<22}" + ''.join(f"{t * 1000:>10.2f}ms" for t in timings)
+                      + f"{exponent:>10.2f}")
+                if exponent > args.max_exponent:
+                    failures.append(f"{label} on {input_name}: grows as n^{exponent:.2f}")
+
+    if failures:
+        print(f"\n{len(failures)} super-linear pattern/input pairs:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,440 @@
+"""Reproducible synthetic resume corpus for benchmarks and accuracy checks.
+
+Writes CVs in four layouts: plain English, bilingual Arabic/English,
+label/value tables, and spaced-letter headers ("E D U C A T I O N"). Each
+comes as TXT or DOCX, or as PDF when reportlab is installed. Bilingual PDFs
+also need --pdf-font, a TrueType font with Arabic glyphs; without it that
+layout is written in the other formats only. The same --seed always gives
+the same resumes (DOCX files differ only in their zip timestamps). labels.jsonl beside them holds the true field values of
+each file, one JSON object per line:
+
+    python benchmarks/resume_corpus.py corpus/ --count 2000 --seed 7
+"""
+import argparse
+import json
+import random
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+LAYOUTS = ('english', 'bilingual', 'table', 'spaced')
+FORMATS = ('txt', 'docx', 'pdf')
+
+# (English, Arabic) name pairs, so bilingual CVs carry the same name twice
+FIRST_NAMES = [
+    ('Ahmed', 'أحمد'), ('Mohamed', 'محمد'), ('Omar', 'عمر'), ('Youssef', 'يوسف'), ('Khaled', 'خالد'),
+    ('Mahmoud', 'محمود'), ('Hassan', 'حسن'), ('Ibrahim', 'إبراهيم'), ('Tarek', 'طارق'), ('Karim', 'كريم'),
+    ('Sara', 'سارة'), ('Mona', 'منى'), ('Nour', 'نور'), ('Fatma', 'فاطمة'), ('Yasmin', 'ياسمين'),
+    ('Laila', 'ليلى'), ('Hana', 'هناء'), ('Rania', 'رانيا'), ('Salma', 'سلمى'), ('Dina', 'دينا'),
+]
+LAST_NAMES = [
+    ('Hassan', 'حسن'), ('Mostafa', 'مصطفى'), ('Abdelrahman', 'عبدالرحمن'), ('Saleh', 'صالح'),
+    ('Farouk', 'فاروق'), ('Nasser', 'ناصر'), ('Mansour', 'منصور'), ('Kamel', 'كامل'),
+    ('Ezzat', 'عزت'), ('Fathy', 'فتحي'), ('Shaker', 'شاكر'), ('Ramadan', 'رمضان'),
+]
+# (city, country, nationality)
+PLACES = [
+    ('Cairo', 'Egypt', 'Egyptian'), ('Alexandria', 'Egypt', 'Egyptian'), ('Giza', 'Egypt', 'Egyptian'),
+    ('Riyadh', 'Saudi Arabia', 'Saudi'), ('Jeddah', 'Saudi Arabia', 'Saudi'), ('Dubai', 'United Arab Emirates', 'Emirati'),
+    ('Amman', 'Jordan', 'Jordanian'), ('Beirut', 'Lebanon', 'Lebanese'), ('Doha', 'Qatar', 'Qatari'),
+    ('Kuwait City', 'Kuwait', 'Kuwaiti'), ('Muscat', 'Oman', 'Omani'), ('Tunis', 'Tunisia', 'Tunisian'),
+    ('London', 'United Kingdom', 'British'), ('Berlin', 'Germany', 'German'), ('Madrid', 'Spain', 'Spanish'),
+]
+DEGREES = [
+    'Bachelor of Science in Computer Science', 'Bachelor of Engineering in Electrical Engineering',
+    'Bachelor of Commerce in Business Administration', 'Master of Science in Data Science',
+    'Bachelor of Arts in English Literature', 'Master of Business Administration',
+    'Bachelor of Science in Chemistry', 'Bachelor of Pharmacy', 'Diploma in Information Technology',
+    'Bachelor of Science in Mechanical Engineering',
+]
+UNIVERSITIES = [
+    'Cairo University', 'Ain Shams University', 'Alexandria University', 'American University in Cairo',
+    'King Saud University', 'University of Jordan', 'Qatar University', 'Helwan University',
+]
+ROLES = [
+    'Software Engineer', 'Senior Software Engineer', 'Data Analyst', 'Project Manager', 'Quality Engineer',
+    'Accountant', 'Sales Representative', 'Network Administrator', 'Marketing Specialist',
+    'Mechanical Engineer', 'HR Coordinator', 'Pharmacist', 'Operations Manager', 'Translator',
+]
+COMPANIES = [
+    'Orascom Construction', 'Vodafone Egypt', 'Raya Holding', 'Fawry', 'Aramex', 'Majid Al Futtaim',
+    'Emirates NBD', 'Etisalat', 'SABIC', 'Valeo', 'IBM', 'Siemens', 'Schneider Electric', 'Mondelez',
+]
+SKILLS = [
+    'Python', 'SQL', 'Excel', 'Power BI', 'Project planning', 'AutoCAD', 'SAP', 'Customer service',
+    'Negotiation', 'Linux', 'Networking', 'Technical writing', 'Team leadership', 'Budgeting',
+    'Quality control', 'Java', 'Data analysis', 'Public speaking', 'Scrum', 'Arabic', 'English',
+]
+DUTIES = [
+    'Led a team of {n} people delivering projects on time and within budget',
+    'Reduced processing time by {n}% through process automation',
+    'Prepared monthly reports for senior management',
+    'Coordinated with {n} departments to align requirements',
+    'Trained {n} new hires on internal tools and procedures',
+    'Maintained documentation and quality records',
+    'Handled a portfolio of {n} key accounts',
+]
+# CVs that state an age give it as of this date, so a seed gives the same text on any day
+AGE_REFERENCE_DATE = date(2025, 1, 1)
+
+# A document is a list of blocks: ('heading', text), ('line', text) or ('table', [(label, value), ...])
+Block = Tuple[str, object]
+
+
+def make_candidate(rng: random.Random, index: int) -> Dict:
+    """A random person with the facts a CV states about them"""
+    first, first_ar = rng.choice(FIRST_NAMES)
+    last, last_ar = rng.choice(LAST_NAMES)
+    middle, middle_ar = rng.choice(FIRST_NAMES) if rng.random() < 0.5 else ('', '')
+    city, country, nationality = rng.choice(PLACES)
+    birth = date(rng.randint(1965, 2000), rng.randint(1, 12), rng.randint(1, 28))
+    start = rng.randint(max(birth.year + 22, 2005), 2024)
+    jobs = [(rng.choice(ROLES), rng.choice(COMPANIES), start, None)]
+    end = start
+    for _ in range(rng.randint(0, 3)):
+        begin = end - rng.randint(1, 5)
+        if begin < birth.year + 21:
+            break
+        jobs.append((rng.choice(ROLES), rng.choice(COMPANIES), begin, end))
+        end = begin
+    return {
+        'name': ' '.join(part for part in (first, middle, last) if part),
+        'name_ar': ' '.join(part for part in (first_ar, middle_ar, last_ar) if part),
+        'email': f"{first.lower()}.{last.lower()}{index}@example.com",
+        'phone': f"+20{rng.choice(['10', '11', '12', '15'])}{rng.randint(10000000, 99999999)}",
+        'birth_date': birth,
+        # Some CVs give the age, the others only the date of birth
+        'states_age': rng.random() < 0.3,
+        'city': city,
+        'country': country,
+        'nationality': nationality,
+        'degree': rng.choice(DEGREES),
+        'university': rng.choice(UNIVERSITIES),
+        'graduation_year': min(birth.year + 22, start),
+        'jobs': jobs,
+        'skills': rng.sample(SKILLS, rng.randint(4, 9)),
+        'duties': [[rng.choice(DUTIES).format(n=rng.randint(2, 40)) for _ in range(rng.randint(2, 4))]
+                   for _ in jobs],
+    }
+
+
+def age_on(birth: date, today: date) -> int:
+    return today.year - birth.year - ((today.month, today.day) < (birth.month, birth.day))
+
+
+def _period(begin: int, end) -> str:
+    return f"{begin} - {end}" if end else f"{begin} - Present"
+
+
+def _experience(candidate: Dict) -> List[Block]:
+    blocks = []
+    for (role, company, begin, end), duties in zip(candidate['jobs'], candidate['duties']):
+        blocks.append(('line', role))
+        blocks.append(('line', f"{company} | {_period(begin, end)}"))
+        blocks.extend(('line', f"- {duty}") for duty in duties)
+    return blocks
+
+
+def _birth_line(candidate: Dict) -> str:
+    if candidate['states_age']:
+        return f"Age: {age_on(candidate['birth_date'], AGE_REFERENCE_DATE)}"
+    return f"Date of Birth: {candidate['birth_date']:%d/%m/%Y}"
+
+
+def english_layout(candidate: Dict) -> List[Block]:
+    return [
+        ('line', candidate['name']),
+        ('line', f"{candidate['city']}, {candidate['country']}"),
+        ('line', f"Email: {candidate['email']} | Phone: {candidate['phone']}"),
+        ('heading', 'PROFILE'),
+        ('line', f"{candidate['jobs'][0][0]} with {len(candidate['jobs'])} positions held "
+                 f"across {len({job[1] for job in candidate['jobs']})} companies."),
+        ('heading', 'PERSONAL INFORMATION'),
+        ('line', _birth_line(candidate)),
+        ('line', f"Nationality: {candidate['nationality']}"),
+        ('heading', 'EDUCATION'),
+        ('line', f"{candidate['degree']}, {candidate['university']} ({candidate['graduation_year']})"),
+        ('heading', 'WORK EXPERIENCE'),
+        *_experience(candidate),
+        ('heading', 'SKILLS'),
+        ('line', ', '.join(candidate['skills'])),
+    ]
+
+
+def bilingual_layout(candidate: Dict) -> List[Block]:
+    """Arabic label over English label, as in the Arabic/English forms the bilingual patterns target"""
+    role, company, begin, _ = candidate['jobs'][0]
+    return [
+        ('line', 'السيرة الذاتية'),
+        ('line', 'Curriculum Vitae'),
+        # Text extracted from Arabic PDFs splits the lam-alef ligature, so "الاسم" comes out as "االسم"
+        ('line', 'االسم'),
+        ('line', 'Name'),
+        ('line', candidate['name_ar']),
+        ('line', candidate['name']),
+        ('line', 'تاريخ الميلاد'),
+        ('line', _birth_line(candidate)),
+        ('line', 'الجنسية'),
+        ('line', f"Nationality: {candidate['nationality']}"),
+        ('line', 'العنوان'),
+        ('line', f"Address: {candidate['city']}, {candidate['country']}"),
+        ('line', 'البريد الإلكتروني'),
+        ('line', f"Email: {candidate['email']}"),
+        ('line', 'الهاتف'),
+        ('line', f"Phone: {candidate['phone']}"),
+        ('line', 'المؤهلات العلمية'),
+        ('line', 'Academic Qualifications'),
+        ('line', f"{candidate['degree']}, {candidate['university']} ({candidate['graduation_year']})"),
+        ('line', 'الوظيفة الحالية'),
+        ('line', 'Current Position'),
+        ('line', f"{role} at {company} from {begin} until now"),
+        ('line', 'الخبرة'),
+        ('line', 'Experience'),
+        *_experience(candidate),
+        ('line', 'المهارات'),
+        ('line', 'Skills'),
+        ('line', ', '.join(candidate['skills'])),
+    ]
+
+
+def table_layout(candidate: Dict) -> List[Block]:
+    role, company, begin, _ = candidate['jobs'][0]
+    birth = _birth_line(candidate).split(': ', 1)
+    return [
+        ('heading', 'Curriculum Vitae'),
+        ('table', [
+            ('Name', candidate['name']),
+            (birth[0], birth[1]),
+            ('Nationality', candidate['nationality']),
+            ('Address', f"{candidate['city']}, {candidate['country']}"),
+            ('Email', candidate['email']),
+            ('Phone', candidate['phone']),
+        ]),
+        ('heading', 'Academic Qualifications'),
+        ('table', [
+            ('Degree', candidate['degree']),
+            ('University', candidate['university']),
+            ('Year', str(candidate['graduation_year'])),
+        ]),
+        ('heading', 'Experience'),
+        ('table', [(_period(begin, end), f"{job_role}, {job_company}")
+                   for job_role, job_company, begin, end in candidate['jobs']]),
+        ('line', f"Current Position: {role}"),
+        ('heading', 'Skills'),
+        ('line', ', '.join(candidate['skills'])),
+    ]
+
+
+def _spaced(word: str) -> str:
+    return ' '.join(word.upper())
+
+
+def spaced_layout(candidate: Dict) -> List[Block]:
+    """Headers with their letters spaced out, as designer templates export them"""
+    return [
+        ('line', candidate['name']),
+        ('line', candidate['jobs'][0][0]),
+        ('heading', _spaced('Contact')),
+        ('line', f"Phone: {candidate['phone']}"),
+        ('line', f"Email: {candidate['email']}"),
+        ('line', f"Location: {candidate['city']}, {candidate['country']}"),
+        ('heading', _spaced('Personal')),
+        ('line', _birth_line(candidate)),
+        ('line', f"Nationality: {candidate['nationality']}"),
+        ('heading', _spaced('Education')),
+        ('line', f"{candidate['degree']}, {candidate['university']} ({candidate['graduation_year']})"),
+        ('heading', _spaced('Experience')),
+        *_experience(candidate),
+        ('heading', _spaced('Skills')),
+        ('line', ', '.join(candidate['skills'])),
+    ]
+
+
+LAYOUT_BUILDERS = {
+    'english': english_layout,
+    'bilingual': bilingual_layout,
+    'table': table_layout,
+    'spaced': spaced_layout,
+}
+
+
+def labels_for(candidate: Dict) -> Dict:
+    """The field values a perfect extraction would return.
+
+    A CV gives either the age or the date of birth; the other label is
+    None. The age of a date of birth depends on the day the CV is read.
+    """
+    residence = f"{candidate['city']}, {candidate['country']}"
+    return {
+        'name': candidate['name'],
+        'email': candidate['email'],
+        'phone': candidate['phone'],
+        'age': age_on(candidate['birth_date'], AGE_REFERENCE_DATE) if candidate['states_age'] else None,
+        'birth_date': None if candidate['states_age'] else candidate['birth_date'].isoformat(),
+        'nationality': candidate['nationality'],
+        'current_residence': residence,
+        'education': candidate['degree'],
+        'current_role': candidate['jobs'][0][0],
+    }
+
+
+# Writers
+
+def write_txt(blocks: List[Block], path: Path):
+    lines = []
+    for kind, content in blocks:
+        if kind == 'table':
+            lines.extend(f"| {label} | {value} |" for label, value in content)
+        else:
+            if kind == 'heading' and lines:
+                lines.append('')
+            lines.append(content)
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def write_docx(blocks: List[Block], path: Path):
+    from docx import Document
+
+    document = Document()
+    for kind, content in blocks:
+        if kind == 'heading':
+            document.add_paragraph().add_run(content).bold = True
+        elif kind == 'table':
+            table = document.add_table(rows=len(content), cols=2)
+            table.style = 'Table Grid'
+            for row, (label, value) in zip(table.rows, content):
+                row.cells[0].text = label
+                row.cells[1].text = value
+        else:
+            document.add_paragraph(content)
+    document.save(str(path))
+
+
+def pdf_available() -> bool:
+    try:
+        import reportlab  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def write_pdf(blocks: List[Block], path: Path, font_path: str = None):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    font = 'Helvetica'
+    if font_path:
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+        font = Path(font_path).stem
+        if font not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont(font, font_path))
+
+    pdf = canvas.Canvas(str(path), pagesize=A4, invariant=1)  # invariant: no timestamps, same bytes per seed
+    width, height = A4
+    margin, leading = 56, 14
+    y = height - margin
+
+    def draw(text: str, x: float = margin, size: int = 10):
+        nonlocal y
+        if y < margin:
+            pdf.showPage()
+            y = height - margin
+        pdf.setFont(font, size)
+        pdf.drawString(x, y, text)
+
+    for kind, content in blocks:
+        if kind == 'heading':
+            y -= leading / 2
+            draw(content, size=12)
+            y -= leading
+        elif kind == 'table':
+            for label, value in content:
+                draw(label)
+                pdf.drawString(margin + 150, y, value)
+                y -= leading
+        else:
+            draw(content)
+            y -= leading
+    pdf.save()
+
+
+def formats_for(layout: str, formats: List[str], pdf_font: str = None) -> List[str]:
+    """Formats a layout can be written in; the standard PDF fonts have no Arabic glyphs"""
+    if layout == 'bilingual' and not pdf_font:
+        return [fmt for fmt in formats if fmt != 'pdf'] or list(formats)
+    return list(formats)
+
+
+def generate_corpus(output_dir, count: int, seed: int = 0, formats: List[str] = FORMATS,
+                    layouts: List[str] = LAYOUTS, pdf_font: str = None) -> List[Dict]:
+    """Write count resumes and their labels.jsonl to output_dir, returning the labels.
+
+    Layouts and formats take turns, so every combination is covered evenly;
+    PDF is left out when reportlab is missing.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    formats = [fmt for fmt in formats if fmt != 'pdf' or pdf_available()]
+    if not formats:
+        raise ValueError("No usable output format (PDF needs reportlab)")
+    rng = random.Random(seed)
+    records = []
+
+    for index in range(count):
+        layout = layouts[index % len(layouts)]
+        layout_formats = formats_for(layout, formats, pdf_font)
+        fmt = layout_formats[(index // len(layouts)) % len(layout_formats)]
+        candidate = make_candidate(rng, index)
+        blocks = LAYOUT_BUILDERS[layout](candidate)
+        path = output_dir / f"resume_{index:05d}_{layout}.{fmt}"
+        if fmt == 'txt':
+            write_txt(blocks, path)
+        elif fmt == 'docx':
+            write_docx(blocks, path)
+        else:
+            write_pdf(blocks, path, pdf_font)
+        records.append({'file': path.name, 'layout': layout, 'format': fmt,
+                        'fields': labels_for(candidate)})
+
+    with open(output_dir / 'labels.jsonl', 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return records
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('output_dir', help="Directory to write the resumes and labels.jsonl into")
+    parser.add_argument('--count', type=int, default=1000, help="Number of resumes to write")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed; the same seed gives the same corpus")
+    parser.add_argument('--format', action='append', choices=FORMATS, dest='formats',
+                        help="Output format (repeatable; default: all available)")
+    parser.add_argument('--layout', action='append', choices=LAYOUTS, dest='layouts',
+                        help="Layout (repeatable; default: all)")
+    parser.add_argument('--pdf-font', help="TrueType font with Arabic glyphs, to write bilingual PDFs too")
+    args = parser.parse_args(argv)
+
+    formats = args.formats or list(FORMATS)
+    if 'pdf' in formats and not pdf_available():
+        print("reportlab is not installed; skipping PDF output", file=sys.stderr)
+    try:
+        records = generate_corpus(args.output_dir, args.count, args.seed, formats,
+                                  args.layouts or list(LAYOUTS), args.pdf_font)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    combinations: Dict[Tuple[str, str], int] = {}
+    for record in records:
+        key = (record['layout'], record['format'])
+        combinations[key] = combinations.get(key, 0) + 1
+    print(f"Wrote {len(records)} resumes to {args.output_dir}")
+    for (layout, fmt), number in sorted(combinations.items()):
+        print(f"  {layout:<10} {fmt:<5} {number:>6}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
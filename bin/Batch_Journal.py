@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+import sqlite3
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List
+
+from Candidate_profile import CandidateProfile
+
+DEFAULT_JOURNAL_PATH = Path.home() / ".resume_extractor" / "batch_journal.sqlite3"
+
+
+def batch_id(file_paths: List[str]) -> str:
+    """Identity of a batch: the same files, in any order, make the same batch"""
+    return hashlib.sha256("\n".join(sorted(file_paths)).encode('utf-8')).hexdigest()
+
+
+class BatchJournal:
+    """Durable record of the resumes a batch has finished, so a rerun can pick up where it stopped.
+
+    Every record() is one committed transaction, so a crash loses only the
+    profiles of the batch being recorded. A journaled profile is reused
+    only while its file keeps the size and mtime it had when recorded.
+    """
+
+    def __init__(self, db_path=DEFAULT_JOURNAL_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # Committed results must survive the machine going down, not just the app
+        self.conn.execute("PRAGMA synchronous=FULL")
+        with self.conn:
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS completed (
+                batch_id TEXT, path TEXT, size INTEGER, mtime_ns INTEGER, profile TEXT,
+                PRIMARY KEY (batch_id, path))""")
+
+    def completed(self, batch: str) -> Dict[str, CandidateProfile]:
+        """Profiles already recorded for a batch, by file path, leaving out files changed since"""
+        profiles = {}
+        for path, size, mtime_ns, profile in self.conn.execute(
+                "SELECT path, size, mtime_ns, profile FROM completed WHERE batch_id = ?", (batch,)):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+                profiles[path] = CandidateProfile(**json.loads(profile))
+        return profiles
+
+    def record(self, batch: str, profiles: List[CandidateProfile]):
+        """Mark resumes as finished, with their profiles.
+        
+        A profile without text, from a resume whose extraction failed or
+        found nothing, is not recorded, so a rerun tries that file again.
+        """
+        rows = []
+        for profile in profiles:
+            if not profile.raw_text:
+                continue
+            try:
+                stat = os.stat(profile.file_path)
+            except OSError:
+                continue
+            rows.append((batch, profile.file_path, stat.st_size, stat.st_mtime_ns,
+                         json.dumps(asdict(profile), ensure_ascii=False)))
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO completed VALUES (?, ?, ?, ?, ?)", rows)
+
+    def finish(self, batch: str):
+        """Forget a batch that ran to the end"""
+        with self.conn:
+            self.conn.execute("DELETE FROM completed WHERE batch_id = ?", (batch,))
+
+    def close(self):
+        self.conn.close()
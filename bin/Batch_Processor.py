@@ -0,0 +1,138 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+
+from Candidate_profile import CandidateProfile
+from Extraction_Cache import ExtractionCache
+from Resume_Processor import ResumeProcessor
+from Telemetry import TELEMETRY
+from resume_config import NER_BATCH_SIZE, NER_PROCESSES, STAGED_PIPELINE, DEDUPE_RESUMES
+
+# Each worker process keeps its own processor so spaCy is loaded once per worker
+_worker_processor = None
+
+
+def default_worker_count() -> int:
+    """Number of worker processes to use when none is configured"""
+    return os.cpu_count() or 1
+
+
+def create_processor(cache_path: str = None, ner_batch_size: int = NER_BATCH_SIZE,
+                     ner_processes: int = NER_PROCESSES, dedupe: bool = False) -> ResumeProcessor:
+    """Build a processor, backed by the extraction cache when a path is given"""
+    cache = ExtractionCache(cache_path) if cache_path else None
+    return ResumeProcessor(cache=cache, ner_batch_size=ner_batch_size, ner_processes=ner_processes,
+                           dedupe=dedupe)
+
+
+def process_chunk(processor: ResumeProcessor, file_paths: List[str], criteria: Dict) -> List[CandidateProfile]:
+    """Process a chunk of resumes with batched NER, isolating failures to single files"""
+    try:
+        return processor.process_resumes(file_paths, criteria)
+    except Exception as e:
+        print(f"Batch processing failed, retrying files one by one: {e}")
+
+    profiles = []
+    for file_path in file_paths:
+        try:
+            profiles.append(processor.process_resume(file_path, criteria))
+        except Exception as e:
+            TELEMETRY.fail('resume')
+            print(f"Error processing {file_path}: {e}")
+            profiles.append(CandidateProfile(file_path=file_path))
+    return profiles
+
+
+def _init_worker(cache_path: str = None, ner_batch_size: int = NER_BATCH_SIZE, dedupe: bool = False):
+    """Load the AI models once when a worker process starts"""
+    global _worker_processor
+    # The pool already uses every core, so nlp.pipe stays in-process here
+    _worker_processor = create_processor(cache_path, ner_batch_size, ner_processes=1, dedupe=dedupe)
+
+
+def _process_in_worker(file_paths: List[str], criteria: Dict):
+    """Process a chunk of resumes inside a worker process, returning the profiles and the stage timings"""
+    return process_chunk(_worker_processor, file_paths, criteria), TELEMETRY.take()
+
+
+def iter_processed_resumes(file_paths: Iterable[str], criteria: Dict = None,
+                           workers: int = None, cache_path: str = None,
+                           ner_batch_size: int = NER_BATCH_SIZE,
+                           ner_processes: int = NER_PROCESSES,
+                           dedupe: bool = DEDUPE_RESUMES) -> Iterator[CandidateProfile]:
+    """Process resumes across a pool of worker processes, yielding profiles in completion order.
+    
+    Files are handed out in chunks of ner_batch_size so each worker can run
+    the NER its chunk needs as one nlp.pipe batch. With STAGED_PIPELINE,
+    several workers run a ResumePipeline instead, overlapping reading with
+    parsing and analysis. Every profile is counted in TELEMETRY.
+    
+    With dedupe, resumes duplicating an earlier one in the batch reuse its
+    fields (see DuplicateIndex) and come out after it. Plain chunked workers
+    each keep their own index, so they only spot duplicates within the
+    chunks they were given.
+    """
+    TELEMETRY.mark_start()
+    profiles = _iter_profiles(file_paths, criteria, workers, cache_path, ner_batch_size, ner_processes, dedupe)
+    try:
+        for profile in profiles:
+            TELEMETRY.count_resumes()
+            yield profile
+    finally:
+        profiles.close()
+
+
+def _iter_profiles(file_paths: Iterable[str], criteria: Dict, workers: int, cache_path: str,
+                   ner_batch_size: int, ner_processes: int, dedupe: bool) -> Iterator[CandidateProfile]:
+    workers = workers or default_worker_count()
+    if workers > 1 and STAGED_PIPELINE:
+        # Imported here: the pipeline module builds on this one
+        from Resume_Pipeline import iter_pipeline_resumes
+        yield from iter_pipeline_resumes(file_paths, criteria, workers, cache_path, ner_batch_size,
+                                         dedupe=dedupe)
+        return
+    paths = iter(file_paths)
+
+    def next_chunk() -> List[str]:
+        return list(islice(paths, ner_batch_size))
+
+    if workers <= 1:
+        processor = create_processor(cache_path, ner_batch_size, ner_processes, dedupe)
+        chunk = next_chunk()
+        while chunk:
+            yield from process_chunk(processor, chunk, criteria)
+            chunk = next_chunk()
+        return
+
+    # Keep a bounded number of chunks in flight so huge batches don't queue up in memory
+    max_in_flight = workers * 2
+    pending = set()
+
+    # Spawned workers don't inherit the GUI's threads or Qt state
+    pool = ProcessPoolExecutor(max_workers=workers,
+                               mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_worker,
+                               initargs=(cache_path, ner_batch_size, dedupe))
+
+    def submit_next() -> bool:
+        chunk = next_chunk()
+        if not chunk:
+            return False
+        pending.add(pool.submit(_process_in_worker, chunk, criteria))
+        return True
+
+    try:
+        while len(pending) < max_in_flight and submit_next():
+            pass
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                submit_next()
+                profiles, stages = future.result()
+                TELEMETRY.merge(stages)
+                yield from profiles
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,255 @@
+import copy
+import io
+import multiprocessing
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from Candidate_profile import CandidateProfile
+from resume_config import (EXPORT_TEMPLATE_PATH, EXPORT_MIN_MATCH_SCORE, EXPORT_WORKERS,
+                           EXPORT_CHUNK_SIZE, EXPORT_PARALLEL_MIN)
+
+# Each export worker parses the template once, when it starts
+_worker_template = None
+
+
+class CVTemplate:
+    """A CV template parsed once and cloned in memory for every candidate.
+
+    Filling a CV only edits the document body, so rendering swaps a deep
+    copy of the pristine body into the parsed document and fills that. The
+    other parts of the package (styles, theme, images) are the same in every
+    CV: they are zipped once, and each CV is that zip with its own
+    document.xml appended, instead of re-serializing and re-compressing the
+    whole package.
+    """
+
+    def __init__(self, template: bytes):
+        from docx import Document
+
+        self.document = Document(io.BytesIO(template))
+        self.pristine_body = copy.deepcopy(self.document.element.body)
+        self.document_name = self.document.part.partname.lstrip('/')
+
+        saved = io.BytesIO()
+        self.document.save(saved)
+        shared = io.BytesIO()
+        with zipfile.ZipFile(saved) as source, zipfile.ZipFile(shared, 'w', zipfile.ZIP_DEFLATED) as target:
+            for info in source.infolist():
+                if info.filename != self.document_name:
+                    target.writestr(info, source.read(info))
+        self.shared_parts = shared.getvalue()
+
+    def render(self, candidate: CandidateProfile, output_path):
+        body = self.document.element.body
+        body.getparent().replace(body, copy.deepcopy(self.pristine_body))
+        # A fresh Document wrapper, so no table or paragraph proxy of the last candidate is reused
+        document = self.document.part.document
+        fill_template_with_candidate_data(document, candidate)
+        with open(output_path, 'w+b') as f:
+            f.write(self.shared_parts)
+            with zipfile.ZipFile(f, 'a', zipfile.ZIP_DEFLATED) as package:
+                package.writestr(self.document_name, document.part.blob)
+
+
+def fill_template_with_candidate_data(doc, candidate: CandidateProfile):
+    """Fill the template document with candidate data"""
+    # Get all tables in the document
+    if not doc.tables:
+        return
+
+    table = doc.tables[0]  # Assuming the main table is the first one
+    rows = table.rows
+    # Working out a row's cells walks the grid spans, so do it once per row
+    row_cells = {}
+
+    def cells_of(row_idx):
+        if row_idx not in row_cells:
+            row_cells[row_idx] = rows[row_idx].cells
+        return row_cells[row_idx]
+
+    # Helper function to set cell text safely
+    def set_cell_text(row_idx, col_idx, text):
+        try:
+            if row_idx < len(rows) and col_idx < len(cells_of(row_idx)):
+                cell = cells_of(row_idx)[col_idx]
+                # Clear existing content
+                for paragraph in cell.paragraphs:
+                    p = paragraph._element
+                    p.getparent().remove(p)
+                # Add new text
+                cell.add_paragraph(str(text) if text else "")
+        except Exception as e:
+            print(f"Error setting cell [{row_idx}][{col_idx}]: {e}")
+
+    # Fill the template based on the table structure
+    # Row 1: Proposed Position
+    if candidate.current_role:
+        set_cell_text(1, 4, candidate.current_role)
+
+    # Row 2: Location
+    if candidate.current_residence:
+        set_cell_text(2, 4, candidate.current_residence)
+
+    # Row 3: Name
+    if candidate.name:
+        set_cell_text(3, 4, candidate.name)
+
+    # Row 4: Date of Birth (calculate from age)
+    if candidate.age and candidate.age > 0:
+        birth_year = datetime.now().year - candidate.age
+        set_cell_text(4, 4, f"Approximately {birth_year}")
+
+    # Row 5: Nationality
+    if candidate.nationality:
+        set_cell_text(5, 4, candidate.nationality)
+
+    # Row 7: Education
+    if candidate.education:
+        set_cell_text(7, 4, candidate.education)
+
+    # Row 10: Countries of Work Experience
+    if candidate.current_residence:
+        set_cell_text(10, 4, candidate.current_residence)
+
+    # Row 12: Employment Record - Current position
+    if candidate.current_role:
+        # Find the employment record rows and fill current position
+        for i in range(12, min(20, len(rows))):
+            try:
+                if cells_of(i)[1].text.strip() == "Present":
+                    set_cell_text(i, 6, candidate.current_role)  # Role/Position Held
+            except Exception:
+                continue
+
+
+def output_stems(candidates: List[CandidateProfile], output_dir, extension: str) -> List[str]:
+    """A distinct file name stem per candidate, clashing neither with each other nor with files in output_dir.
+
+    Names compare case-insensitively, as they do on Windows and macOS.
+    A second "Sara Kamel" becomes "Sara Kamel_CV (2)".
+    """
+    taken = {name.casefold() for name in os.listdir(output_dir)}
+    next_suffix: Dict[str, int] = {}
+    stems = []
+    for number, candidate in enumerate(candidates, 1):
+        safe_name = "".join(c for c in candidate.name if c.isalnum() or c in (' ', '-', '_')).strip()
+        base = f"{safe_name or f'Candidate_{number}'}_CV"
+        stem = base
+        suffix = next_suffix.get(base.casefold(), 2)
+        while (stem + extension).casefold() in taken:
+            stem = f"{base} ({suffix})"
+            suffix += 1
+        next_suffix[base.casefold()] = suffix
+        taken.add((stem + extension).casefold())
+        stems.append(stem)
+    return stems
+
+
+def _init_export_worker(template: bytes):
+    global _worker_template
+    _worker_template = CVTemplate(template)
+
+
+def _render_chunk(template: CVTemplate, jobs: List[Tuple[CandidateProfile, str]]) -> List[str]:
+    """Render a chunk of CVs, returning the names of the candidates that failed"""
+    failed = []
+    for candidate, output_path in jobs:
+        try:
+            template.render(candidate, output_path)
+        except Exception as e:
+            print(f"Error exporting {candidate.name}: {e}")
+            failed.append(candidate.name)
+    return failed
+
+
+def _render_in_worker(jobs: List[Tuple[CandidateProfile, str]]) -> List[str]:
+    return _render_chunk(_worker_template, jobs)
+
+
+def _select(candidates: List[CandidateProfile], min_score: float) -> List[CandidateProfile]:
+    return [candidate for candidate in candidates if candidate.match_score >= min_score]
+
+
+def _render_all(jobs: List[Tuple[CandidateProfile, str]], template_path, workers: int,
+                progress: Callable[[int, int], None], should_stop: Callable[[], bool]) -> Tuple[int, List[str]]:
+    """Render (candidate, output path) jobs; returns how many were rendered and the names that failed"""
+    template = Path(template_path).read_bytes()
+    chunks = [jobs[start:start + EXPORT_CHUNK_SIZE] for start in range(0, len(jobs), EXPORT_CHUNK_SIZE)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    done = 0
+    failed: List[str] = []
+
+    if workers <= 1 or len(jobs) < EXPORT_PARALLEL_MIN:
+        renderer = CVTemplate(template)
+        for chunk in chunks:
+            if should_stop and should_stop():
+                break
+            failed += _render_chunk(renderer, chunk)
+            done += len(chunk)
+            if progress:
+                progress(done, len(jobs))
+        return done - len(failed), failed
+
+    # Spawned workers import only this module, so they start without loading spaCy or Qt
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_export_worker, initargs=(template,)) as pool:
+        pending = {pool.submit(_render_in_worker, chunk): len(chunk) for chunk in chunks}
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                failed += future.result()
+                done += pending.pop(future)
+            if progress:
+                progress(done, len(jobs))
+            if should_stop and should_stop():
+                for future in pending:
+                    future.cancel()
+                break
+    return done - len(failed), failed
+
+
+def export_docx(candidates: List[CandidateProfile], output_dir, template_path=EXPORT_TEMPLATE_PATH,
+                min_score: float = EXPORT_MIN_MATCH_SCORE, workers: int = EXPORT_WORKERS,
+                progress: Callable[[int, int], None] = None,
+                should_stop: Callable[[], bool] = None) -> Tuple[int, List[str]]:
+    """Write one filled-in CV per candidate scoring at least min_score; returns (exported, failed names).
+
+    The template is read from disk once. Exports of EXPORT_PARALLEL_MIN
+    candidates or more are rendered by a pool of worker processes,
+    EXPORT_CHUNK_SIZE CVs at a time. Output names are settled up front, so
+    files never overwrite each other or anything already in output_dir.
+    progress(done, total) is called after every chunk, and should_stop()
+    is checked between chunks.
+    """
+    selected = _select(candidates, min_score)
+    stems = output_stems(selected, output_dir, '.docx')
+    jobs = [(candidate, str(Path(output_dir) / f"{stem}.docx")) for candidate, stem in zip(selected, stems)]
+    return _render_all(jobs, template_path, workers, progress, should_stop)
+
+
+def export_pdf(candidates: List[CandidateProfile], output_dir, template_path=EXPORT_TEMPLATE_PATH,
+               min_score: float = EXPORT_MIN_MATCH_SCORE, workers: int = EXPORT_WORKERS,
+               progress: Callable[[int, int], None] = None,
+               should_stop: Callable[[], bool] = None) -> Tuple[int, List[str]]:
+    """Like export_docx, then converts the whole set to PDF in one docx2pdf call.
+
+    A single call keeps one Word session open for every file, instead of
+    starting one per CV. Raises ImportError when docx2pdf is not installed.
+    """
+    from docx2pdf import convert
+
+    selected = _select(candidates, min_score)
+    # Named against output_dir's PDFs, so the converted files overwrite nothing there
+    stems = output_stems(selected, output_dir, '.pdf')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        jobs = [(candidate, str(Path(temp_dir) / f"{stem}.docx")) for candidate, stem in zip(selected, stems)]
+        exported, failed = _render_all(jobs, template_path, workers, progress, should_stop)
+        if not exported or (should_stop and should_stop()):
+            return 0, failed
+        convert(temp_dir, str(output_dir))
+    return exported, failed
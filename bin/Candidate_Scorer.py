@@ -0,0 +1,35 @@
+from typing import Dict
+
+from Candidate_profile import CandidateProfile
+
+# Criteria matched as case-insensitive substrings of a profile field
+TEXT_CRITERIA = {
+    'location': 'current_residence',
+    'role': 'current_role',
+    'education': 'education',
+}
+
+
+def age_criterion_active(criteria: Dict) -> bool:
+    return criteria.get('min_age', 0) > 0 or criteria.get('max_age', 100) < 100
+
+
+def match_score(profile: CandidateProfile, criteria: Dict) -> float:
+    """Share of the active criteria a single profile meets"""
+    score = 0.0
+    total_criteria = 0
+
+    # Age matching
+    if age_criterion_active(criteria):
+        total_criteria += 1
+        if criteria.get('min_age', 0) <= profile.age <= criteria.get('max_age', 100):
+            score += 1.0
+
+    # Location, role and education matching
+    for key, field in TEXT_CRITERIA.items():
+        if criteria.get(key, ''):
+            total_criteria += 1
+            if criteria[key].lower() in getattr(profile, field).lower():
+                score += 1.0
+
+    return score / total_criteria if total_criteria > 0 else 0.0
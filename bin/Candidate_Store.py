@@ -0,0 +1,246 @@
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from Candidate_profile import CandidateProfile
+from Candidate_Scorer import TEXT_CRITERIA, age_criterion_active, match_score
+
+# Profile fields with few distinct values, stored once each and referenced by code
+CATEGORICAL_FIELDS = ('current_residence', 'nationality', 'education', 'current_role')
+
+# Profile fields that are mostly unique per candidate, kept as plain strings
+TEXT_FIELDS = ('name', 'email', 'phone', 'raw_text', 'file_path', 'duplicate_of')
+
+
+class _NumericColumn:
+    """Growable NumPy array; appends double the capacity when it runs out"""
+
+    def __init__(self, dtype, capacity: int = 1024):
+        self.data = np.zeros(capacity, dtype=dtype)
+        self.size = 0
+
+    def append(self, value):
+        if self.size == len(self.data):
+            self.data = np.concatenate([self.data, np.zeros_like(self.data)])
+        self.data[self.size] = value
+        self.size += 1
+
+    def values(self) -> np.ndarray:
+        return self.data[:self.size]
+
+
+class _CategoricalColumn:
+    """Strings stored as int32 codes into a list of interned distinct values"""
+
+    def __init__(self):
+        self.values = []
+        self.lowered = []
+        self.index = {}
+        self.codes = _NumericColumn(np.int32)
+
+    def _code(self, value: str) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+            self.lowered.append(value.lower())
+        return code
+
+    def append(self, value: str):
+        self.codes.append(self._code(value))
+
+    def __setitem__(self, row: int, value: str):
+        self.codes.data[row] = self._code(value)
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.codes.data[row]]
+
+    def contains(self, needle: str) -> np.ndarray:
+        """Which rows contain needle, case-insensitively, testing each distinct value once"""
+        matched = np.fromiter((needle in value for value in self.lowered), dtype=bool, count=len(self.lowered))
+        return matched[self.codes.values()]
+
+    def sort_keys(self) -> np.ndarray:
+        """Per-row rank of the lowercased value, for sorting rows alphabetically"""
+        ranks = np.empty(len(self.values), dtype=np.int32)
+        ranks[sorted(range(len(self.values)), key=self.lowered.__getitem__)] = np.arange(len(self.values))
+        return ranks[self.codes.values()]
+
+
+def _column_property(field: str) -> property:
+    return property(lambda view: view.store.value(view.row, field))
+
+
+class CandidateView:
+    """Read-only CandidateProfile look-alike for one row of a CandidateStore"""
+    __slots__ = ('store', 'row')
+
+    def __init__(self, store: 'CandidateStore', row: int):
+        self.store = store
+        self.row = row
+
+    @property
+    def match_score(self) -> float:
+        return float(self.store.scores.data[self.row])
+
+    @property
+    def languages(self) -> List[str]:
+        return []
+
+    @property
+    def certifications(self) -> List[str]:
+        return []
+
+    def to_profile(self) -> CandidateProfile:
+        """A standalone CandidateProfile copy of this row"""
+        return CandidateProfile(match_score=self.match_score,
+                                **{field: getattr(self, field) for field in ('age',) + CATEGORICAL_FIELDS + TEXT_FIELDS})
+
+
+for _field in ('age',) + CATEGORICAL_FIELDS + TEXT_FIELDS:
+    setattr(CandidateView, _field, _column_property(_field))
+
+
+class CandidateStore:
+    """Columnar store of extracted candidates, listed in a sortable display order.
+
+    Ages and scores are NumPy columns, repetitive strings such as countries
+    are interned, and sorting only permutes an index array. Indexing and
+    iterating give CandidateView rows in display order, so the store can be
+    used where a list of CandidateProfile was. Languages and certifications
+    are not extracted, so they are not stored.
+
+    Each file has at most one row: storing a profile for a file that is
+    already in the store replaces that row in place. Sorting keeps each
+    duplicate resume right after its first copy.
+    """
+
+    def __init__(self):
+        self.ages = _NumericColumn(np.int32)
+        self.scores = _NumericColumn(np.float64)
+        self.categorical = {field: _CategoricalColumn() for field in CATEGORICAL_FIELDS}
+        self.text = {field: [] for field in TEXT_FIELDS}
+        self.order = _NumericColumn(np.int64)
+        self.rows_by_path: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self.order.size
+
+    def __getitem__(self, position: int) -> CandidateView:
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return CandidateView(self, int(self.order.data[position]))
+
+    def __iter__(self) -> Iterator[CandidateView]:
+        for row in self.order.values().tolist():
+            yield CandidateView(self, row)
+
+    def row_for_path(self, file_path: str) -> Optional[int]:
+        """Stored row of a file's profile, if the file has one"""
+        return self.rows_by_path.get(file_path)
+
+    def append(self, profile: CandidateProfile, criteria: Dict = None) -> int:
+        """Store a profile at the end of the display order; with criteria, it is scored for them.
+
+        A profile for a file already stored replaces that file's row instead,
+        keeping its display position. Returns the stored row.
+        """
+        row = self.rows_by_path.get(profile.file_path) if profile.file_path else None
+        if row is not None:
+            self.replace(row, profile, criteria)
+            return row
+
+        row = self.ages.size
+        self.ages.append(profile.age or 0)
+        self.scores.append(match_score(profile, criteria) if criteria is not None else profile.match_score)
+        for field, column in self.categorical.items():
+            column.append(getattr(profile, field) or '')
+        for field, column in self.text.items():
+            column.append(getattr(profile, field) or '')
+        self.order.append(row)
+        if profile.file_path:
+            self.rows_by_path[profile.file_path] = row
+        return row
+
+    def replace(self, row: int, profile: CandidateProfile, criteria: Dict = None):
+        """Overwrite a stored row with a newer profile"""
+        self.ages.data[row] = profile.age or 0
+        self.scores.data[row] = match_score(profile, criteria) if criteria is not None else profile.match_score
+        for field, column in self.categorical.items():
+            column[row] = getattr(profile, field) or ''
+        for field, column in self.text.items():
+            column[row] = getattr(profile, field) or ''
+
+    def clear(self):
+        self.__init__()
+
+    def value(self, row: int, field: str):
+        if field == 'age':
+            return int(self.ages.data[row])
+        if field in self.categorical:
+            return self.categorical[field][row]
+        return self.text[field][row]
+
+    def rescore(self, criteria: Dict) -> np.ndarray:
+        """Score every stored candidate for new criteria, without touching the display order"""
+        count = self.ages.size
+        met = np.zeros(count, dtype=np.int32)
+        total_criteria = 0
+
+        if age_criterion_active(criteria):
+            total_criteria += 1
+            ages = self.ages.values()
+            met += (ages >= criteria.get('min_age', 0)) & (ages <= criteria.get('max_age', 100))
+
+        for key, field in TEXT_CRITERIA.items():
+            if criteria.get(key, ''):
+                total_criteria += 1
+                met += self.categorical[field].contains(criteria[key].lower())
+
+        self.scores.data[:count] = met / total_criteria if total_criteria > 0 else 0.0
+        return self.scores.values()
+
+    def first_copy_rows(self) -> np.ndarray:
+        """Per row, the row of the first copy it duplicates, or its own row"""
+        rows = np.arange(self.ages.size)
+        for row, first_copy in enumerate(self.text['duplicate_of']):
+            if first_copy and first_copy in self.rows_by_path:
+                rows[row] = self.rows_by_path[first_copy]
+        return rows
+
+    def sort_by(self, field: str, descending: bool = False):
+        """Reorder the display by one field; ties keep the order candidates were added in.
+
+        Duplicates take their first copy's place, listed after it.
+        """
+        if field == 'match_score':
+            keys = self.scores.values()
+        elif field == 'age':
+            keys = self.ages.values()
+        elif field in self.categorical:
+            keys = self.categorical[field].sort_keys()
+        else:
+            keys = np.array([value.lower() for value in self.text[field]], dtype=str)
+            if descending:
+                # Dense ranks, so equal names stay tied once negated
+                keys = np.unique(keys, return_inverse=True)[1]
+        groups = self.first_copy_rows()
+        keys = (-keys if descending else keys)[groups]
+        # lexsort is stable: within a group the first copy, stored first, stays first
+        self.order.data[:self.order.size] = np.lexsort((groups, keys))
+
+    def positions(self) -> np.ndarray:
+        """Display position of every stored row"""
+        positions = np.empty(self.order.size, dtype=np.int64)
+        positions[self.order.values()] = np.arange(self.order.size)
+        return positions
+
+    def in_range(self, field: str, low=None, high=None) -> List[CandidateView]:
+        """Rows in display order whose numeric field (age or match_score) lies within [low, high]"""
+        values = (self.ages if field == 'age' else self.scores).data[self.order.values()]
+        mask = np.ones(len(values), dtype=bool)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return [CandidateView(self, row) for row in self.order.values()[mask].tolist()]
@@ -18,6 +18,7 @@ class CandidateProfile:
     raw_text: str = ""
     file_path: str = ""
     match_score: float = 0.0
+    duplicate_of: str = ""  # file_path of the first copy, when this resume duplicates an earlier one
     
     def __post_init__(self):
         if self.languages is None:
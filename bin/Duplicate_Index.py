@@ -0,0 +1,119 @@
+import hashlib
+import re
+from array import array
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from resume_config import DEDUPE_SIMILARITY, DEDUPE_SHINGLE_WORDS, DEDUPE_SIGNATURE_SIZE, DEDUPE_BANDS
+
+# (digest of the normalized words, MinHash values packed as 32-bit ints)
+Signature = Tuple[bytes, bytes]
+
+_WORD = re.compile(r'\w+')
+_MASK_32 = 0xFFFFFFFF
+# Added per bin skipped when an empty MinHash bin borrows a neighbour's value
+_DENSIFY_STEP = 0x9E3779B1
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def text_signature(text: str, shingle_words: int = DEDUPE_SHINGLE_WORDS,
+                   size: int = DEDUPE_SIGNATURE_SIZE) -> Optional[Signature]:
+    """Signature of a resume's text for DuplicateIndex, or None when it has no words.
+
+    Case, punctuation and line breaks are ignored, so the PDF and DOCX
+    saves of one CV have the same digest. The MinHash part estimates how
+    many word shingles two texts share. It is one-permutation MinHash: each
+    shingle is hashed once and lands in one of `size` bins, which keep
+    their smallest value, and empty bins borrow the next bin's value.
+    """
+    words = _WORD.findall(text.casefold())
+    if not words:
+        return None
+    digest = hashlib.blake2b(' '.join(words).encode('utf-8'), digest_size=16).digest()
+
+    span = min(shingle_words, len(words))
+    shingles = set(words) if span == 1 else {' '.join(words[start:start + span])
+                                             for start in range(len(words) - span + 1)}
+    bins: List[Optional[int]] = [None] * size
+    for shingle in shingles:
+        value = _shingle_hash(shingle)
+        slot, value = value % size, (value // size) & _MASK_32
+        if bins[slot] is None or value < bins[slot]:
+            bins[slot] = value
+
+    filled = [slot for slot, value in enumerate(bins) if value is not None]
+    for slot in range(size):
+        if bins[slot] is None:
+            # The nearest filled bin to the right, wrapping around
+            donor = next((other for other in filled if other > slot), filled[0])
+            distance = (donor - slot) % size
+            bins[slot] = (bins[donor] + distance * _DENSIFY_STEP) & _MASK_32
+    return digest, array('I', bins).tobytes()
+
+
+def signature_similarity(first: Signature, second: Signature) -> float:
+    """Estimated share of word shingles two signatures' texts have in common, from 0 to 1"""
+    if first[0] == second[0]:
+        return 1.0
+    first_values, second_values = memoryview(first[1]).cast('I'), memoryview(second[1]).cast('I')
+    return sum(a == b for a, b in zip(first_values, second_values)) / len(first_values)
+
+
+class DuplicateIndex:
+    """Finds resumes whose text duplicates, or nearly duplicates, one seen earlier in a batch.
+
+    Texts with the same words are exact duplicates, found by digest. For
+    near-duplicates, the MinHash values are split into `bands` bands and
+    each band is looked up in its own table (locality-sensitive hashing):
+    resumes sharing a band are candidates, confirmed when their estimated
+    similarity is at least `similarity`. Each band bucket keeps only the
+    first resume that filled it, so a lookup checks at most `bands`
+    candidates however many resumes are indexed, even when many share a
+    template. Only first copies are indexed, so every duplicate points at
+    the first copy of its group.
+    """
+
+    def __init__(self, similarity: float = DEDUPE_SIMILARITY, bands: int = DEDUPE_BANDS):
+        self.similarity = similarity
+        self.bands = bands
+        self.keys: List[Hashable] = []
+        self.signatures: List[Signature] = []
+        self.exact: Dict[bytes, int] = {}
+        self.tables: List[Dict[int, int]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _band_hashes(self, signature: Signature) -> List[int]:
+        values = signature[1]
+        width = len(values) // self.bands
+        return [hash(values[band * width:(band + 1) * width]) for band in range(self.bands)]
+
+    def add(self, signature: Signature, key: Hashable) -> Optional[Tuple[Hashable, bool]]:
+        """(key of the first copy, whether the words are identical) for a duplicate resume.
+
+        A resume that duplicates none is indexed under key and None returned.
+        """
+        original = self.exact.get(signature[0])
+        if original is not None:
+            return self.keys[original], True
+
+        band_hashes = self._band_hashes(signature)
+        candidates = {table[band_hash] for table, band_hash in zip(self.tables, band_hashes) if band_hash in table}
+        best, best_similarity = None, self.similarity
+        for candidate in candidates:
+            similarity = signature_similarity(signature, self.signatures[candidate])
+            if similarity >= best_similarity:
+                best, best_similarity = candidate, similarity
+        if best is not None:
+            return self.keys[best], False
+
+        entry = len(self.keys)
+        self.keys.append(key)
+        self.signatures.append(signature)
+        self.exact[signature[0]] = entry
+        for table, band_hash in zip(self.tables, band_hashes):
+            table.setdefault(band_hash, entry)
+        return None
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional
+
+import resume_config
+
+DEFAULT_CACHE_PATH = Path.home() / ".resume_extractor" / "extraction_cache.sqlite3"
+
+# Bump when extraction code changes in a way the config fingerprints can't see
+CACHE_VERSION = 5
+
+# Settings that decide which resume sections a field extractor searches first
+_SECTIONING = ['SECTION_HEADERS', 'FIELD_SECTIONS']
+
+# resume_config names that decide how much of a document's text is read;
+# every field depends on them too
+TEXT_DEPENDENCIES = ['PDF_MAX_PAGES', 'PDF_STOP_FIELDS', 'PDF_TEXT_BACKEND', 'TEXT_ENCODINGS']
+
+# resume_config names each extracted field depends on; editing one of them
+# only invalidates the fields listed against it
+FIELD_DEPENDENCIES = {
+    'name': ['NAME_PATTERNS', 'BILINGUAL_PATTERNS', 'TABLE_PATTERNS', 'NON_NAME_WORDS',
+             'NON_NAME_VALIDATION_WORDS', 'FALSE_POSITIVE_NAMES', 'CV_SECTIONS', 'SPACY_MODEL',
+             'NAME_WINDOW_CHARS', 'NAME_ENTITY_MAX_START'] + _SECTIONING,
+    'email': ['EMAIL_PATTERN'],
+    'phone': ['PHONE_PATTERN'],
+    'age': ['AGE_PATTERN', 'BIRTH_DATE_PATTERNS', 'MONTH_MAP', 'DATE_FORMATS'],
+    'current_residence': ['LOCATION_LABEL_PATTERNS', 'NON_LOCATION_WORDS', 'COUNTRIES', 'SPACY_MODEL',
+                          'LOCATION_ENTITY_LABELS', 'LOCATION_HEADER_CHARS', 'LOCATION_WINDOW_CHARS',
+                          'LOCATION_HINT_PATTERN'] + _SECTIONING,
+    'nationality': ['NATIONALITY_PATTERNS', 'LOCATION_LABEL_PATTERNS', 'NON_LOCATION_WORDS',
+                    'COUNTRIES', 'SPACY_MODEL', 'LOCATION_ENTITY_LABELS', 'LOCATION_HEADER_CHARS',
+                    'LOCATION_WINDOW_CHARS', 'LOCATION_HINT_PATTERN'] + _SECTIONING,
+    'education': ['EDUCATION_PATTERNS'] + _SECTIONING,
+    'current_role': ['ROLE_PATTERNS'] + _SECTIONING,
+}
+
+
+def _config_repr(value) -> str:
+    """Stable text form of a config value, including compiled regex flags"""
+    if hasattr(value, 'pattern') and hasattr(value, 'flags'):
+        return f"re({value.pattern!r},{value.flags})"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_config_repr(v) for v in value) + "]"
+    if isinstance(value, (set, frozenset)):
+        return "{" + ",".join(sorted(_config_repr(v) for v in value)) + "}"
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{k!r}:{_config_repr(v)}" for k, v in sorted(value.items())) + "}"
+    return repr(value)
+
+
+def _fingerprint(parts, names) -> str:
+    for name in names:
+        parts.append(f"{name}={_config_repr(getattr(resume_config, name, None))}")
+    return hashlib.sha256("\n".join(parts).encode('utf-8')).hexdigest()
+
+
+def text_fingerprint() -> str:
+    """Fingerprint of the config deciding which pages of a document are read"""
+    return _fingerprint([f"v{CACHE_VERSION}", "text"], TEXT_DEPENDENCIES)
+
+
+def field_fingerprint(field: str) -> str:
+    """Fingerprint of the config a field extractor uses"""
+    parts = [f"v{CACHE_VERSION}", field]
+    if field == 'age':
+        # Ages derived from birth dates change over time
+        parts.append(date.today().isoformat())
+    return _fingerprint(parts, FIELD_DEPENDENCIES[field] + TEXT_DEPENDENCIES)
+
+
+def file_content_hash(file_path: str) -> str:
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """On-disk cache of extracted text (keyed by file content) and fields (keyed by config fingerprint)"""
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Several worker processes may share the database
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, content_hash TEXT)""")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS texts (
+                content_hash TEXT PRIMARY KEY, text TEXT NOT NULL, fingerprint TEXT)""")
+            # Texts cached before page limits existed have no fingerprint and read as misses
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(texts)")]
+            if 'fingerprint' not in columns:
+                self.conn.execute("ALTER TABLE texts ADD COLUMN fingerprint TEXT")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS fields (
+                content_hash TEXT, field TEXT, fingerprint TEXT, value TEXT,
+                PRIMARY KEY (content_hash, field))""")
+        self.fingerprints = {field: field_fingerprint(field) for field in FIELD_DEPENDENCIES}
+        self.text_fingerprint = text_fingerprint()
+
+    def content_hash(self, file_path: str) -> str:
+        """Content hash of a file, skipping the read when size and mtime are unchanged"""
+        path = str(Path(file_path).resolve())
+        stat = os.stat(path)
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, content_hash FROM files WHERE path = ?", (path,)).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+
+        content_hash = file_content_hash(path)
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                              (path, stat.st_size, stat.st_mtime_ns, content_hash))
+        return content_hash
+
+    def get_text(self, content_hash: str) -> Optional[str]:
+        """Cached text for a file content hash, or None when missing or read with different page limits"""
+        row = self.conn.execute(
+            "SELECT text, fingerprint FROM texts WHERE content_hash = ?", (content_hash,)).fetchone()
+        if not row or row[1] != self.text_fingerprint:
+            return None
+        return row[0]
+
+    def put_text(self, content_hash: str, text: str):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO texts (content_hash, text, fingerprint) VALUES (?, ?, ?)",
+                              (content_hash, text, self.text_fingerprint))
+
+    def get_field(self, content_hash: str, field: str):
+        """Cached field value, or None when missing or extracted with different patterns"""
+        row = self.conn.execute(
+            "SELECT fingerprint, value FROM fields WHERE content_hash = ? AND field = ?",
+            (content_hash, field)).fetchone()
+        if not row or row[0] != self.fingerprints[field]:
+            return None
+        return json.loads(row[1])
+
+    def put_fields(self, content_hash: str, values: Dict):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO fields VALUES (?, ?, ?, ?)",
+                [(content_hash, field, self.fingerprints[field], json.dumps(value))
+                 for field, value in values.items()])
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,171 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from Extraction_Cache import file_content_hash
+from Text_Backends import SUPPORTED_EXTENSIONS
+from resume_config import WATCH_POLL_INTERVAL, WATCH_SETTLE_SECONDS
+
+# inotify event masks, from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+
+
+class _Inotify:
+    """Minimal inotify binding over libc, used only to wake the watcher up.
+
+    The watcher rescans the directories after every wake-up, so the events
+    themselves are drained and discarded; that also makes a queue overflow
+    harmless.
+    """
+
+    def __init__(self, directories: List[str]):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        for directory in directories:
+            if libc.inotify_add_watch(self.fd, os.fsencode(directory),
+                                      IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE) < 0:
+                error = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(error, f"Cannot watch {directory}")
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Block until something changed or timeout seconds passed; True when woken by an event"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 64 * 1024):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _open_inotify(directories: List[str]) -> Optional[_Inotify]:
+    """An inotify handle on Linux, or None when polling has to do"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        return _Inotify(directories)
+    except (OSError, AttributeError, TypeError) as e:
+        print(f"inotify unavailable, polling instead: {e}")
+        return None
+
+
+class FolderWatcher:
+    """Reports resumes that appear or change in a set of inbox directories.
+
+    Only the top level of each directory is watched. A file is reported
+    once its size and mtime have stopped changing, so half-copied files
+    are not read; files older than WATCH_SETTLE_SECONDS count as settled
+    straight away, which makes the first scan report everything already
+    there. A file whose size or mtime changed but whose bytes hash the
+    same as last time (a touch, or a copy of the same file) is not
+    reported again.
+
+    On Linux, inotify wakes the watcher as soon as a file is written or
+    moved in; elsewhere, or when inotify is unavailable, the directories
+    are polled every poll_interval seconds.
+    """
+
+    def __init__(self, directories: List[str], poll_interval: float = WATCH_POLL_INTERVAL,
+                 settle_seconds: float = WATCH_SETTLE_SECONDS, use_inotify: bool = True):
+        self.directories = [os.path.abspath(directory) for directory in directories]
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.inotify = _open_inotify(self.directories) if use_inotify else None
+        # Size and mtime of every file at the previous scan
+        self.seen: Dict[str, Tuple[int, int]] = {}
+        # Size, mtime and content hash of every file already reported
+        self.reported: Dict[str, Tuple[int, int, str]] = {}
+        # Whether the previous scan saw files that had not settled yet
+        self.pending = False
+        self.next_scan = 0.0
+
+    def _stat_files(self) -> Dict[str, Tuple[int, int]]:
+        files = {}
+        for directory in self.directories:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                print(f"Cannot scan {directory}: {e}")
+                continue
+            for entry in entries:
+                if os.path.splitext(entry.name)[1].lower() not in SUPPORTED_EXTENSIONS:
+                    continue
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        files[entry.path] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    continue  # Removed between listing and stat
+        return files
+
+    def scan(self) -> List[str]:
+        """Paths of files that are new or changed since they were last reported, and have settled"""
+        files = self._stat_files()
+        settled_before = time.time_ns() - int(self.settle_seconds * 1e9)
+        changed = []
+        self.pending = False
+
+        for path, stat in files.items():
+            reported = self.reported.get(path)
+            if reported and reported[:2] == stat:
+                continue
+            if self.seen.get(path) != stat and stat[1] > settled_before:
+                self.pending = True  # Still being written, or just arrived
+                continue
+            try:
+                content_hash = file_content_hash(path)
+            except OSError:
+                continue
+            self.reported[path] = stat + (content_hash,)
+            if not reported or reported[2] != content_hash:
+                changed.append(path)
+
+        self.seen = files
+        self.next_scan = time.monotonic() + self.poll_interval
+        return sorted(changed)
+
+    def wait(self, timeout: float = None) -> List[str]:
+        """Block until files are ready, and return them; [] once timeout seconds pass without a scan.
+
+        Unsettled files are checked again after poll_interval, even when no
+        further event arrives for them.
+        """
+        if self.inotify and not self.pending:
+            if not self.inotify.wait(timeout):
+                return []
+            # Let a burst of events (one copy writes many times) finish first
+            time.sleep(min(self.poll_interval, 0.2))
+        else:
+            delay = max(self.next_scan - time.monotonic(), 0.0)
+            if timeout is not None and timeout < delay:
+                time.sleep(timeout)
+                return []
+            time.sleep(delay)
+        return self.scan()
+
+    def __iter__(self) -> Iterator[List[str]]:
+        """Lists of ready files, starting with the files already there; never ends"""
+        changed = self.scan()
+        while True:
+            if changed:
+                yield changed
+            changed = self.wait()
+
+    def close(self):
+        if self.inotify:
+            self.inotify.close()
+            self.inotify = None
@@ -1,26 +1,41 @@
 from pathlib import Path
-from typing import Dict
-from datetime import datetime
+from typing import Dict, List
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QLineEdit, QPushButton, QTextEdit, QTableWidget, QTableWidgetItem,
-    QFileDialog, QProgressBar, QSpinBox, QComboBox, QGroupBox, QGridLayout, 
-    QSplitter, QMessageBox, QHeaderView, QMenu, QToolButton)
-from PyQt6.QtCore import Qt
+    QLabel, QLineEdit, QPushButton, QTextEdit, QTableView,
+    QFileDialog, QProgressBar, QSpinBox, QDoubleSpinBox, QComboBox, QGroupBox, QGridLayout, 
+    QSplitter, QMessageBox, QHeaderView, QMenu, QToolButton, QCheckBox)
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QAction
-from PyQt6.QtGui import QFont, QColor
-from Processing_Thread import ProcessingThread
+from PyQt6.QtGui import QFont
+from Processing_Thread import ProcessingThread, WatchThread, ModelLoaderThread, ExportThread
+from Batch_Processor import default_worker_count
+from Extraction_Cache import DEFAULT_CACHE_PATH
+from Batch_Journal import DEFAULT_JOURNAL_PATH
+from Telemetry import TELEMETRY
 from Candidate_profile import CandidateProfile
-from docx import Document
+from Candidate_Store import CandidateStore
+from Results_Model import CandidateTableModel
+from Result_Sinks import open_sink
+from resume_config import EXPORT_TEMPLATE_PATH, EXPORT_MIN_MATCH_SCORE, DEDUPE_RESUMES
 
 
 class ResumeClassifierGUI(QMainWindow):
     
     def __init__(self):
         super().__init__()
-        self.candidates = []
+        self.candidates = CandidateStore()
+        self.results_model = CandidateTableModel(self.candidates)
         self.filtered_candidates = []
         self.processing_thread = None
+        self.watch_thread = None
+        self.export_thread = None
+        self.results_sink_path = None
+        # Why the last processing or watch run stopped early, if it failed
+        self.processing_error = None
+        self.model_loader = None
         self.init_ui()
+        if self.workers_spin.value() == 1:
+            self.start_model_warmup()
     
     def init_ui(self):
         """Initialize the user interface"""
@@ -49,6 +64,16 @@ class ResumeClassifierGUI(QMainWindow):
         
         # Status bar
         self.statusBar().showMessage("Ready to process resumes")
+        self.model_status_label = QLabel("Model: not loaded")
+        self.statusBar().addPermanentWidget(self.model_status_label)
+        
+        # Live throughput, slowest stage and failures, from the stage telemetry
+        self.telemetry_label = QLabel()
+        self.statusBar().addPermanentWidget(self.telemetry_label)
+        self.telemetry_timer = QTimer(self)
+        self.telemetry_timer.setInterval(1000)
+        self.telemetry_timer.timeout.connect(lambda: self.telemetry_label.setText(TELEMETRY.summary()))
+        self.telemetry_timer.start()
         
         self.setStyleSheet("""
             QMainWindow {
@@ -100,6 +125,30 @@ class ResumeClassifierGUI(QMainWindow):
             }
         """)
     
+    def start_model_warmup(self):
+        """Load the spaCy model in the background, once, so the window shows immediately.
+        
+        Only runs that extract in this process need it: one worker, or the
+        small batches of a watched folder. Worker processes load their own.
+        """
+        if self.model_loader is not None:
+            return
+        self.model_status_label.setText("Model: loading...")
+        self.model_loader = ModelLoaderThread()
+        self.model_loader.model_loaded.connect(lambda: self.model_status_label.setText("Model: ready"))
+        self.model_loader.model_failed.connect(self.model_load_failed)
+        self.model_loader.start()
+    
+    def workers_changed(self, workers: int):
+        """Warm up the model once runs are going to extract in this process"""
+        if workers == 1:
+            self.start_model_warmup()
+    
+    def model_load_failed(self, error: str):
+        """Show that the spaCy model could not be loaded"""
+        self.model_status_label.setText("Model: failed to load")
+        self.model_status_label.setToolTip(error)
+    
     def create_left_panel(self) -> QWidget:
         """Create the left panel with filters and controls"""
         panel = QWidget()
@@ -117,6 +166,12 @@ class ResumeClassifierGUI(QMainWindow):
         self.selected_files_label.setWordWrap(True)
         file_layout.addWidget(self.selected_files_label)
         
+        # Keep processing new and changed resumes from an inbox folder
+        self.watch_btn = QPushButton("Watch Folder...")
+        self.watch_btn.setCheckable(True)
+        self.watch_btn.toggled.connect(self.toggle_watch)
+        file_layout.addWidget(self.watch_btn)
+        
         layout.addWidget(file_group)
         
         # Filtering criteria group
@@ -163,6 +218,16 @@ class ResumeClassifierGUI(QMainWindow):
         
         layout.addWidget(criteria_group)
         
+        # Re-score loaded candidates shortly after the criteria stop changing
+        self.rescore_timer = QTimer(self)
+        self.rescore_timer.setSingleShot(True)
+        self.rescore_timer.setInterval(150)
+        self.rescore_timer.timeout.connect(self.rescore_candidates)
+        for spin in (self.min_age_spin, self.max_age_spin):
+            spin.valueChanged.connect(self.rescore_timer.start)
+        for line_edit in (self.location_input, self.role_input, self.education_input, self.nationality_input):
+            line_edit.textChanged.connect(self.rescore_timer.start)
+        
         # Processing controls
         controls_group = QGroupBox("Processing")
         controls_layout = QVBoxLayout(controls_group)
@@ -172,6 +237,40 @@ class ResumeClassifierGUI(QMainWindow):
         self.process_btn.setEnabled(False)
         controls_layout.addWidget(self.process_btn)
         
+        # Pause and cancel a running batch; a cancelled batch continues where it stopped when rerun
+        run_layout = QHBoxLayout()
+        self.pause_btn = QPushButton("Pause")
+        self.pause_btn.setCheckable(True)
+        self.pause_btn.setEnabled(False)
+        self.pause_btn.toggled.connect(self.toggle_pause)
+        run_layout.addWidget(self.pause_btn)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_processing)
+        run_layout.addWidget(self.cancel_btn)
+        controls_layout.addLayout(run_layout)
+        
+        # Worker processes used for extraction
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel("Workers:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, max(64, default_worker_count()))
+        self.workers_spin.setValue(default_worker_count())
+        self.workers_spin.valueChanged.connect(self.workers_changed)
+        workers_layout.addWidget(self.workers_spin)
+        controls_layout.addLayout(workers_layout)
+        
+        # Reuse text and fields extracted in earlier runs
+        self.use_cache_check = QCheckBox("Use extraction cache")
+        self.use_cache_check.setChecked(True)
+        self.use_cache_check.setToolTip(str(DEFAULT_CACHE_PATH))
+        controls_layout.addWidget(self.use_cache_check)
+        
+        # Duplicate resumes reuse their first copy's fields and are listed under it
+        self.dedupe_check = QCheckBox("Skip analysing duplicate resumes")
+        self.dedupe_check.setChecked(DEDUPE_RESUMES)
+        controls_layout.addWidget(self.dedupe_check)
+        
         self.progress_bar = QProgressBar()
         controls_layout.addWidget(self.progress_bar)
         
@@ -205,6 +304,24 @@ class ResumeClassifierGUI(QMainWindow):
         self.export_all_btn.setMenu(export_menu)
         self.export_all_btn.setDefaultAction(export_docx_action)  # Default to DOCX
         export_layout.addWidget(self.export_all_btn)
+        
+        export_score_layout = QHBoxLayout()
+        export_score_layout.addWidget(QLabel("Min match score:"))
+        self.export_score_spin = QDoubleSpinBox()
+        self.export_score_spin.setRange(0.0, 1.0)
+        self.export_score_spin.setSingleStep(0.05)
+        self.export_score_spin.setValue(EXPORT_MIN_MATCH_SCORE)
+        export_score_layout.addWidget(self.export_score_spin)
+        export_layout.addLayout(export_score_layout)
+        
+        # Write every processed profile to a CSV, JSONL or XLSX file as it arrives
+        self.stream_results_check = QCheckBox("Stream results to file...")
+        self.stream_results_check.toggled.connect(self.toggle_results_sink)
+        export_layout.addWidget(self.stream_results_check)
+        
+        self.export_telemetry_btn = QPushButton("Export Telemetry...")
+        self.export_telemetry_btn.clicked.connect(self.export_telemetry)
+        export_layout.addWidget(self.export_telemetry_btn)
 
         
         
@@ -238,9 +355,8 @@ class ResumeClassifierGUI(QMainWindow):
         layout.addLayout(header_layout)
         
         # Results table
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(7)  # Match Score, Name, Age, Education, Current Role, Location, Nationality
-        self.results_table.setHorizontalHeaderLabels(["Match Score", "Name", "Age", "Education", "Current Role", "Location", "Nationality"])
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)  # Match Score, Name, Age, Education, Current Role, Location, Nationality
     
         # Set column widths
         header = self.results_table.horizontalHeader()
@@ -256,8 +372,8 @@ class ResumeClassifierGUI(QMainWindow):
         header.resizeSection(6, 100)
 
         self.results_table.setAlternatingRowColors(True)
-        self.results_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.results_table.itemSelectionChanged.connect(self.show_candidate_details)
+        self.results_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.results_table.selectionModel().selectionChanged.connect(self.show_candidate_details)
         
         layout.addWidget(self.results_table)
         
@@ -286,14 +402,15 @@ class ResumeClassifierGUI(QMainWindow):
             self,
             "Select Resume Files",
             "",
-            "Resume Files (*.pdf *.docx *.txt);;PDF Files (*.pdf);;Word Files (*.docx);;Text Files (*.txt)"
+            "Resume Files (*.pdf *.docx *.odt *.rtf *.txt);;PDF Files (*.pdf);;Word Files (*.docx);;"
+            "OpenDocument Files (*.odt);;Rich Text Files (*.rtf);;Text Files (*.txt)"
         )
         
         if file_paths:
             self.selected_files = file_paths
             file_count = len(file_paths)
             self.selected_files_label.setText(f"{file_count} files selected")
-            self.process_btn.setEnabled(True)
+            self.process_btn.setEnabled(self.watch_thread is None)
         else:
             self.selected_files = []
             self.selected_files_label.setText("No files selected")
@@ -319,81 +436,196 @@ class ResumeClassifierGUI(QMainWindow):
             return
         
         criteria = self.get_filter_criteria()
+        # A new run replaces the results, and the streamed file with them
+        sink = self.open_results_sink(append=False)
+        if sink is False:
+            return
         
         # Disable process button and clear previous results
         self.process_btn.setEnabled(False)
+        self.watch_btn.setEnabled(False)
         self.clear_results()
         self.progress_bar.setValue(0)
+        TELEMETRY.reset()
         
         # Start processing thread
-        self.processing_thread = ProcessingThread(self.selected_files, criteria)
+        cache_path = str(DEFAULT_CACHE_PATH) if self.use_cache_check.isChecked() else None
+        self.processing_thread = ProcessingThread(self.selected_files, criteria,
+                                                  self.workers_spin.value(), cache_path,
+                                                  journal_path=str(DEFAULT_JOURNAL_PATH), sink=sink,
+                                                  dedupe=self.dedupe_check.isChecked())
         self.processing_thread.progress_updated.connect(self.progress_bar.setValue)
-        self.processing_thread.resume_processed.connect(self.add_candidate)
+        self.processing_thread.throughput_updated.connect(self.show_throughput)
+        self.processing_thread.resumes_processed.connect(self.add_candidates)
+        self.processing_thread.resumes_restored.connect(self.show_restored)
+        self.processing_thread.sink_failed.connect(self.results_sink_failed)
+        self.processing_thread.processing_failed.connect(self.processing_failed)
         self.processing_thread.processing_finished.connect(self.processing_complete)
         self.processing_thread.start()
         
+        self.pause_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(True)
         self.statusBar().showMessage("Processing resumes...")
     
-    def add_candidate(self, profile: CandidateProfile):
-        """Add processed candidate to results"""
-        self.candidates.append(profile)
+    def toggle_pause(self, paused: bool):
+        """Pause or resume the running batch"""
+        if not self.processing_thread:
+            return
+        if paused:
+            self.processing_thread.pause()
+            self.pause_btn.setText("Resume")
+            self.statusBar().showMessage(f"Paused. {len(self.candidates)} candidates processed so far.")
+        else:
+            self.processing_thread.resume()
+            self.pause_btn.setText("Pause")
+            self.statusBar().showMessage("Processing resumes...")
+    
+    def cancel_processing(self):
+        """Stop the running batch, keeping the results it already has"""
+        if self.processing_thread:
+            self.cancel_btn.setEnabled(False)
+            self.processing_thread.cancel()
+            self.statusBar().showMessage("Cancelling...")
+    
+    def show_restored(self, count: int):
+        """Say that an interrupted run over the same files is being continued"""
+        self.statusBar().showMessage(f"Continuing an interrupted run: {count} resumes already done.")
+    
+    def toggle_watch(self, checked: bool):
+        """Start or stop watching a folder for new and changed resumes"""
+        if not checked:
+            if self.watch_thread:
+                self.watch_btn.setEnabled(False)
+                self.watch_thread.requestInterruption()
+            return
+        
+        directory = QFileDialog.getExistingDirectory(self, "Select Folder to Watch")
+        if not directory:
+            self.watch_btn.setChecked(False)
+            return
+        
+        # Watched results join the live set; they are not cleared like a new run, nor is a CSV or JSONL file
+        sink = self.open_results_sink(append=True)
+        if sink is False:
+            self.watch_btn.setChecked(False)
+            return
+        # Small arrivals are processed in the watch thread, which shares the warmed-up model
+        self.start_model_warmup()
+        cache_path = str(DEFAULT_CACHE_PATH) if self.use_cache_check.isChecked() else None
+        self.watch_thread = WatchThread([directory], self.get_filter_criteria(),
+                                        self.workers_spin.value(), cache_path, sink=sink,
+                                        dedupe=self.dedupe_check.isChecked())
+        self.watch_thread.progress_updated.connect(self.progress_bar.setValue)
+        self.watch_thread.throughput_updated.connect(self.show_throughput)
+        self.watch_thread.resumes_processed.connect(self.add_candidates)
+        self.watch_thread.batch_finished.connect(self.watch_batch_finished)
+        self.watch_thread.sink_failed.connect(self.results_sink_failed)
+        self.watch_thread.processing_failed.connect(self.processing_failed)
+        self.watch_thread.processing_finished.connect(self.watch_stopped)
+        self.watch_thread.start()
+        
+        self.process_btn.setEnabled(False)
+        self.watch_btn.setText(f"Stop Watching {Path(directory).name}")
+        self.statusBar().showMessage(f"Watching {directory} for resumes...")
+    
+    def watch_batch_finished(self, file_count: int):
+        """Re-sort once files picked up from the watched folder are in the results"""
+        self.sort_results()
+        self.statusBar().showMessage(
+            f"Added or updated {file_count} resumes from the watched folder; {len(self.candidates)} candidates.")
+    
+    def watch_stopped(self):
+        """Return the controls to normal once the watch thread has exited"""
+        self.watch_thread.wait()
+        self.watch_thread = None
+        self.watch_btn.setText("Watch Folder...")
+        self.watch_btn.setChecked(False)
+        self.watch_btn.setEnabled(True)
+        self.process_btn.setEnabled(bool(getattr(self, 'selected_files', None)))
+        error, self.processing_error = self.processing_error, None
+        if error:
+            self.statusBar().showMessage(f"Stopped watching: {error}")
+        else:
+            self.statusBar().showMessage("Stopped watching.")
+    
+    def closeEvent(self, event):
+        """Stop watching and processing before the window closes; the journal keeps a batch's progress"""
+        if self.watch_thread:
+            self.watch_thread.requestInterruption()
+            self.watch_thread.wait()
+        if self.processing_thread:
+            self.processing_thread.cancel()
+            self.processing_thread.wait()
+        if self.export_thread:
+            self.export_thread.requestInterruption()
+            self.export_thread.wait()
+        super().closeEvent(event)
+    
+    def add_candidates(self, profiles: List[CandidateProfile]):
+        """Add a batch of processed candidates to results"""
+        # Score against the current criteria, which may have changed since processing started
+        self.results_model.append_profiles(profiles, self.get_filter_criteria())
         self.update_results_display()
     
+    def show_throughput(self, done: int, total: int, rate: float, remaining: float):
+        """Show processing speed and estimated time left in the status bar"""
+        if done < total:
+            self.statusBar().showMessage(
+                f"Processing resumes... {done}/{total} ({rate:.1f} files/s, about {remaining:.0f} s left)")
+    
     def processing_complete(self):
         """Handle processing completion"""
+        cancelled = self.processing_thread.isInterruptionRequested()
+        # The thread has only its return left; let it finish before dropping it
+        self.processing_thread.wait()
+        self.processing_thread = None
         self.process_btn.setEnabled(True)
-        self.statusBar().showMessage(f"Processing complete. {len(self.candidates)} candidates processed.")
+        self.watch_btn.setEnabled(True)
+        self.pause_btn.setChecked(False)
+        self.pause_btn.setText("Pause")
+        self.pause_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(False)
+        error, self.processing_error = self.processing_error, None
+        if error:
+            self.statusBar().showMessage(
+                f"Processing failed. {len(self.candidates)} candidates processed; "
+                f"processing the same files again continues from here.")
+        elif cancelled:
+            self.statusBar().showMessage(
+                f"Processing cancelled. {len(self.candidates)} candidates processed; "
+                f"processing the same files again continues from here.")
+        else:
+            self.statusBar().showMessage(f"Processing complete. {len(self.candidates)} candidates processed.")
+        self.sort_results()
+    
+    def rescore_candidates(self):
+        """Re-score and re-sort the loaded candidates for the current criteria without re-extracting them"""
+        if not self.candidates:
+            return
+        self.results_model.rescore(self.get_filter_criteria())
         self.sort_results()
+        self.statusBar().showMessage(f"Re-scored {len(self.candidates)} candidates for the current criteria.")
     
     def update_results_display(self):
-        """Update the results table display"""
+        """Update the results count; the table reads its rows from the model"""
         self.results_label.setText(f"Results: {len(self.candidates)} candidates processed")
-        
-        # Update table
-        self.results_table.setRowCount(len(self.candidates))
-        
-        for row, candidate in enumerate(self.candidates):
-            # Match Score
-            score_item = QTableWidgetItem(f"{candidate.match_score:.2f}")
-            score_item.setData(Qt.ItemDataRole.UserRole, candidate.match_score)
-            self.results_table.setItem(row, 0, score_item)
-            
-            # Color code based on match score
-            if candidate.match_score >= 0.8:
-                score_item.setBackground(QColor(144, 238, 144))  # Light green
-            elif candidate.match_score >= 0.6:
-                score_item.setBackground(QColor(255, 255, 144))  # Light yellow
-            elif candidate.match_score >= 0.4:
-                score_item.setBackground(QColor(255, 200, 144))  # Light orange
-            else:
-                score_item.setBackground(QColor(255, 144, 144))  # Light red
-            
-            # Other fields
-            self.results_table.setItem(row, 1, QTableWidgetItem(candidate.name))
-            self.results_table.setItem(row, 2, QTableWidgetItem(str(candidate.age) if candidate.age else "N/A"))
-            self.results_table.setItem(row, 3, QTableWidgetItem(candidate.education))
-            self.results_table.setItem(row, 4, QTableWidgetItem(candidate.current_role))
-            self.results_table.setItem(row, 5, QTableWidgetItem(candidate.current_residence))
-            self.results_table.setItem(row, 6, QTableWidgetItem(candidate.nationality))
     
     def sort_results(self):
         """Sort results based on selected criteria"""
         sort_by = self.sort_combo.currentText()
         
         if sort_by == "Match Score":
-            self.candidates.sort(key=lambda x: x.match_score, reverse=True)
+            self.results_model.sort_by('match_score', descending=True)
         elif sort_by == "Name":
-            self.candidates.sort(key=lambda x: x.name.lower())
+            self.results_model.sort_by('name')
         elif sort_by == "Age":
-            self.candidates.sort(key=lambda x: x.age if x.age else 0)
+            self.results_model.sort_by('age')
         elif sort_by == "Nationality":
-            self.candidates.sort(key=lambda x: x.nationality.lower() if x.nationality else "")
-        
-        self.update_results_display()
+            self.results_model.sort_by('nationality')
     
     def show_candidate_details(self):
         """Show detailed information for selected candidate"""
-        current_row = self.results_table.currentRow()
+        current_row = self.results_table.currentIndex().row()
         if current_row >= 0 and current_row < len(self.candidates):
             candidate = self.candidates[current_row]
             details = f"""
@@ -406,7 +638,8 @@ class ResumeClassifierGUI(QMainWindow):
                 <b>Email:</b> {candidate.email}<br>
                 <b>Phone:</b> {candidate.phone}<br>
                 <b>Match Score:</b> {candidate.match_score:.2f}<br>
-                <b>File:</b> {Path(candidate.file_path).name}<br><br>
+                <b>File:</b> {Path(candidate.file_path).name}<br>
+                {f"<b>Duplicate of:</b> {Path(candidate.duplicate_of).name}<br>" if candidate.duplicate_of else ""}<br>
                 <b>Resume Preview:</b><br>
                 {candidate.raw_text}
                 """
@@ -414,20 +647,93 @@ class ResumeClassifierGUI(QMainWindow):
     
     def clear_results(self):
         """Clear all results"""
-        self.candidates.clear()
-        self.results_table.setRowCount(0)
+        self.results_model.clear()
         self.details_text.clear()
         self.results_label.setText("Results: 0 candidates processed")
         self.progress_bar.setValue(0)
                 
+    def export_telemetry(self):
+        """Save the stage timings as a Prometheus textfile or as JSON"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Telemetry", "resume_telemetry.prom",
+            "Prometheus Textfile (*.prom);;JSON Files (*.json)")
+        if not file_path:
+            return
+        try:
+            TELEMETRY.export(file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to export telemetry: {str(e)}")
+            return
+        self.statusBar().showMessage(f"Telemetry exported to {file_path}")
+    
+    def toggle_results_sink(self, checked: bool):
+        """Choose the file processed profiles are streamed to, or stop streaming them"""
+        if checked:
+            file_path, _ = QFileDialog.getSaveFileName(
+                self, "Stream Results To", "candidates.csv",
+                "CSV Files (*.csv);;Excel Workbooks (*.xlsx);;JSON Lines (*.jsonl)")
+            if not file_path:
+                self.stream_results_check.setChecked(False)
+                return
+            self.results_sink_path = file_path
+            self.stream_results_check.setText(f"Stream results to {Path(file_path).name}")
+            self.stream_results_check.setToolTip(file_path)
+        else:
+            self.results_sink_path = None
+            self.stream_results_check.setText("Stream results to file...")
+            self.stream_results_check.setToolTip("")
+    
+    def open_results_sink(self, append: bool):
+        """The sink for the next run, None when not streaming, or False when the file can't be opened"""
+        if not self.results_sink_path:
+            return None
+        try:
+            return open_sink(self.results_sink_path, append=append)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to open {self.results_sink_path}: {str(e)}")
+            return False
+    
+    def processing_failed(self, error: str):
+        """Report an error that stopped a processing or watch run"""
+        # Set before the dialog, whose event loop may deliver processing_finished
+        self.processing_error = error
+        QMessageBox.critical(self, "Error", f"Processing stopped: {error}")
+    
+    def results_sink_failed(self, error: str):
+        QMessageBox.warning(self, "Warning", f"Stopped streaming results to {self.results_sink_path}: {error}")
+    
     def export_to_format(self, format_type):
-        """Export filtered candidates to specified format"""
+        """Export the candidates scoring at least the export threshold, in a background thread"""
         if not self.candidates:
             QMessageBox.information(self, "Info", "No candidates to export.")
             return
+        if self.export_thread:
+            QMessageBox.information(self, "Info", "An export is already running.")
+            return
         
-        # Select directory to save files
         format_upper = format_type.upper()
+        if format_type == 'pdf':
+            try:
+                import docx2pdf  # noqa: F401
+            except ImportError:
+                QMessageBox.critical(self, "Error",
+                                   "PDF export requires 'docx2pdf' package. Please install it using: pip install docx2pdf")
+                return
+        
+        if not Path(EXPORT_TEMPLATE_PATH).exists():
+            QMessageBox.critical(self, "Error", f"Template file not found: {EXPORT_TEMPLATE_PATH}")
+            return
+        
+        min_score = self.export_score_spin.value()
+        # Standalone copies: the store may change while the export runs, and rows can't cross processes.
+        # A duplicate resume would only export its first copy's CV again
+        profiles = [candidate.to_profile() for candidate in self.candidates.in_range('match_score', low=min_score)
+                    if not candidate.duplicate_of]
+        if not profiles:
+            QMessageBox.information(self, "Info", f"No candidates score {min_score:.2f} or more.")
+            return
+        
+        # Select directory to save files
         output_dir = QFileDialog.getExistingDirectory(
             self,
             f"Select Output Directory for CV Files ({format_upper})",
@@ -437,156 +743,31 @@ class ResumeClassifierGUI(QMainWindow):
         if not output_dir:
             return
         
-        try:
-            if format_type == 'docx':
-                self.export_to_docx(output_dir)
-            elif format_type == 'pdf':
-                self.export_to_pdf(output_dir)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to export CVs as {format_upper}: {str(e)}")
-
-    def export_to_docx(self, output_dir):
-        """Export filtered candidates to individual DOCX files using the template"""
-        template_path = "temp.docx"
-        if not Path(template_path).exists():
-            QMessageBox.critical(self, "Error", f"Template file not found: {template_path}")
-            return
-        
-        exported_count = 0
-        
-        for candidate in self.candidates:
-            if candidate.match_score >= 0.4:  # Only export candidates with decent match scores
-                try:
-                    # Create a copy of the template
-                    doc = Document(template_path)
-                    
-                    # Fill the template with candidate data
-                    self.fill_template_with_candidate_data(doc, candidate)
-                    
-                    # Save the filled template
-                    safe_name = "".join(c for c in candidate.name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                    if not safe_name:
-                        safe_name = f"Candidate_{exported_count + 1}"
-                    
-                    output_file = Path(output_dir) / f"{safe_name}_CV.docx"
-                    doc.save(str(output_file))
-                    exported_count += 1
-                    
-                except Exception as e:
-                    print(f"Error exporting {candidate.name}: {e}")
-                    continue
-        
-        QMessageBox.information(self, "Success", 
-                            f"Successfully exported {exported_count} CV files to {output_dir}")
-
-    def export_to_pdf(self, output_dir):
-        """Export filtered candidates to individual PDF files"""
-        try:
-            from docx2pdf import convert
-            import tempfile
-            import os
-        except ImportError:
-            QMessageBox.critical(self, "Error", 
-                               "PDF export requires 'docx2pdf' package. Please install it using: pip install docx2pdf")
-            return
-        
-        template_path = "temp.docx"
-        if not Path(template_path).exists():
-            QMessageBox.critical(self, "Error", f"Template file not found: {template_path}")
-            return
-        
-        exported_count = 0
-        
-        # Create temporary directory for DOCX files
-        with tempfile.TemporaryDirectory() as temp_dir:
-            for candidate in self.candidates:
-                if candidate.match_score >= 0.4:  # Only export candidates with decent match scores
-                    try:
-                        # Create a copy of the template
-                        doc = Document(template_path)
-                        
-                        # Fill the template with candidate data
-                        self.fill_template_with_candidate_data(doc, candidate)
-                        
-                        # Save the filled template to temp directory
-                        safe_name = "".join(c for c in candidate.name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                        if not safe_name:
-                            safe_name = f"Candidate_{exported_count + 1}"
-                        
-                        temp_docx = Path(temp_dir) / f"{safe_name}_CV.docx"
-                        doc.save(str(temp_docx))
-                        
-                        # Convert to PDF
-                        output_pdf = Path(output_dir) / f"{safe_name}_CV.pdf"
-                        convert(str(temp_docx), str(output_pdf))
-                        
-                        exported_count += 1
-                        
-                    except Exception as e:
-                        print(f"Error exporting {candidate.name} to PDF: {e}")
-                        continue
-        
-        QMessageBox.information(self, "Success", 
-                            f"Successfully exported {exported_count} PDF files to {output_dir}")
-
-    def fill_template_with_candidate_data(self, doc, candidate):
-        """Fill the template document with candidate data"""
-        # Get all tables in the document
-        if not doc.tables:
+        self.export_all_btn.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.statusBar().showMessage(f"Exporting {len(profiles)} CVs as {format_upper}...")
+        self.export_thread = ExportThread(profiles, output_dir, format_type, min_score,
+                                          self.workers_spin.value())
+        self.export_thread.progress_updated.connect(self.progress_bar.setValue)
+        self.export_thread.export_finished.connect(
+            lambda exported, failed: self.export_complete(format_upper, output_dir, exported, failed))
+        self.export_thread.export_failed.connect(
+            lambda error: self.export_complete(format_upper, output_dir, 0, [], error))
+        self.export_thread.start()
+    
+    def export_complete(self, format_upper: str, output_dir: str, exported: int, failed: List[str],
+                        error: str = None):
+        """Report the export and return the controls to normal once the export thread has exited"""
+        self.export_thread.wait()
+        self.export_thread = None
+        self.export_all_btn.setEnabled(True)
+        self.statusBar().showMessage(f"Exported {exported} CVs as {format_upper}.")
+        if error:
+            QMessageBox.critical(self, "Error", f"Failed to export CVs as {format_upper}: {error}")
             return
-            
-        table = doc.tables[0]  # Assuming the main table is the first one
-        
-        # Helper function to set cell text safely
-        def set_cell_text(row_idx, col_idx, text):
-            try:
-                if row_idx < len(table.rows) and col_idx < len(table.rows[row_idx].cells):
-                    cell = table.rows[row_idx].cells[col_idx]
-                    # Clear existing content
-                    for paragraph in cell.paragraphs:
-                        p = paragraph._element
-                        p.getparent().remove(p)
-                    # Add new text
-                    cell.add_paragraph(str(text) if text else "")
-            except Exception as e:
-                print(f"Error setting cell [{row_idx}][{col_idx}]: {e}")
-        
-        # Fill the template based on the table structure
-        # Row 1: Proposed Position
-        if candidate.current_role:
-            set_cell_text(1, 4, candidate.current_role)
-        
-        # Row 2: Location
-        if candidate.current_residence:
-            set_cell_text(2, 4, candidate.current_residence)
-        
-        # Row 3: Name
-        if candidate.name:
-            set_cell_text(3, 4, candidate.name)
-        
-        # Row 4: Date of Birth (calculate from age)
-        if candidate.age and candidate.age > 0:
-            birth_year = datetime.now().year - candidate.age
-            set_cell_text(4, 4, f"Approximately {birth_year}")
-        
-        # Row 5: Nationality
-        if candidate.nationality:
-            set_cell_text(5, 4, candidate.nationality)
-        
-        # Row 7: Education
-        if candidate.education:
-            set_cell_text(7, 4, candidate.education)
-        
-        # Row 10: Countries of Work Experience
-        if candidate.current_residence:
-            set_cell_text(10, 4, candidate.current_residence)
-        
-        # Row 12: Employment Record - Current position
-        if candidate.current_role:
-            # Find the employment record rows and fill current position
-            for i in range(12, min(20, len(table.rows))):
-                try:
-                    if table.rows[i].cells[1].text.strip() == "Present":
-                        set_cell_text(i, 6, candidate.current_role)  # Role/Position Held
-                except Exception as e:
-                    continue
\ No newline at end of file
+        message = f"Successfully exported {exported} {format_upper} files to {output_dir}"
+        if failed:
+            message += f"\n\n{len(failed)} could not be exported: {', '.join(failed[:10])}"
+            if len(failed) > 10:
+                message += ", ..."
+        QMessageBox.information(self, "Success", message)
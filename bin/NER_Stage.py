@@ -0,0 +1,157 @@
+import re
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from Section_Segmenter import Sections, segment_sections
+from Telemetry import TELEMETRY
+from resume_config import (SPACY_MODEL, NER_BATCH_SIZE, NER_PROCESSES, NAME_WINDOW_CHARS,
+                           LOCATION_HEADER_CHARS, LOCATION_WINDOW_CHARS, LOCATION_HINT_PATTERN)
+
+# Purposes NER is run for, each over its own trimmed window of the resume
+NER_PURPOSES = ('name', 'location')
+
+# (label, text, start_char) - plain tuples so entities can cross process boundaries
+Entity = Tuple[str, str, int]
+
+
+# Pipelines already loaded in this process, shared by every processor
+_loaded_pipelines = {}
+_load_lock = threading.Lock()
+
+
+def load_ner_pipeline(model_name: str = SPACY_MODEL):
+    """Load a spaCy pipeline with only the components named entity recognition needs.
+    
+    spaCy is imported on first use and each model is loaded once per process,
+    so a background warm-up and the processing thread share the same pipeline.
+    """
+    with _load_lock:
+        if model_name not in _loaded_pipelines:
+            _loaded_pipelines[model_name] = _load_pipeline(model_name)
+        return _loaded_pipelines[model_name]
+
+
+def _load_pipeline(model_name: str):
+    import spacy
+    nlp = spacy.load(model_name)
+    needed = {'ner'}
+    # Keep the shared tok2vec only when the NER component listens to it
+    if 'tok2vec' in nlp.pipe_names:
+        listeners = getattr(nlp.get_pipe('tok2vec'), 'listening_components', [])
+        if 'ner' in listeners:
+            needed.add('tok2vec')
+    for pipe_name in nlp.pipe_names:
+        if pipe_name not in needed:
+            nlp.disable_pipe(pipe_name)
+    return nlp
+
+
+def name_window(text: str, sections: Sections = None) -> str:
+    """Header and contact sections of the resume, where the candidate's name is printed"""
+    if sections is not None and sections.structured:
+        header = sections.text(text, 'header', 'contact')
+        if header.strip():
+            text = header
+    clean_text = re.sub(r'^\d+\s+de\s+\d+\s*', '', text)
+    return clean_text[:NAME_WINDOW_CHARS]
+
+
+def location_window(text: str, sections: Sections = None) -> str:
+    """Header and contact sections plus the other lines that mention an address or location"""
+    covered = sections.ranges(('header', 'contact')) if sections is not None and sections.structured else []
+    if not covered:
+        covered = [(0, min(len(text), LOCATION_HEADER_CHARS))]
+    parts = [text[start:end] for start, end in covered]
+    size = sum(len(part) for part in parts)
+    last_line_end = covered[0][1]
+
+    for match in LOCATION_HINT_PATTERN.finditer(text, last_line_end):
+        if match.start() < last_line_end or any(start <= match.start() < end for start, end in covered):
+            continue
+        line_start = text.rfind('\n', 0, match.start()) + 1
+        line_end = text.find('\n', match.end())
+        if line_end == -1:
+            line_end = len(text)
+        part_start = max(line_start, last_line_end)
+        for start, end in covered:
+            if start <= part_start < end:
+                part_start = end
+        parts.append(text[part_start:line_end])
+        size += line_end - line_start
+        last_line_end = line_end
+        if size >= LOCATION_WINDOW_CHARS:
+            break
+
+    return '\n'.join(parts)[:LOCATION_WINDOW_CHARS]
+
+
+WINDOW_BUILDERS = {
+    'name': name_window,
+    'location': location_window,
+}
+
+
+class DocumentEntities:
+    """NER entities of one resume, grouped by purpose.
+
+    A deferred instance holds no entities yet: it records which purposes
+    were asked for so a batch can run them all through nlp.pipe afterwards.
+    """
+
+    def __init__(self, entities: Dict[str, List[Entity]] = None, deferred: bool = False):
+        self.entities = entities or {}
+        self.deferred = deferred
+        self.requested = set()
+        self.request_count = 0
+        self.deferred_fields = []
+
+    def get(self, purpose: str) -> List[Entity]:
+        if self.deferred:
+            self.requested.add(purpose)
+            self.request_count += 1
+            return []
+        return self.entities.get(purpose, [])
+
+
+class NERStage:
+    """Runs trimmed, batched NER over many resumes"""
+
+    def __init__(self, nlp, batch_size: int = NER_BATCH_SIZE, n_process: int = NER_PROCESSES):
+        self.nlp = nlp
+        self.batch_size = batch_size
+        self.n_process = n_process
+
+    def entities(self, text: str, purpose: str, sections: Sections = None) -> List[Entity]:
+        """Entities for a single resume and purpose"""
+        if sections is None:
+            sections = segment_sections(text)
+        with TELEMETRY.timer('spacy'):
+            doc = self.nlp(WINDOW_BUILDERS[purpose](text, sections))
+        return [(ent.label_, ent.text, ent.start_char) for ent in doc.ents]
+
+    def annotate(self, texts: Sequence[str], purposes: Sequence[Sequence[str]],
+                 sections: Sequence[Sections] = None) -> List[DocumentEntities]:
+        """Entities for many resumes; purposes[i] lists the windows needed for texts[i]"""
+        windows = []
+        owners = []
+        for index, (text, doc_purposes) in enumerate(zip(texts, purposes)):
+            doc_sections = sections[index] if sections is not None else segment_sections(text)
+            for purpose in doc_purposes:
+                windows.append(WINDOW_BUILDERS[purpose](text, doc_sections))
+                owners.append((index, purpose))
+
+        results = [DocumentEntities() for _ in texts]
+        started = time.perf_counter()
+        docs = self.nlp.pipe(windows, batch_size=self.batch_size, n_process=self.n_process)
+        for (index, purpose), doc in zip(owners, docs):
+            results[index].entities[purpose] = [(ent.label_, ent.text, ent.start_char) for ent in doc.ents]
+
+        # nlp.pipe works on the batch as a whole; each resume is charged its share
+        annotated = sum(1 for doc_purposes in purposes if doc_purposes)
+        if annotated:
+            share = (time.perf_counter() - started) / annotated
+            for _ in range(annotated):
+                TELEMETRY.observe('spacy', share)
+
+        return results
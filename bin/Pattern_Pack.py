@@ -0,0 +1,173 @@
+import re
+from typing import Iterator, List, Sequence, Tuple, Union
+
+from Regex_Guard import PatternBudget, RegexBudgetExceeded
+from resume_config import REGEX_TIME_BUDGET
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to an ASCII letter
+_ASCII_CASE_FOLD = str.maketrans({'İ': 'i', 'ı': 'i', 'ſ': 's', 'K': 'k'})
+
+# Shortest literal worth checking before running a pattern
+_MIN_LITERAL_LENGTH = 3
+
+_REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+if hasattr(sre_parse, 'POSSESSIVE_REPEAT'):
+    _REPEATS.add(sre_parse.POSSESSIVE_REPEAT)
+
+# A pattern can only match when, for every requirement, one of its literals is in the text
+Requirement = Tuple[bool, Tuple[str, ...]]  # (ignore case, alternative literals)
+
+
+def _usable_literal(literal: str, ignorecase: bool) -> bool:
+    return len(literal) >= _MIN_LITERAL_LENGTH and (literal.isascii() or not ignorecase)
+
+
+def _sequence_requirements(items, ignorecase: bool) -> List[Requirement]:
+    """Literals that every match of a parsed regex sequence must contain"""
+    requirements = []
+    run = []
+
+    def flush():
+        literal = ''.join(run)
+        if _usable_literal(literal, ignorecase):
+            requirements.append((ignorecase, (literal.lower() if ignorecase else literal,)))
+        run.clear()
+
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        flush()
+
+        if op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            sub_ignorecase = bool((ignorecase or add_flags & re.IGNORECASE) and not del_flags & re.IGNORECASE)
+            requirements.extend(_sequence_requirements(sub, sub_ignorecase))
+        elif op in _REPEATS and av[0] >= 1:
+            requirements.extend(_sequence_requirements(av[2], ignorecase))
+        elif op is sre_parse.BRANCH:
+            alternatives = []
+            for branch in av[1]:
+                literals = [literal for branch_ignorecase, branch_literals in _sequence_requirements(branch, ignorecase)
+                            if branch_ignorecase == ignorecase and len(branch_literals) == 1
+                            for literal in branch_literals]
+                if not literals:
+                    alternatives = None
+                    break
+                alternatives.append(max(literals, key=len))
+            if alternatives:
+                requirements.append((ignorecase, tuple(alternatives)))
+        # Lookarounds, anchors, classes and optional parts add no requirement
+
+    flush()
+    return requirements
+
+
+def required_literals(pattern: re.Pattern) -> List[Requirement]:
+    """Literals a pattern can't match without, or [] when they can't be worked out"""
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return []
+    return _sequence_requirements(list(parsed), bool(pattern.flags & re.IGNORECASE))
+
+
+def _findall_item(match, group_count: int):
+    """The value re.findall would produce for this match"""
+    if group_count == 0:
+        return match.group(0)
+    if group_count == 1:
+        return match.group(1) or ''
+    return match.groups('')
+
+
+# Last text folded, reused while one resume goes through several families
+_last_folded = (None, None)
+
+
+def _case_folded(text: str) -> str:
+    """Lowercased text in which IGNORECASE-equivalent letters are plain ASCII"""
+    global _last_folded
+    last_text, folded = _last_folded
+    if last_text is text:
+        return folded
+    if text.isascii():
+        folded = text.lower()
+    else:
+        folded = text.translate(_ASCII_CASE_FOLD).lower()
+    _last_folded = (text, folded)
+    return folded
+
+
+class PatternPack:
+    """A family of regex patterns compiled once and scanned in priority order.
+
+    Each pattern is skipped outright when the text lacks a literal the
+    pattern needs, which costs a substring check instead of a regex scan.
+    The remaining patterns are scanned lazily, so a caller that stops at
+    the first valid match never computes the full findall list. Results
+    keep the family's first-valid-match priority and are identical to
+    running re.findall pattern by pattern.
+
+    Every pattern gets an execution budget per text; a pattern that runs
+    past it is cut off, logged and treated as having no further matches.
+    """
+
+    def __init__(self, patterns: Sequence[Union[str, re.Pattern]], flags: int = 0,
+                 name: str = "patterns", time_budget: float = REGEX_TIME_BUDGET):
+        self.name = name
+        self.time_budget = time_budget
+        self.sources: List[str] = []
+        self.compiled: List[re.Pattern] = []
+        for pattern in patterns:
+            if isinstance(pattern, re.Pattern):
+                self.sources.append(pattern.pattern)
+                self.compiled.append(pattern)
+            else:
+                self.sources.append(pattern)
+                self.compiled.append(re.compile(pattern, flags))
+        self.requirements = [required_literals(pattern) for pattern in self.compiled]
+
+    def candidates(self, text: str) -> Tuple[int, ...]:
+        """Indexes of the patterns whose required literals all occur in the text"""
+        folded = None
+        indexes = []
+        for index, requirements in enumerate(self.requirements):
+            for ignorecase, literals in requirements:
+                if ignorecase:
+                    if folded is None:
+                        folded = _case_folded(text)
+                    haystack = folded
+                else:
+                    haystack = text
+                if not any(literal in haystack for literal in literals):
+                    break
+            else:
+                indexes.append(index)
+        return tuple(indexes)
+
+    def iter_matches(self, text: str, first_only: bool = False) -> Iterator[Tuple[int, str, object]]:
+        """(index, pattern source, findall-style match) for each pattern in priority order.
+
+        Matches are produced lazily, so callers that stop at the first valid
+        match never pay for scanning the rest of the text or family.
+        """
+        for index in self.candidates(text):
+            pattern = self.compiled[index]
+            budget = PatternBudget(f"{self.name}[{index}]", self.time_budget)
+            matches = pattern.finditer(text)
+            try:
+                while True:
+                    match = budget.run(next, matches, None)
+                    if match is None:
+                        break
+                    yield index, self.sources[index], _findall_item(match, pattern.groups)
+                    if first_only:
+                        break
+            except RegexBudgetExceeded:
+                continue
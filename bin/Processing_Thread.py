@@ -1,27 +1,265 @@
 
+import threading
+import time
 from typing import Dict, List
 
 from PyQt6.QtCore import QThread, pyqtSignal
-from  Resume_Processor import ResumeProcessor
+from Batch_Journal import BatchJournal, batch_id
+from Batch_Processor import iter_processed_resumes, default_worker_count
+from CV_Export import export_docx, export_pdf
+from Folder_Watcher import FolderWatcher
+from NER_Stage import load_ner_pipeline
+from Result_Sinks import ResultSink
+from resume_config import (RESULT_BATCH_SIZE, RESULT_BATCH_INTERVAL_MS, PROGRESS_INTERVAL_MS, NER_BATCH_SIZE,
+                           DEDUPE_RESUMES)
 
 class ProcessingThread(QThread):
-    """Thread for processing resumes without blocking UI"""
+    """Thread for processing resumes without blocking UI.
+    
+    Profiles are sent in lists and progress is throttled, so a fast batch
+    doesn't flood the GUI's event queue with one signal per file.
+    
+    The run can be paused, resumed and cancelled. With a journal path, every
+    list of profiles is recorded in a BatchJournal before it is sent, and a
+    run over the same files after a crash or a cancel sends the recorded
+    profiles first and processes only the files that were left.
+    
+    With a result sink, every list of profiles sent to the GUI is also
+    written to it, and the sink is closed when the run ends. If writing
+    fails, sink_failed is sent and processing carries on without the sink.
+    
+    An error that stops the run is sent as processing_failed; the journal
+    keeps what was recorded. processing_finished is always sent last.
+    """
     progress_updated = pyqtSignal(int)
-    resume_processed = pyqtSignal(object)  # CandidateProfile
+    throughput_updated = pyqtSignal(int, int, float, float)  # done, total, files per second, seconds left
+    resumes_processed = pyqtSignal(list)  # List[CandidateProfile]
+    resumes_restored = pyqtSignal(int)  # profiles taken from the journal instead of processed
+    sink_failed = pyqtSignal(str)
+    processing_failed = pyqtSignal(str)
     processing_finished = pyqtSignal()
     
-    def __init__(self, file_paths: List[str], criteria: Dict):
+    def __init__(self, file_paths: List[str], criteria: Dict, workers: int = None,
+                 cache_path: str = None, batch_size: int = RESULT_BATCH_SIZE,
+                 batch_interval_ms: int = RESULT_BATCH_INTERVAL_MS,
+                 progress_interval_ms: int = PROGRESS_INTERVAL_MS, journal_path: str = None,
+                 sink: ResultSink = None, dedupe: bool = DEDUPE_RESUMES):
         super().__init__()
         self.file_paths = file_paths
         self.criteria = criteria
-        self.processor = ResumeProcessor()
+        self.workers = workers or default_worker_count()
+        self.cache_path = cache_path
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval_ms / 1000
+        self.progress_interval = progress_interval_ms / 1000
+        self.journal_path = journal_path
+        self.sink = sink
+        self.dedupe = dedupe
+        self.unpaused = threading.Event()
+        self.unpaused.set()
+    
+    def pause(self):
+        """Stop taking new results; work already handed to workers still finishes"""
+        self.unpaused.clear()
+    
+    def resume(self):
+        self.unpaused.set()
+    
+    def cancel(self):
+        """Stop after the results already received; with a journal, a rerun continues from there"""
+        self.requestInterruption()
+        self.unpaused.set()
+    
+    def is_paused(self) -> bool:
+        return not self.unpaused.is_set()
     
     def run(self):
-        for i, file_path in enumerate(self.file_paths):
-            profile = self.processor.process_resume(file_path, self.criteria)
-            self.resume_processed.emit(profile)
-            
-            progress = int((i + 1) / len(self.file_paths) * 100)
-            self.progress_updated.emit(progress)
+        journal = None
+        try:
+            # SQLite connections stay in the thread that opened them
+            journal = BatchJournal(self.journal_path) if self.journal_path else None
+            finished = self.process(self.file_paths, journal)
+            if journal and finished:
+                journal.finish(batch_id(self.file_paths))
+        except Exception as e:
+            self.processing_failed.emit(str(e))
+        finally:
+            if journal:
+                journal.close()
+            self.close_sink()
+            self.processing_finished.emit()
+    
+    def send_profiles(self, profiles: List):
+        """Send profiles to the GUI and write them to the sink"""
+        self.resumes_processed.emit(profiles)
+        if self.sink:
+            try:
+                self.sink.write(profiles)
+            except OSError as e:
+                self.sink_failed.emit(str(e))
+                self.close_sink()
+    
+    def close_sink(self):
+        sink, self.sink = self.sink, None
+        if sink:
+            try:
+                sink.close()
+            except OSError as e:
+                self.sink_failed.emit(str(e))
+    
+    def wait_while_paused(self) -> float:
+        """Block while paused, returning the seconds spent waiting"""
+        if self.unpaused.is_set():
+            return 0.0
+        paused_at = time.monotonic()
+        while not self.unpaused.wait(0.1) and not self.isInterruptionRequested():
+            pass
+        return time.monotonic() - paused_at
+    
+    def process(self, file_paths: List[str], journal: BatchJournal = None) -> bool:
+        """Process files, sending profiles and progress to the GUI as they come.
+        
+        Returns False when cancelled before every file was done.
+        """
+        total = len(file_paths)
+        batch = []
+        restored = 0
+        
+        if journal:
+            batch_key = batch_id(file_paths)
+            completed = journal.completed(batch_key)
+            file_paths = [file_path for file_path in file_paths if file_path not in completed]
+            restored = total - len(file_paths)
+            profiles = list(completed.values())
+            for start in range(0, len(profiles), self.batch_size):
+                self.send_profiles(profiles[start:start + self.batch_size])
+            if restored:
+                self.resumes_restored.emit(restored)
         
-        self.processing_finished.emit()
\ No newline at end of file
+        def flush():
+            if journal:
+                journal.record(batch_key, batch)
+            self.send_profiles(batch)
+        
+        started = last_flush = last_progress = time.monotonic()
+        done = restored
+        profiles = iter_processed_resumes(file_paths, self.criteria, self.workers,
+                                          self.cache_path, dedupe=self.dedupe)
+        try:
+            for profile in profiles:
+                batch.append(profile)
+                done += 1
+                now = time.monotonic()
+                if len(batch) >= self.batch_size or now - last_flush >= self.batch_interval:
+                    flush()
+                    batch = []
+                    last_flush = now
+                if now - last_progress >= self.progress_interval:
+                    self.report_progress(done, total, now - started, restored)
+                    last_progress = now
+                
+                if self.is_paused():
+                    if batch:
+                        flush()
+                        batch = []
+                    # Paused time doesn't count against the throughput
+                    started += self.wait_while_paused()
+                if self.isInterruptionRequested():
+                    break
+        finally:
+            # Shuts the workers down when cancelled
+            profiles.close()
+        
+        if batch:
+            flush()
+        self.report_progress(done, total, time.monotonic() - started, restored)
+        return done == total
+    
+    def report_progress(self, done: int, total: int, elapsed: float, restored: int = 0):
+        """Emit the percentage done, plus the throughput so far and the time it implies is left"""
+        self.progress_updated.emit(int(done / total * 100) if total else 100)
+        rate = (done - restored) / elapsed if elapsed > 0 else 0.0
+        remaining = (total - done) / rate if rate > 0 else 0.0
+        self.throughput_updated.emit(done, total, rate, remaining)
+
+
+class WatchThread(ProcessingThread):
+    """Thread that processes resumes as they appear or change in inbox directories.
+    
+    Files already there are processed first; afterwards the thread waits for
+    new files until stopped with requestInterruption(). Small arrivals are
+    processed in this thread instead of starting a worker pool for them.
+    """
+    batch_finished = pyqtSignal(int)  # files processed in the batch
+    
+    # Seconds between checks for a stop request while nothing arrives
+    STOP_CHECK_INTERVAL = 0.5
+    
+    def __init__(self, directories: List[str], criteria: Dict, workers: int = None,
+                 cache_path: str = None, **kwargs):
+        super().__init__([], criteria, workers, cache_path, **kwargs)
+        self.directories = directories
+        self.pool_workers = self.workers
+    
+    def run(self):
+        watcher = None
+        try:
+            watcher = FolderWatcher(self.directories)
+            file_paths = watcher.scan()
+            while not self.isInterruptionRequested():
+                if file_paths:
+                    self.workers = self.pool_workers if len(file_paths) > NER_BATCH_SIZE else 1
+                    self.process(file_paths)
+                    self.batch_finished.emit(len(file_paths))
+                file_paths = watcher.wait(self.STOP_CHECK_INTERVAL)
+        except Exception as e:
+            self.processing_failed.emit(str(e))
+        finally:
+            if watcher:
+                watcher.close()
+            self.close_sink()
+            self.processing_finished.emit()
+
+
+class ModelLoaderThread(QThread):
+    """Thread that imports spaCy and loads the NER model in the background"""
+    model_loaded = pyqtSignal()
+    model_failed = pyqtSignal(str)
+    
+    def run(self):
+        try:
+            load_ner_pipeline()
+        except Exception as e:
+            self.model_failed.emit(str(e))
+            return
+        self.model_loaded.emit()
+
+
+class ExportThread(QThread):
+    """Thread that writes CV files from the template without blocking the UI"""
+    progress_updated = pyqtSignal(int)
+    export_finished = pyqtSignal(int, list)  # files written, names of the candidates that failed
+    export_failed = pyqtSignal(str)
+    
+    def __init__(self, profiles: List, output_dir: str, format_type: str, min_score: float,
+                 workers: int = None):
+        super().__init__()
+        self.profiles = profiles
+        self.output_dir = output_dir
+        self.format_type = format_type
+        self.min_score = min_score
+        self.workers = workers
+    
+    def run(self):
+        export = export_pdf if self.format_type == 'pdf' else export_docx
+        try:
+            exported, failed = export(self.profiles, self.output_dir, min_score=self.min_score,
+                                      workers=self.workers, progress=self.report_progress,
+                                      should_stop=self.isInterruptionRequested)
+        except Exception as e:
+            self.export_failed.emit(str(e))
+            return
+        self.export_finished.emit(exported, failed)
+    
+    def report_progress(self, done: int, total: int):
+        self.progress_updated.emit(int(done / total * 100) if total else 100)
@@ -0,0 +1,95 @@
+import signal
+import threading
+import time
+
+from resume_config import REGEX_TIME_BUDGET
+
+
+class RegexBudgetExceeded(Exception):
+    """Raised when a pattern runs past its execution budget"""
+
+
+# Set while a guarded regex call is running in the main thread
+_armed = False
+# Per thread, how many patterns have run out of budget
+_overruns = threading.local()
+
+
+def _on_timeout(signum, frame):
+    if _armed:
+        raise RegexBudgetExceeded()
+
+
+def can_preempt() -> bool:
+    """Whether a runaway match can be interrupted in the current thread.
+
+    CPython's regex engine checks for signals while matching, so a SIGALRM
+    timer cuts it off; signals are only delivered to the main thread.
+    """
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+
+def overrun_count() -> int:
+    """Patterns that have run out of budget in the current thread so far"""
+    return getattr(_overruns, 'count', 0)
+
+
+class PatternBudget:
+    """Execution budget for scanning one text with one pattern.
+
+    Every regex call made through run() is charged against the budget. In
+    the main thread the call is interrupted once the budget runs out. The
+    guard cannot pre-empt anything in other threads, such as the GUI's
+    single-worker runs: there an overrun is only detected once
+    the call returns, however long it took, and the pattern is skipped
+    from then on. Worker processes extract in their main thread.
+
+    The SIGALRM handler and real-time timer are borrowed for the call only:
+    whatever handler and timer were set before are put back afterwards,
+    the timer less the time the call took, so an alarm that fell due
+    meanwhile goes off as soon as the call returns.
+    """
+
+    def __init__(self, label: str, seconds: float = REGEX_TIME_BUDGET):
+        self.label = label
+        self.seconds = seconds
+        self.remaining = seconds
+        self.exceeded = False
+
+    def run(self, function, *args):
+        """Call a regex function; raises RegexBudgetExceeded when the budget runs out"""
+        if not self.seconds:
+            return function(*args)
+        if self.exceeded:
+            raise RegexBudgetExceeded(self.label)
+
+        global _armed
+        # A handler installed outside Python could not be put back, so it is left alone
+        preempt = can_preempt() and signal.getsignal(signal.SIGALRM) is not None
+        if preempt:
+            previous_handler = signal.signal(signal.SIGALRM, _on_timeout)
+            _armed = True
+            previous_delay, previous_interval = signal.setitimer(signal.ITIMER_REAL, max(self.remaining, 1e-4))
+
+        interrupted = False
+        start = time.perf_counter()
+        try:
+            result = function(*args)
+        except RegexBudgetExceeded:
+            interrupted = True
+        finally:
+            elapsed = time.perf_counter() - start
+            if preempt:
+                _armed = False
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous_handler)
+                if previous_delay:
+                    signal.setitimer(signal.ITIMER_REAL, max(previous_delay - elapsed, 1e-6), previous_interval)
+
+        self.remaining -= elapsed
+        if interrupted or self.remaining < 0:
+            self.exceeded = True
+            _overruns.count = overrun_count() + 1
+            print(f"Pattern {self.label} exceeded its {self.seconds}s budget and was skipped")
+            raise RegexBudgetExceeded(self.label)
+        return result
@@ -0,0 +1,261 @@
+import csv
+import json
+import re
+import sys
+import zipfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Iterable, Optional, TextIO
+from xml.sax.saxutils import escape
+
+from Candidate_profile import CandidateProfile
+
+# (header, CandidateProfile field) per column of the CSV and XLSX sinks
+RESULT_COLUMNS = [
+    ("Name", 'name'),
+    ("Match Score", 'match_score'),
+    ("Age", 'age'),
+    ("Education", 'education'),
+    ("Current Role", 'current_role'),
+    ("Location", 'current_residence'),
+    ("Nationality", 'nationality'),
+    ("Email", 'email'),
+    ("Phone", 'phone'),
+    ("File", 'file_path'),
+    ("Duplicate Of", 'duplicate_of'),
+]
+
+
+def result_row(profile: CandidateProfile) -> list:
+    """A profile's RESULT_COLUMNS values; an unknown age (0) is left blank rather than written as 0"""
+    return [None if field == 'age' and not profile.age else getattr(profile, field)
+            for _, field in RESULT_COLUMNS]
+
+
+class ResultSink:
+    """Writes candidate profiles to a file as they arrive, one row each.
+
+    write() may be called any number of times; rows reach the file as they
+    are written, so a reader can pick them up while a batch still runs.
+    close() finishes the file. Sinks are context managers.
+    """
+
+    def write(self, profiles: Iterable[CandidateProfile]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class _TextSink(ResultSink):
+    """Shared file handling of the line-based sinks; stdout is used, never closed"""
+
+    def __init__(self, path: Optional[str], append: bool = False, encoding: str = 'utf-8'):
+        if path is None:
+            self.file: TextIO = sys.stdout
+            self.fresh = True
+        else:
+            self.file = open(path, 'a' if append else 'w', encoding=encoding, newline='')
+            self.fresh = self.file.tell() == 0
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class JsonlSink(_TextSink):
+    """Every profile field as one JSON object per line"""
+
+    def write(self, profiles: Iterable[CandidateProfile]):
+        for profile in profiles:
+            self.file.write(json.dumps(asdict(profile), ensure_ascii=False) + "\n")
+        self.file.flush()
+
+
+# Leading characters that make a spreadsheet read a CSV cell as a formula
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value):
+    """A value as written to CSV, with text that would run as a formula quoted by a leading apostrophe"""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class CsvSink(_TextSink):
+    """RESULT_COLUMNS as CSV with a header row, UTF-8 with a BOM so Excel reads Arabic correctly.
+
+    Text taken from a resume is untrusted, so a cell that a spreadsheet
+    would evaluate as a formula is written with a leading apostrophe.
+    """
+
+    def __init__(self, path: Optional[str], append: bool = False):
+        super().__init__(path, append, encoding='utf-8-sig')
+        self.writer = csv.writer(self.file)
+        # Appending to an existing file continues its rows under its header
+        if self.fresh:
+            self.writer.writerow([header for header, _ in RESULT_COLUMNS])
+            self.file.flush()
+
+    def write(self, profiles: Iterable[CandidateProfile]):
+        self.writer.writerows([_csv_cell(value) for value in result_row(profile)] for profile in profiles)
+        self.file.flush()
+
+
+# Characters XML 1.0 cannot hold, which text extracted from PDFs sometimes contains
+_XML_ILLEGAL = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+# Longest text Excel keeps in a cell
+_XLSX_CELL_LIMIT = 32767
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>')
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="xl/workbook.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>')
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Candidates" sheetId="1" r:id="rId1"/></sheets></workbook>')
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+    '<Relationship Id="rId2" Target="styles.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"/>'
+    '</Relationships>')
+# Style 1 is the bold header; style 2 shows scores with two decimals
+_XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="2" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '</styleSheet>')
+_XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '</sheetView></sheetViews><sheetData>')
+_XLSX_SHEET_END = '</sheetData></worksheet>'
+
+
+def _column_letter(index: int) -> str:
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+class XlsxSink(ResultSink):
+    """RESULT_COLUMNS as an Excel workbook, streamed row by row into the zip.
+
+    The fixed parts of the package are written first; the worksheet is then
+    one compressed zip entry that rows are appended to as they arrive, with
+    inline strings instead of a shared-string table, so memory use does not
+    grow with the number of rows. The file is only a valid workbook once
+    close() has finished the worksheet, and it cannot be appended to.
+    """
+
+    def __init__(self, path: str):
+        self.package = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED)
+        for name, content in (('[Content_Types].xml', _XLSX_CONTENT_TYPES), ('_rels/.rels', _XLSX_ROOT_RELS),
+                              ('xl/workbook.xml', _XLSX_WORKBOOK),
+                              ('xl/_rels/workbook.xml.rels', _XLSX_WORKBOOK_RELS),
+                              ('xl/styles.xml', _XLSX_STYLES)):
+            self.package.writestr(name, content)
+        # Past 4 GiB only with zip64, which has to be chosen before the size is known
+        self.sheet = self.package.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True)
+        self.columns = [_column_letter(index) for index in range(len(RESULT_COLUMNS))]
+        self.rows = 0
+        self.sheet.write(_XLSX_SHEET_START.encode('utf-8'))
+        self._write_row([header for header, _ in RESULT_COLUMNS], style=1)
+
+    def _cell(self, reference: str, value, style: int = 0) -> str:
+        if value is None:
+            return ''
+        style_attribute = f' s="{style}"' if style else ''
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return f'<c r="{reference}"{style_attribute}><v>{value}</v></c>'
+        text = _XML_ILLEGAL.sub('', str(value))[:_XLSX_CELL_LIMIT]
+        if not text:
+            return ''
+        return (f'<c r="{reference}" t="inlineStr"{style_attribute}>'
+                f'<is><t xml:space="preserve">{escape(text)}</t></is></c>')
+
+    def _write_row(self, values, style: int = 0):
+        self.rows += 1
+        cells = ''.join(self._cell(f"{column}{self.rows}", value,
+                                   2 if style == 0 and field == 'match_score' else style)
+                        for column, value, (_, field) in zip(self.columns, values, RESULT_COLUMNS))
+        self.sheet.write(f'<row r="{self.rows}">{cells}</row>'.encode('utf-8'))
+
+    def write(self, profiles: Iterable[CandidateProfile]):
+        for profile in profiles:
+            self._write_row(result_row(profile))
+
+    def close(self):
+        if self.package.fp is None:
+            return
+        self.sheet.write(_XLSX_SHEET_END.encode('utf-8'))
+        self.sheet.close()
+        self.package.close()
+
+
+# Sink class per format name
+SINK_FORMATS = {
+    'jsonl': JsonlSink,
+    'csv': CsvSink,
+    'xlsx': XlsxSink,
+}
+
+
+def sink_format(path: Optional[str], default: str = 'jsonl') -> str:
+    """Format a file's extension asks for: csv, xlsx, or jsonl for anything else"""
+    suffix = Path(path).suffix.lower().lstrip('.') if path else ''
+    return suffix if suffix in SINK_FORMATS else default
+
+
+def open_sink(path: Optional[str], fmt: str = None, append: bool = False) -> ResultSink:
+    """Open a sink for path (stdout when None), in fmt or the format its extension asks for.
+
+    With append, CSV and JSONL files keep their rows and get new ones
+    added; an XLSX workbook is always written afresh.
+    """
+    fmt = fmt or sink_format(path)
+    if fmt == 'xlsx':
+        if path is None:
+            raise ValueError("XLSX results need an output file")
+        return XlsxSink(path)
+    return SINK_FORMATS[fmt](path, append)
@@ -0,0 +1,135 @@
+from pathlib import Path
+from typing import Dict, List
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor
+
+from Candidate_profile import CandidateProfile
+from Candidate_Store import CandidateStore
+
+# (header, CandidateView attribute) per table column
+COLUMNS = [
+    ("Match Score", 'match_score'),
+    ("Name", 'name'),
+    ("Age", 'age'),
+    ("Education", 'education'),
+    ("Current Role", 'current_role'),
+    ("Location", 'current_residence'),
+    ("Nationality", 'nationality'),
+]
+
+# Background of the score cell, from the highest threshold down
+SCORE_COLORS = [
+    (0.8, QColor(144, 238, 144)),  # Light green
+    (0.6, QColor(255, 255, 144)),  # Light yellow
+    (0.4, QColor(255, 200, 144)),  # Light orange
+    (0.0, QColor(255, 144, 144)),  # Light red
+]
+
+
+# Text of duplicate resumes, listed under their first copy
+DUPLICATE_COLOR = QColor(128, 128, 128)
+
+
+def score_color(score: float) -> QColor:
+    for threshold, color in SCORE_COLORS:
+        if score >= threshold:
+            return color
+    return SCORE_COLORS[-1][1]
+
+
+class CandidateTableModel(QAbstractTableModel):
+    """Table model over a CandidateStore; cells are formatted only when the view asks for them"""
+
+    def __init__(self, store: CandidateStore, parent=None):
+        super().__init__(parent)
+        self.store = store
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section][0]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        candidate = self.store[index.row()]
+        field = COLUMNS[index.column()][1]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if field == 'match_score':
+                return f"{candidate.match_score:.2f}"
+            if field == 'age':
+                return str(candidate.age) if candidate.age else "N/A"
+            if field == 'name' and candidate.duplicate_of:
+                return f"↳ {candidate.name}"
+            return getattr(candidate, field)
+        if candidate.duplicate_of:
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return DUPLICATE_COLOR
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return f"Duplicate of {Path(candidate.duplicate_of).name}"
+        if field == 'match_score':
+            if role == Qt.ItemDataRole.UserRole:
+                return candidate.match_score
+            if role == Qt.ItemDataRole.BackgroundRole:
+                return score_color(candidate.match_score)
+        return None
+
+    def append_profiles(self, profiles: List[CandidateProfile], criteria: Dict = None):
+        """Add rows for new profiles at the end, without touching the existing rows.
+
+        Profiles of files that already have a row (a resume that changed on
+        disk) update that row where it is instead.
+        """
+        added = []
+        positions = None
+        for profile in profiles:
+            row = self.store.row_for_path(profile.file_path) if profile.file_path else None
+            if row is None:
+                added.append(profile)
+                continue
+            self.store.replace(row, profile, criteria)
+            if positions is None:
+                positions = self.store.positions()
+            position = int(positions[row])
+            self.dataChanged.emit(self.index(position, 0), self.index(position, len(COLUMNS) - 1))
+
+        if not added:
+            return
+        first = len(self.store)
+        # A file listed twice in one batch still gets a single row
+        added = list({profile.file_path or id(profile): profile for profile in added}.values())
+        self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+        for profile in added:
+            self.store.append(profile, criteria)
+        self.endInsertRows()
+
+    def rescore(self, criteria: Dict):
+        """Score every row for new criteria and refresh the score column"""
+        self.store.rescore(criteria)
+        if len(self.store):
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.store) - 1, 0))
+
+    def sort_by(self, field: str, descending: bool = False):
+        """Reorder the rows by permuting the store's display order"""
+        self.layoutAboutToBeChanged.emit()
+        # Keep selections and the current index on the same candidates
+        persistent = self.persistentIndexList()
+        rows = [self.store[index.row()].row for index in persistent]
+        self.store.sort_by(field, descending)
+        positions = self.store.positions()
+        self.changePersistentIndexList(persistent, [self.index(int(positions[row]), index.column())
+                                                    for row, index in zip(rows, persistent)])
+        self.layoutChanged.emit()
+
+    def clear(self):
+        self.beginResetModel()
+        self.store.clear()
+        self.endResetModel()
@@ -0,0 +1,372 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import Batch_Processor
+from Batch_Processor import default_worker_count
+from Candidate_profile import CandidateProfile
+from Duplicate_Index import DuplicateIndex, text_signature
+from Extraction_Cache import ExtractionCache
+from Resume_Processor import build_profile
+from Telemetry import TELEMETRY
+from resume_config import (NER_BATCH_SIZE, PIPELINE_QUEUE_SIZE, PIPELINE_READ_CONCURRENCY,
+                           PIPELINE_PARSE_CONCURRENCY, PIPELINE_ANALYSE_CONCURRENCY,
+                           PIPELINE_BATCH_WAIT_MS, DEDUPE_RESUMES)
+
+# Passed down a queue once per consumer when the stage feeding it has finished
+_DONE = object()
+
+
+async def _gather(*coroutines):
+    """asyncio.gather that cancels the other coroutines once one fails or is cancelled"""
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class _Document:
+    """One resume on its way through the pipeline"""
+    __slots__ = ('file_path', 'content_hash', 'text', 'found', 'fields', 'profile', 'duplicate_of',
+                 'exact_copy', 'copies')
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.content_hash = None
+        self.text = ''
+        # Fields extracted while reading the text, which analysis need not repeat
+        self.found = {}
+        self.fields = None
+        # File path of the first copy when this resume duplicates one; an exact
+        # copy skips analysis, a near one is analysed in full
+        self.duplicate_of = None
+        self.exact_copy = False
+        # Duplicates that reached scoring before this first copy did
+        self.copies = []
+        # Set as soon as a stage gives up on the resume; later stages pass it straight on
+        self.profile = None
+
+
+def _parse_in_worker(file_path: str, content_hash: Optional[str], dedupe: bool):
+    """Extract a resume's text inside a worker process.
+
+    Returns the text, the fields found while reading it, its duplicate
+    signature and the stage timings.
+    """
+    found = {}
+    text, _ = Batch_Processor._worker_processor.load_text(file_path, content_hash, found)
+    signature = None
+    if dedupe and text:
+        with TELEMETRY.timer('dedupe', file_path):
+            signature = text_signature(text)
+    return text, found, signature, TELEMETRY.take()
+
+
+def _analyse_in_worker(documents: List[Tuple[str, str]], field_names: List[Optional[List[str]]] = None,
+                       known: List[Dict] = None):
+    """Extract the fields of a batch of texts inside a worker process, returning them with the stage timings"""
+    return (Batch_Processor._worker_processor.extract_batch_fields(documents, field_names, known),
+            TELEMETRY.take())
+
+
+class ResumePipeline:
+    """Processes resumes as asyncio stages joined by bounded queues.
+
+    read -> parse -> analyse -> score -> sink. Reading runs in a thread
+    pool, so files on slow storage are fetched while others are parsed;
+    with a cache it only looks up content hashes, skipping unchanged files
+    by size and mtime. Parsing and analysis (rule-based fields plus one
+    nlp.pipe batch per group of up to ner_batch_size texts) run in worker
+    processes that load spaCy once. Scoring is cheap and stays on the event
+    loop. Each stage runs `concurrency` tasks, and a stage whose output
+    queue is full stops taking input, so at most a few queues' worth of
+    resumes is held in memory however far ahead reading gets.
+
+    With dedupe, parsing also works out each text's duplicate signature,
+    and the event loop looks it up in a DuplicateIndex of the batch. An
+    exact duplicate skips analysis, is scored with its first copy's fields
+    and comes out after the first copy; a near-duplicate is analysed like
+    any other resume and only names its first copy in duplicate_of.
+
+    A failure in any stage costs only its own resume, which comes out as an
+    empty CandidateProfile (as do its duplicates when analysis failed). A
+    broken worker pool (a worker that died, or could not load its models)
+    is not a resume's fault: it stops every stage and run() raises it.
+    Profiles come out in completion order.
+    """
+
+    def __init__(self, criteria: Dict = None, workers: int = None, cache_path: str = None,
+                 ner_batch_size: int = NER_BATCH_SIZE, queue_size: int = PIPELINE_QUEUE_SIZE,
+                 read_concurrency: int = PIPELINE_READ_CONCURRENCY,
+                 parse_concurrency: int = PIPELINE_PARSE_CONCURRENCY,
+                 analyse_concurrency: int = PIPELINE_ANALYSE_CONCURRENCY,
+                 batch_wait_ms: int = PIPELINE_BATCH_WAIT_MS, dedupe: bool = DEDUPE_RESUMES):
+        self.criteria = criteria
+        self.workers = workers or default_worker_count()
+        self.cache_path = cache_path
+        self.ner_batch_size = ner_batch_size
+        self.queue_size = queue_size
+        self.read_concurrency = read_concurrency
+        self.parse_concurrency = parse_concurrency or self.workers
+        self.analyse_concurrency = analyse_concurrency or self.workers
+        self.batch_wait = batch_wait_ms / 1000
+        self.duplicates = DuplicateIndex() if dedupe else None
+        # Per first copy: its _Document until it is scored, then its fields (None when analysis failed)
+        self.first_copies = {}
+        # One cache connection per read thread, closed when the thread exits
+        self._local = threading.local()
+
+    # Stage work
+
+    def _read(self, file_path: str) -> Optional[str]:
+        """Content hash of a file when caching, else pull the file into the OS page cache"""
+        if self.cache_path:
+            cache = getattr(self._local, 'cache', None)
+            if cache is None:
+                # SQLite connections stay in the thread that opened them
+                cache = self._local.cache = ExtractionCache(self.cache_path)
+            return cache.content_hash(file_path)
+        with open(file_path, 'rb') as f:
+            while f.read(1 << 20):
+                pass
+        return None
+
+    def _timed_read(self, file_path: str) -> Optional[str]:
+        with TELEMETRY.timer('read', file_path):
+            return self._read(file_path)
+
+    async def _read_stage(self, document: _Document) -> _Document:
+        document.content_hash = await self.loop.run_in_executor(self.io_pool, self._timed_read,
+                                                                document.file_path)
+        return document
+
+    async def _parse_stage(self, document: _Document) -> _Document:
+        document.text, document.found, signature, stages = await self.loop.run_in_executor(
+            self.cpu_pool, _parse_in_worker, document.file_path, document.content_hash,
+            self.duplicates is not None)
+        TELEMETRY.merge(stages)
+        if not document.text:
+            document.profile = CandidateProfile(file_path=document.file_path)
+        elif signature is not None:
+            match = self.duplicates.add(signature, document.file_path)
+            if match is None:
+                self.first_copies[document.file_path] = document
+            else:
+                document.duplicate_of, document.exact_copy = match
+        return document
+
+    async def _analyse_stage(self, batch: List[_Document]) -> List[_Document]:
+        documents = [(document.text, document.content_hash) for document in batch]
+        known = [document.found for document in batch]
+        try:
+            results, stages = await self.loop.run_in_executor(self.cpu_pool, _analyse_in_worker, documents,
+                                                              None, known)
+            TELEMETRY.merge(stages)
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            print(f"Batch analysis failed, retrying resumes one by one: {e}")
+            results = []
+            for document, found in zip(documents, known):
+                try:
+                    fields, stages = await self.loop.run_in_executor(self.cpu_pool, _analyse_in_worker, [document],
+                                                                     None, [found])
+                    TELEMETRY.merge(stages)
+                    results.extend(fields)
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    TELEMETRY.fail('resume')
+                    print(f"Error analysing resume: {e}")
+                    results.append(None)
+        for document, fields in zip(batch, results):
+            document.fields = fields
+            if fields is None:
+                document.profile = CandidateProfile(file_path=document.file_path)
+        return batch
+
+    def _score_stage(self, document: _Document) -> CandidateProfile:
+        profile = build_profile(document.file_path, document.text, document.fields, self.criteria)
+        profile.duplicate_of = document.duplicate_of
+        return profile
+
+    def _score_copy(self, document: _Document, fields: Optional[Dict]) -> CandidateProfile:
+        """Profile of an exact duplicate, from its first copy's fields"""
+        profile = CandidateProfile(file_path=document.file_path)
+        if fields is not None:
+            try:
+                profile = build_profile(document.file_path, document.text, fields, self.criteria)
+            except Exception as e:
+                print(f"Error scoring {document.file_path}: {e}")
+        profile.duplicate_of = document.duplicate_of
+        return profile
+
+    # Stage plumbing
+
+    async def _feed(self, file_paths: Iterable[str], outbox: asyncio.Queue, consumers: int):
+        for file_path in file_paths:
+            await outbox.put(_Document(file_path))
+        for _ in range(consumers):
+            await outbox.put(_DONE)
+
+    async def _run_stage(self, name: str, work, inbox: asyncio.Queue, outbox: asyncio.Queue,
+                         concurrency: int, consumers: int):
+        """Run work on each document from inbox with `concurrency` tasks, passing results to outbox"""
+        async def worker():
+            while True:
+                document = await inbox.get()
+                if document is _DONE:
+                    return
+                if document.profile is None:
+                    try:
+                        document = await work(document)
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        TELEMETRY.fail('resume')
+                        print(f"Error in {name} stage for {document.file_path}: {e}")
+                        document.profile = CandidateProfile(file_path=document.file_path)
+                await outbox.put(document)
+
+        await _gather(*(worker() for _ in range(concurrency)))
+        for _ in range(consumers):
+            await outbox.put(_DONE)
+
+    async def _next_batch(self, inbox: asyncio.Queue, outbox: asyncio.Queue) -> Tuple[List[_Document], bool]:
+        """Up to ner_batch_size documents needing analysis, waiting at most batch_wait to fill the batch.
+
+        Documents that are already finished go straight to outbox. Also
+        returns whether the input has ended.
+        """
+        batch = []
+        deadline = None
+        while len(batch) < self.ner_batch_size:
+            if deadline is None:
+                document = await inbox.get()
+            else:
+                try:
+                    document = await asyncio.wait_for(inbox.get(), deadline - self.loop.time())
+                except asyncio.TimeoutError:
+                    break
+            if document is _DONE:
+                return batch, True
+            if document.profile is not None or document.exact_copy:
+                await outbox.put(document)
+                continue
+            batch.append(document)
+            if deadline is None:
+                deadline = self.loop.time() + self.batch_wait
+        return batch, False
+
+    async def _run_batch_stage(self, inbox: asyncio.Queue, outbox: asyncio.Queue, concurrency: int,
+                               consumers: int):
+        """Like _run_stage, but analysing documents in NER batches"""
+        async def worker():
+            finished = False
+            while not finished:
+                batch, finished = await self._next_batch(inbox, outbox)
+                if batch:
+                    for document in await self._analyse_stage(batch):
+                        await outbox.put(document)
+
+        await _gather(*(worker() for _ in range(concurrency)))
+        for _ in range(consumers):
+            await outbox.put(_DONE)
+
+    async def _run_score_stage(self, inbox: asyncio.Queue, sink: asyncio.Queue):
+        while True:
+            document = await inbox.get()
+            if document is _DONE:
+                break
+            if document.exact_copy and document.profile is None:
+                first_copy = self.first_copies[document.duplicate_of]
+                if isinstance(first_copy, _Document):
+                    # Still being analysed; the duplicate comes out right after it
+                    first_copy.copies.append(document)
+                else:
+                    await sink.put(self._score_copy(document, first_copy))
+                continue
+            if document.profile is None:
+                try:
+                    document.profile = self._score_stage(document)
+                except Exception as e:
+                    print(f"Error scoring {document.file_path}: {e}")
+                    document.profile = CandidateProfile(file_path=document.file_path)
+            await sink.put(document.profile)
+            if self.first_copies.get(document.file_path) is document:
+                # Later duplicates need only the fields, not the whole document
+                self.first_copies[document.file_path] = document.fields
+                for copy in document.copies:
+                    await sink.put(self._score_copy(copy, document.fields))
+                document.copies = []
+        await sink.put(_DONE)
+
+    async def run(self, file_paths: Iterable[str]) -> AsyncIterator[CandidateProfile]:
+        """Process resumes, yielding each profile as it is scored"""
+        self.loop = asyncio.get_running_loop()
+        self.io_pool = ThreadPoolExecutor(max_workers=self.read_concurrency,
+                                          thread_name_prefix='resume-read')
+        # Spawned workers don't inherit the GUI's threads or Qt state
+        self.cpu_pool = ProcessPoolExecutor(max_workers=self.workers,
+                                            mp_context=multiprocessing.get_context("spawn"),
+                                            initializer=Batch_Processor._init_worker,
+                                            initargs=(self.cache_path, self.ner_batch_size))
+
+        to_read, to_parse, to_analyse, to_score, sink = (asyncio.Queue(self.queue_size) for _ in range(5))
+        stages = asyncio.ensure_future(_gather(
+            self._feed(file_paths, to_read, self.read_concurrency),
+            self._run_stage('read', self._read_stage, to_read, to_parse,
+                            self.read_concurrency, self.parse_concurrency),
+            self._run_stage('parse', self._parse_stage, to_parse, to_analyse,
+                            self.parse_concurrency, self.analyse_concurrency),
+            self._run_batch_stage(to_analyse, to_score, self.analyse_concurrency, 1),
+            self._run_score_stage(to_score, sink),
+        ))
+
+        try:
+            while True:
+                getter = asyncio.ensure_future(sink.get())
+                await asyncio.wait({getter, stages}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done() and stages.done() and stages.exception() is not None:
+                    getter.cancel()
+                    stages.result()  # Raise whatever stopped the pipeline
+                profile = await getter
+                if profile is _DONE:
+                    break
+                yield profile
+            await stages
+        finally:
+            stages.cancel()
+            try:
+                await stages
+            except BaseException:
+                pass
+            self.cpu_pool.shutdown(wait=True, cancel_futures=True)
+            self.io_pool.shutdown(wait=True)
+
+
+def iter_pipeline_resumes(file_paths: Iterable[str], criteria: Dict = None, workers: int = None,
+                          cache_path: str = None, ner_batch_size: int = NER_BATCH_SIZE,
+                          **options) -> Iterator[CandidateProfile]:
+    """Run a ResumePipeline from synchronous code, yielding profiles in completion order.
+
+    The event loop runs only while the caller waits for the next profile,
+    so a slow consumer holds the pipeline back instead of piling up results.
+    """
+    loop = asyncio.new_event_loop()
+    profiles = ResumePipeline(criteria, workers, cache_path, ner_batch_size, **options).run(file_paths)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(profiles.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(profiles.aclose())
+        loop.close()
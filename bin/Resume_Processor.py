@@ -1,81 +1,181 @@
 from datetime import date
 import re
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterator, List, Tuple
 from datetime import datetime
-import pdfplumber
-import docx
-import spacy
 from Candidate_profile import CandidateProfile
+from Candidate_Scorer import match_score
+from Duplicate_Index import DuplicateIndex, text_signature
+from Extraction_Cache import ExtractionCache
+from NER_Stage import NERStage, DocumentEntities, load_ner_pipeline
+from Pattern_Pack import PatternPack
+from Regex_Guard import overrun_count
+from Section_Segmenter import Sections, segment_sections
+from Telemetry import TELEMETRY
+from Text_Backends import backend_for
 from resume_config import *
 
+# Pattern families compiled once at import, each scanned in priority order
+NAME_PACK = PatternPack(NAME_PATTERNS, name='NAME_PATTERNS')
+BILINGUAL_PACK = PatternPack([BILINGUAL_PATTERNS], re.MULTILINE | re.DOTALL,
+                             name='BILINGUAL_PATTERNS')
+TABLE_PACK = PatternPack([pattern for pattern, _ in TABLE_PATTERNS], re.IGNORECASE | re.MULTILINE | re.DOTALL,
+                         name='TABLE_PATTERNS')
+EDUCATION_PACK = PatternPack(EDUCATION_PATTERNS, re.IGNORECASE | re.MULTILINE | re.DOTALL,
+                             name='EDUCATION_PATTERNS')
+ROLE_PACK = PatternPack(ROLE_PATTERNS, re.IGNORECASE | re.MULTILINE,
+                        name='ROLE_PATTERNS')
+LOCATION_LABEL_PACK = PatternPack(LOCATION_LABEL_PATTERNS, re.IGNORECASE | re.MULTILINE,
+                                  name='LOCATION_LABEL_PATTERNS')
+NATIONALITY_PACK = PatternPack(NATIONALITY_PATTERNS, re.IGNORECASE | re.MULTILINE,
+                               name='NATIONALITY_PATTERNS')
+
+# Extractor method for each cached profile field
+FIELD_EXTRACTORS = {
+    'name': 'extract_name',
+    'email': 'extract_email',
+    'phone': 'extract_phone',
+    'age': 'extract_age',
+    'current_residence': 'extract_current_address',
+    'nationality': 'extract_nationality',
+    'education': 'extract_education',
+    'current_role': 'extract_current_role',
+}
+
+# Fields whose extractors fall back to NER entities
+NER_FIELDS = ('name', 'current_residence', 'nationality')
+
 class ResumeProcessor:
  
-    def __init__(self):
+    def __init__(self, cache: ExtractionCache = None, ner_batch_size: int = NER_BATCH_SIZE,
+                 ner_processes: int = NER_PROCESSES, dedupe: bool = False):
+        self.cache = cache
+        self.ner_batch_size = ner_batch_size
+        self.ner_processes = ner_processes
+        # With dedupe, process_resumes spots duplicates across every batch it is given
+        self.duplicates = DuplicateIndex() if dedupe else None
+        self.first_copy_fields: Dict[str, Dict] = {}
         self.setup_ai_models()
         
     def setup_ai_models(self):
         """Initialize AI models for text processing"""
-        # Load spaCy model for NER
-        self.nlp = spacy.load("en_core_web_sm")
+        # Load spaCy model with only the components NER needs
+        self.nlp = load_ner_pipeline(SPACY_MODEL)
+        self.ner = NERStage(self.nlp, self.ner_batch_size, self.ner_processes)
+    
+    def field_scopes(self, text: str, sections: Sections, field: str) -> List[str]:
+        """Texts a field is searched in: its own sections first, then the whole resume"""
+        if sections is None or not sections.structured:
+            return [text]
+        scope = sections.text(text, *FIELD_SECTIONS[field])
+        if not scope.strip() or len(scope) >= len(text):
+            return [text]
+        return [scope, text]
     
-    def extract_text_from_file(self, file_path: str) -> str:
-        """Extract text from PDF, DOCX files"""
+    def extract_text_from_file(self, file_path: str, pdf_backend: str = None, found: Dict = None) -> str:
+        """Extract text from PDF, DOCX, ODT, RTF and TXT files; pdf_backend picks a PDF backend for this file.
+        
+        found, when given, receives the fields the early-stop check already
+        extracted from the returned text (see iter_document_pages).
+        """
+        return self.read_text(file_path, pdf_backend, found)[0]
+    
+    def read_text(self, file_path: str, pdf_backend: str = None, found: Dict = None) -> Tuple[str, bool]:
+        """Like extract_text_from_file, also telling whether reading failed part way (the text may be cut short)"""
         file_path = Path(file_path)
-        text = ""
+        parts = []
+        failed = False
         
-        try:
-            if file_path.suffix.lower() == '.pdf':
-                with pdfplumber.open(file_path) as pdf:
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-            
-            elif file_path.suffix.lower() == '.docx':
-                doc = docx.Document(file_path)
-                for paragraph in doc.paragraphs:
-                    text += paragraph.text + "\n"
+        with TELEMETRY.timer('text', str(file_path)):
+            try:
+                for page_text in self.iter_document_pages(file_path, backend=pdf_backend, found=found):
+                    parts.append(page_text)
+                
+            except Exception as e:
+                failed = True
+                TELEMETRY.fail('text')
+                print(f"Error extracting text from {file_path}: {e}")
             
-        except Exception as e:
-            print(f"Error extracting text from {file_path}: {e}")
+        return "\n".join(parts).strip(), failed
+    
+    def iter_document_pages(self, file_path: Path, max_pages: int = PDF_MAX_PAGES,
+                            stop_fields: List[str] = PDF_STOP_FIELDS, backend: str = None,
+                            found: Dict = None) -> Iterator[str]:
+        """Yield the text of a document's pages (or blocks, for formats without pages) in
+        order, up to max_pages PDF pages, stopping early once every stop field can be
+        found in the text read so far.
+        
+        Only paged formats stop early. The text is checked after pages 1, 2,
+        4, 8, ..., so a long PDF costs about two extraction passes rather
+        than one per page, and the last page allowed by max_pages is not
+        checked. When the last check saw all the text there is, the values it
+        extracted are put in found, so they need not be extracted again.
+        """
+        reader = backend_for(file_path, backend)
+        if reader is None:
+            return
+        pages = []
+        page_count = 0
+        missing = list(stop_fields) if reader.page_limited else []
+        checked = {}
+        next_check = 1
+        
+        for page_text in reader.iter_pages(file_path, max_pages if reader.page_limited else None):
+            page_count += 1
+            if not page_text:
+                continue
+            pages.append(page_text)
+            yield page_text
             
-        return text.strip()
+            checked = {}
+            if missing and page_count >= next_check and not (max_pages and page_count >= max_pages):
+                next_check = page_count * 2
+                checked = self.fields_without_ner("\n".join(pages).strip(), missing)
+                missing = [field for field in missing if not checked.get(field)]
+                if not missing:
+                    break
+        
+        if found is not None:
+            found.update(checked)
+    
+    def fields_without_ner(self, text: str, field_names: List[str]) -> Dict:
+        """Values of the fields that rule-based extraction settles in text, without NER.
+        
+        Nothing is returned when a pattern ran out of its time budget.
+        """
+        overruns = overrun_count()
+        fields = self.extract_fields(text, None, DocumentEntities(deferred=True), field_names,
+                                     segment_sections(text))
+        return fields if overrun_count() == overruns else {}
     # NAME EXTRACTION AND VALIDATION
-    def extract_name(self, text: str) -> str:
+    def extract_name(self, text: str, entities: DocumentEntities = None, sections: Sections = None) -> str:
         """Extract name from resume text using multiple methods"""
         
-        # Method 1: Use regex patterns
-        for pattern in NAME_PATTERNS:
-            matches = pattern.findall(text)
-            if matches:
-                potential_name = matches[0].strip()
+        for scope in self.field_scopes(text, sections, 'name'):
+            # Method 1: Use regex patterns
+            for _, _, match in NAME_PACK.iter_matches(scope, first_only=True):
+                potential_name = match.strip()
                 potential_name = re.sub(r'^\d+\s+de\s+\d+\s*', '', potential_name)
                 potential_name = potential_name.strip()
                 
                 if potential_name and self.validate_name(potential_name):
                     return potential_name
+            
+            # Method 2: Try table-specific extraction first (bilingual CVs)
+            for _, _, match in BILINGUAL_PACK.iter_matches(scope, first_only=True):
+                potential_name = match.strip()
+                potential_name = re.sub(r'\s+[A-Z]$', '', potential_name)  # Remove single trailing capital
+                if self.validate_name(potential_name):
+                    return potential_name
+            
+            # Method 3: Try table patterns
+            for _, _, match in TABLE_PACK.iter_matches(scope):
+                potential_name = match.strip()
+                if self.validate_name(potential_name):
+                    return potential_name
         
         name = ""
         lines = text.strip().split('\n')
-        
-        # Method 2: Try table-specific extraction first (bilingual CVs)
-        match = re.search(BILINGUAL_PATTERNS, text, re.MULTILINE | re.DOTALL)
-        if match:
-            potential_name = match.group(1).strip()
-            potential_name = re.sub(r'\s+[A-Z]$', '', potential_name)  # Remove single trailing capital
-            if self.validate_name(potential_name):
-                return potential_name
-        
-        # Method 3: Try table patterns
-        for pattern_tuple in TABLE_PATTERNS:
-            pattern = pattern_tuple[0]  # Get pattern string from tuple
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE | re.DOTALL)
-            if matches:
-                for match in matches:
-                    potential_name = match.strip()
-                    if self.validate_name(potential_name):
-                        return potential_name
 
         # Method 4: Check the very first line
         if lines:
@@ -102,14 +202,16 @@ class ResumeProcessor:
                                 return first_line
         
 
-        # Method 5: spaCy extraction
+        # Method 5: spaCy extraction over the header window
         if self.nlp:
-            clean_text = re.sub(r'^\d+\s+de\s+\d+\s*', '', text)
-            doc = self.nlp(clean_text[:800])
+            if entities is not None:
+                person_entities = entities.get('name')
+            else:
+                person_entities = self.ner.entities(text, 'name', sections)
             
-            for ent in doc.ents:
-                if ent.label_ == "PERSON" and ent.start_char < 300:
-                    potential_name = ent.text.strip()
+            for label, entity_text, start_char in person_entities:
+                if label == "PERSON" and start_char < NAME_ENTITY_MAX_START:
+                    potential_name = entity_text.strip()
                     if self.validate_name(potential_name):
                         return potential_name
 
@@ -167,41 +269,46 @@ class ResumeProcessor:
                 len(clean_word) <= 25 and
                 word.lower() not in ['page', 'date', 'phone', 'email'])
     # EDUCATION EXTRACTION AND VALIDATION
-    def extract_education(self, text: str) -> str:
+    def extract_education(self, text: str, sections: Sections = None) -> str:
         """Extract education information from resume text"""
-        text_lower = text.lower()
+        for scope in self.field_scopes(text, sections, 'education'):
+            education = self.match_education(scope.lower())
+            if education:
+                return education
 
-        for pattern in EDUCATION_PATTERNS:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE | re.MULTILINE | re.DOTALL)
-            for match in matches:
-                # If match is a tuple, get the first non-empty group
-                if isinstance(match, tuple):
-                    education = ', '.join(m.strip() for m in match if m and len(m.strip()) > 2)
-                else:
-                    education = match
-                
-                education = education.strip()
-                
-                # Handle special case for professional titles with institutions
-                if '(' in education and ('university' in education.lower() or 'college' in education.lower() or 'institute' in education.lower()):
-                    parts = education.split(',')
-                    if len(parts) >= 2:
-                        title = parts[0].strip()
-                        institution_part = parts[-1].strip()
-                        if '(' in institution_part:
-                            institution = institution_part.split('(')[0].strip()
-                            education = f"{title}, {institution}"
-                
-                # If the pattern starts with 'degree', prepend 'Degree' to the result
-                elif pattern.startswith(r'degree\s+([A-Za-z]'):
-                    education = f"Degree {education}"
-                
-                # Clean up the match
-                education = re.sub(r'\s+', ' ', education)
-                education = education.strip('.,;:-')
-                
-                if self.validate_education(education):
-                    return education.title()
+        return ""
+
+    def match_education(self, text_lower: str) -> str:
+        """First valid education entry the education patterns find in lowercased text"""
+        for _, pattern, match in EDUCATION_PACK.iter_matches(text_lower):
+            # If match is a tuple, get the first non-empty group
+            if isinstance(match, tuple):
+                education = ', '.join(m.strip() for m in match if m and len(m.strip()) > 2)
+            else:
+                education = match
+            
+            education = education.strip()
+            
+            # Handle special case for professional titles with institutions
+            if '(' in education and ('university' in education.lower() or 'college' in education.lower() or 'institute' in education.lower()):
+                parts = education.split(',')
+                if len(parts) >= 2:
+                    title = parts[0].strip()
+                    institution_part = parts[-1].strip()
+                    if '(' in institution_part:
+                        institution = institution_part.split('(')[0].strip()
+                        education = f"{title}, {institution}"
+            
+            # If the pattern starts with 'degree', prepend 'Degree' to the result
+            elif pattern.startswith(r'degree\s+([A-Za-z]'):
+                education = f"Degree {education}"
+            
+            # Clean up the match
+            education = re.sub(r'\s+', ' ', education)
+            education = education.strip('.,;:-')
+            
+            if self.validate_education(education):
+                return education.title()
 
         return ""
 
@@ -265,12 +372,10 @@ class ResumeProcessor:
         
         return has_education_keyword
     # CURRENT ROLE EXTRACTION AND VALIDATION
-    def extract_current_role(self, text: str) -> str:
+    def extract_current_role(self, text: str, sections: Sections = None) -> str:
         """Extract current job role using pattern matching"""
-        for pattern in ROLE_PATTERNS:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if matches:
-                first_match = matches[0]
+        for scope in self.field_scopes(text, sections, 'current_role'):
+            for _, _, first_match in ROLE_PACK.iter_matches(scope, first_only=True):
                 if isinstance(first_match, tuple):
                     role = " ".join([m for m in first_match if m]).strip()
                 else:
@@ -312,7 +417,8 @@ class ResumeProcessor:
         
         return True
     # LOCATION EXTRACTION AND VALIDATION
-    def extract_current_address(self, text: str) -> str:
+    def extract_current_address(self, text: str, entities: DocumentEntities = None,
+                                sections: Sections = None) -> str:
         """Extract current address/location from resume text"""
         if not text or len(text.strip()) < 10:
             return ""
@@ -320,13 +426,12 @@ class ResumeProcessor:
         lines = text.strip().split('\n')
         
         # Method 1: Try labeled patterns first
-        for pattern in LOCATION_LABEL_PATTERNS:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if matches:
-                for match in matches:
-                    location = match.strip().rstrip('.,;:-|')
-                    if self.validate_location(location):
-                        return location
+        for scope in self.field_scopes(text, sections, 'current_residence'):
+            for _, _, match in LOCATION_LABEL_PACK.iter_matches(scope):
+                # A value ends with its line; patterns matching \s run on into the next label
+                location = match.strip().partition('\n')[0].strip().rstrip('.,;:-|')
+                if self.validate_location(location):
+                    return location
         
         # Method 2: Check the first few lines for header format
         for line in lines[:8]:  # Check first 8 lines
@@ -346,10 +451,14 @@ class ResumeProcessor:
                 if self.validate_location(line):
                     return line
         
-        # Method 3: Use NLP for geographic entities
+        # Method 3: Use NLP for geographic entities in the header and location lines
         if self.nlp:
-            doc = self.nlp(text)
-            locations = [ent.text for ent in doc.ents if ent.label_ in ["GPE", "LOC"]]
+            if entities is not None:
+                location_entities = entities.get('location')
+            else:
+                location_entities = self.ner.entities(text, 'location', sections)
+            locations = [entity_text for label, entity_text, _ in location_entities
+                         if label in LOCATION_ENTITY_LABELS]
             if locations:
                 filtered_locations = [loc for loc in locations if len(loc.split()) <= 3]
                 if filtered_locations and self.validate_location(filtered_locations[0]):
@@ -402,7 +511,8 @@ class ResumeProcessor:
         return all(word.strip('.,;:-').replace('-', '').replace("'", "").isalpha() 
                   for word in words)
     # NATIONALITY EXTRACTION AND VALIDATION
-    def extract_nationality(self, text: str) -> str:
+    def extract_nationality(self, text: str, entities: DocumentEntities = None,
+                            sections: Sections = None) -> str:
         """Extract nationality from resume text"""
         # Common character replacements for corrupted text
         replacements = {
@@ -411,21 +521,19 @@ class ResumeProcessor:
             'ö': 'o', 'ó': 'o', 'ò': 'o', 'ø': 'o',
         }
         
-        # Apply replacements to the text    
+        # Apply replacements to the text (one character for one, so section spans still line up)
         for corrupted, correct in replacements.items():
             text = text.replace(corrupted, correct)
         
         # Try nationality patterns first
-        for pattern in NATIONALITY_PATTERNS:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if matches:
-                for match in matches:
-                    nationality = match.strip()
-                    if self.validate_nationality(nationality):
-                        return nationality
+        for scope in self.field_scopes(text, sections, 'nationality'):
+            for _, _, match in NATIONALITY_PACK.iter_matches(scope):
+                nationality = match.strip().partition('\n')[0].strip()
+                if self.validate_nationality(nationality):
+                    return nationality
         
         # If no nationality found, use current residence as fallback
-        current_residence = self.extract_current_address(text)
+        current_residence = self.extract_current_address(text, entities, sections)
         if current_residence:
             # Extract country name from residence if it contains one
             for country in COUNTRIES:
@@ -455,9 +563,9 @@ class ResumeProcessor:
     def extract_age(self, text: str) -> int:
         """Extract age from resume text"""
         # Method 1: Extract age from explicit age mentions
-        age_matches = AGE_PATTERN.findall(text)
-        if age_matches:
-            age = int(age_matches[0])
+        age_match = AGE_PATTERN.search(text)
+        if age_match:
+            age = int(age_match.group(1))
             if self.validate_age(age):
                 return age
         
@@ -541,9 +649,9 @@ class ResumeProcessor:
     # EMAIL EXTRACTION AND VALIDATION
     def extract_email(self, text: str) -> str:
         """Extract email from resume text"""
-        email_matches = EMAIL_PATTERN.findall(text)
-        if email_matches:
-            email = email_matches[0]
+        email_match = EMAIL_PATTERN.search(text)
+        if email_match:
+            email = email_match.group(0)
             if self.validate_email(email):
                 return email
         return ""
@@ -559,9 +667,9 @@ class ResumeProcessor:
     # PHONE EXTRACTION AND VALIDATION
     def extract_phone(self, text: str) -> str:
         """Extract phone number from resume text"""
-        phone_matches = PHONE_PATTERN.findall(text)
-        if phone_matches:
-            phone = phone_matches[0]
+        phone_match = PHONE_PATTERN.search(text)
+        if phone_match:
+            phone = phone_match.group(0)
             if self.validate_phone(phone):
                 return phone
         return ""
@@ -596,63 +704,214 @@ class ResumeProcessor:
    
     def calculate_match_score(self, profile: CandidateProfile, criteria: Dict) -> float:
         """Calculate match score based on filtering criteria"""
-        score = 0.0
-        total_criteria = 0
-        
-        # Age matching
-        if criteria.get('min_age', 0) > 0 or criteria.get('max_age', 100) < 100:
-            total_criteria += 1
-            min_age = criteria.get('min_age', 0)
-            max_age = criteria.get('max_age', 100)
-            if min_age <= profile.age <= max_age:
-                score += 1.0
-        
-        # Location matching
-        if criteria.get('location', ''):
-            total_criteria += 1
-            if criteria['location'].lower() in profile.current_residence.lower():
-                score += 1.0
-        
-        # Role matching
-        if criteria.get('role', ''):
-            total_criteria += 1
-            if criteria['role'].lower() in profile.current_role.lower():
-                score += 1.0
-         
-        # Education matching
-        if criteria.get('education', ''):
-            total_criteria += 1
-            if criteria['education'].lower() in profile.education.lower():
-                score += 1.0
-                
-        return score / total_criteria if total_criteria > 0 else 0.0 
+        return match_score(profile, criteria)
+        
+    def extract_fields(self, text: str, content_hash: str = None, entities: DocumentEntities = None,
+                       field_names: List[str] = None, sections: Sections = None, known: Dict = None) -> Dict:
+        """Run the field extractors, reusing cached values whose patterns are unchanged.
+        
+        Values in known, already extracted from this text, are taken as
+        they are and cached like freshly extracted ones.
+        Fields listed in FIELD_SECTIONS search their own resume sections
+        before the whole text. With deferred entities, fields that needed
+        NER are left out of the result and listed in entities.deferred_fields.
+        A field whose patterns ran out of their time budget is not cached,
+        since its value may be incomplete; nothing is cached when an
+        extractor raises.
+        """
+        fields = {}
+        extracted = {}
+        deferred_fields = []
+        
+        for field in field_names or FIELD_EXTRACTORS:
+            if known and field in known:
+                extracted[field] = known[field]
+                fields[field] = known[field]
+                continue
+            if self.cache and content_hash:
+                cached = self.cache.get_field(content_hash, field)
+                if cached is not None:
+                    fields[field] = cached
+                    continue
+            
+            extractor = getattr(self, FIELD_EXTRACTORS[field])
+            options = {}
+            if field in FIELD_SECTIONS:
+                if sections is None:
+                    sections = segment_sections(text)
+                options['sections'] = sections
+            overruns = overrun_count()
+            with TELEMETRY.timer(FIELD_EXTRACTORS[field]):
+                if field not in NER_FIELDS:
+                    value = extractor(text, **options)
+                elif entities is not None and entities.deferred:
+                    requests_before = entities.request_count
+                    value = extractor(text, entities, **options)
+                    if entities.request_count > requests_before:
+                        deferred_fields.append(field)
+                        continue
+                else:
+                    value = extractor(text, entities, **options)
+            
+            if overrun_count() == overruns:
+                extracted[field] = value
+            fields[field] = value
+        
+        if self.cache and content_hash and extracted:
+            self.cache.put_fields(content_hash, extracted)
         
+        if entities is not None:
+            entities.deferred_fields = deferred_fields
+        
+        return fields
+    
+    def load_text(self, file_path: str, content_hash: str = None, found: Dict = None):
+        """Extract text from a file, going through the cache when one is configured.
+        
+        A content_hash computed by the caller spares hashing the file again.
+        found receives any fields extracted along with the text, as in
+        extract_text_from_file. Text from a read that failed is not cached,
+        so the file is read again next time.
+        """
+        if not self.cache:
+            return self.extract_text_from_file(file_path, found=found), None
+        
+        content_hash = content_hash or self.cache.content_hash(file_path)
+        text = self.cache.get_text(content_hash)
+        if text is None:
+            text, failed = self.read_text(file_path, found=found)
+            if not failed:
+                self.cache.put_text(content_hash, text)
+        
+        return text, content_hash
+    
     def process_resume(self, file_path: str, criteria: Dict = None) -> CandidateProfile:
         """Process a single resume and extract all information"""
-        text = self.extract_text_from_file(file_path)
+        found = {}
+        text, content_hash = self.load_text(file_path, found=found)
         
         if not text:
             return CandidateProfile(file_path=file_path)
         
-        # Extract personal information
-        personal_info = self.extract_personal_info(text)
-        
-        # Create candidate profile
-        profile = CandidateProfile(
-            name=personal_info.get('name', ''),
-            age=personal_info.get('age', 0),
-            current_residence=personal_info.get('current_residence', ''),
-            nationality=personal_info.get('nationality', ''),
-            education=self.extract_education(text),
-            current_role=self.extract_current_role(text),
-            email=personal_info.get('email', ''),
-            phone=personal_info.get('phone', ''),
-            raw_text=text[:500] + "..." if len(text) > 500 else text,
-            file_path=file_path
-        )
-        
-        # Calculate match score if criteria provided
-        if criteria:
-            profile.match_score = self.calculate_match_score(profile, criteria)
-        
-        return profile
\ No newline at end of file
+        # Extract all fields, skipping the ones cached for this content or found while reading it
+        fields = self.extract_fields(text, content_hash, known=found)
+        
+        return self.build_profile(file_path, text, fields, criteria)
+    
+    def process_resumes(self, file_paths: List[str], criteria: Dict = None) -> List[CandidateProfile]:
+        """Process several resumes, running the NER they need as one nlp.pipe batch.
+        
+        With dedupe, a resume duplicating one processed earlier reuses that
+        first copy's fields, and its profile names the first copy in
+        duplicate_of. A near-duplicate is only reported in duplicate_of: its
+        fields all come from its own text.
+        """
+        profiles = [None] * len(file_paths)
+        documents = []
+        found_fields = []
+        indexes = []
+        copies = []
+        near_copies = {}
+        
+        for index, file_path in enumerate(file_paths):
+            found = {}
+            text, content_hash = self.load_text(file_path, found=found)
+            if not text:
+                profiles[index] = CandidateProfile(file_path=file_path)
+                continue
+            if self.duplicates is not None:
+                with TELEMETRY.timer('dedupe', file_path):
+                    signature = text_signature(text)
+                    match = self.duplicates.add(signature, file_path) if signature else None
+                if match is not None:
+                    first_copy, exact = match
+                    if exact:
+                        copies.append((index, text, content_hash, first_copy))
+                        continue
+                    near_copies[index] = first_copy
+            documents.append((text, content_hash))
+            found_fields.append(found)
+            indexes.append(index)
+        
+        results = self.extract_batch_fields(documents, known=found_fields)
+        for index, (text, _), fields in zip(indexes, documents, results):
+            profiles[index] = self.build_profile(file_paths[index], text, fields, criteria)
+            if index in near_copies:
+                profiles[index].duplicate_of = near_copies[index]
+            elif self.duplicates is not None:
+                self.first_copy_fields[file_paths[index]] = fields
+        
+        for index, text, content_hash, first_copy in copies:
+            shared = self.first_copy_fields.get(first_copy)
+            if shared is None:
+                # A first copy whose batch failed has no fields to share
+                fields = self.extract_fields(text, content_hash)
+            else:
+                fields = shared
+            profiles[index] = self.build_profile(file_paths[index], text, fields, criteria)
+            profiles[index].duplicate_of = first_copy
+        
+        return profiles
+    
+    def extract_batch_fields(self, documents: List[Tuple[str, str]], field_names: List[List[str]] = None,
+                             known: List[Dict] = None) -> List[Dict]:
+        """Fields of several (text, content_hash) documents, running the NER they need as one nlp.pipe batch.
+        
+        field_names, when given, lists each document's fields to extract
+        (None for all of them); known holds each document's fields already
+        extracted while reading it.
+        """
+        results = []
+        pending = []
+        
+        # First pass: rule-based extraction, noting which resumes still need NER
+        for index, (text, content_hash) in enumerate(documents):
+            entities = DocumentEntities(deferred=True)
+            sections = segment_sections(text)
+            names = field_names[index] if field_names else None
+            results.append(self.extract_fields(text, content_hash, entities, names, sections,
+                                               known[index] if known else None))
+            if entities.deferred_fields:
+                pending.append((index, text, content_hash, entities, sections))
+        
+        # Second pass: batched NER, then finish the fields that were waiting for it
+        if pending:
+            annotated = self.ner.annotate([item[1] for item in pending],
+                                          [sorted(item[3].requested) for item in pending],
+                                          [item[4] for item in pending])
+            for (index, text, content_hash, deferred, sections), entities in zip(pending, annotated):
+                results[index].update(self.extract_fields(text, content_hash, entities,
+                                                          deferred.deferred_fields, sections))
+        
+        return results
+    
+    def build_profile(self, file_path: str, text: str, fields: Dict, criteria: Dict = None) -> CandidateProfile:
+        """Create a candidate profile from extracted fields"""
+        return build_profile(file_path, text, fields, criteria)
+
+
+def build_profile(file_path: str, text: str, fields: Dict, criteria: Dict = None) -> CandidateProfile:
+    """Create a candidate profile from extracted fields, without needing a loaded processor"""
+    with TELEMETRY.timer('score'):
+        return _build_profile(file_path, text, fields, criteria)
+
+
+def _build_profile(file_path: str, text: str, fields: Dict, criteria: Dict) -> CandidateProfile:
+    profile = CandidateProfile(
+        name=fields['name'],
+        age=fields['age'],
+        current_residence=fields['current_residence'],
+        nationality=fields['nationality'],
+        education=fields['education'],
+        current_role=fields['current_role'],
+        email=fields['email'],
+        phone=fields['phone'],
+        raw_text=text[:500] + "..." if len(text) > 500 else text,
+        file_path=file_path
+    )
+    
+    # Calculate match score if criteria provided
+    if criteria:
+        profile.match_score = match_score(profile, criteria)
+    
+    return profile
\ No newline at end of file
@@ -0,0 +1,67 @@
+import re
+from typing import Dict, List, Sequence, Tuple
+
+from resume_config import SECTION_HEADERS
+
+# Spaces and Arabic tatweel allowed between the letters of a header
+_LETTER_GAP = r'[ \tـ]*'
+
+
+def _phrase_pattern(phrase: str) -> str:
+    """Regex for a header phrase, also matching letter-spaced and stretched forms"""
+    letters = [re.escape(char) for char in phrase if not char.isspace()]
+    return _LETTER_GAP.join(letters)
+
+
+def build_header_pattern(headers: Dict[str, Sequence[str]]) -> re.Pattern:
+    """One regex matching any section header line, with a named group per section"""
+    groups = []
+    for section, phrases in headers.items():
+        # Longest first so "work experience" wins over "work"
+        alternatives = '|'.join(_phrase_pattern(phrase) for phrase in sorted(phrases, key=len, reverse=True))
+        groups.append(f'(?P<{section}>{alternatives})')
+    return re.compile(
+        r'^[ \t]*(?:[•\-\*#>|]+[ \t]*)?(?:' + '|'.join(groups) + r')[ \t]*(?::[^\n]*)?$',
+        re.IGNORECASE | re.MULTILINE)
+
+
+SECTION_HEADER_PATTERN = build_header_pattern(SECTION_HEADERS)
+
+
+class Sections:
+    """Where each section of one resume starts and ends.
+
+    The header line belongs to the section it opens, so patterns keyed on
+    headers still match inside a section's text.
+    """
+
+    def __init__(self, spans: List[Tuple[str, int, int]]):
+        self.spans = spans
+        self.structured = any(section != 'header' for section, _, _ in spans)
+
+    def ranges(self, names: Sequence[str]) -> List[Tuple[int, int]]:
+        """Character ranges of the named sections in document order, adjacent ones merged"""
+        merged = []
+        for section, start, end in self.spans:
+            if section not in names or end == start:
+                continue
+            if merged and merged[-1][1] == start:
+                merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        return merged
+
+    def text(self, source: str, *names: str) -> str:
+        """Text of the named sections, cut from source (the text that was segmented)"""
+        return '\n'.join(source[start:end] for start, end in self.ranges(names))
+
+
+def segment_sections(text: str) -> Sections:
+    """Split a resume into header, contact, education, experience and other sections in one pass"""
+    spans = []
+    section, start = 'header', 0
+    for match in SECTION_HEADER_PATTERN.finditer(text):
+        spans.append((section, start, match.start()))
+        section, start = match.lastgroup, match.start()
+    spans.append((section, start, len(text)))
+    return Sections(spans)
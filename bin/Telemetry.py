@@ -0,0 +1,283 @@
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from resume_config import TELEMETRY_ENABLED, TELEMETRY_BUCKETS, TELEMETRY_RATE_WINDOW, TELEMETRY_SLOW_FILES
+
+# Histogram quantiles reported per stage
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class StageStats:
+    """Fixed-bucket latency histogram of one stage, with its failures and slowest files"""
+    __slots__ = ('buckets', 'count', 'total', 'failures', 'slowest')
+
+    def __init__(self):
+        # One count per TELEMETRY_BUCKETS bound, plus one for slower observations
+        self.buckets = [0] * (len(TELEMETRY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.failures = 0
+        self.slowest: List[Tuple[float, str]] = []
+
+    def observe(self, seconds: float, file_path: str = None):
+        self.buckets[bisect.bisect_left(TELEMETRY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if file_path and (len(self.slowest) < TELEMETRY_SLOW_FILES or seconds > self.slowest[-1][0]):
+            self.slowest.append((seconds, file_path))
+            self.slowest.sort(reverse=True)
+            del self.slowest[TELEMETRY_SLOW_FILES:]
+
+    def merge(self, other: 'StageStats'):
+        self.buckets = [mine + theirs for mine, theirs in zip(self.buckets, other.buckets)]
+        self.count += other.count
+        self.total += other.total
+        self.failures += other.failures
+        self.slowest = sorted(self.slowest + other.slowest, reverse=True)[:TELEMETRY_SLOW_FILES]
+
+    def quantile(self, q: float) -> float:
+        """Estimated q-quantile in seconds, interpolated within its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            if seen + count >= rank and count:
+                lower = TELEMETRY_BUCKETS[index - 1] if index else 0.0
+                if index == len(TELEMETRY_BUCKETS):
+                    return lower  # Past the last bound: all we know is the lower edge
+                return lower + (TELEMETRY_BUCKETS[index] - lower) * (rank - seen) / count
+            seen += count
+        return TELEMETRY_BUCKETS[-1]
+
+
+class _Timer:
+    __slots__ = ('telemetry', 'stage', 'file_path', 'started')
+
+    def __init__(self, telemetry: 'Telemetry', stage: str, file_path: str):
+        self.telemetry = telemetry
+        self.stage = stage
+        self.file_path = file_path
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.telemetry.observe(self.stage, time.perf_counter() - self.started, self.file_path,
+                               failed=exc_type is not None)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Telemetry:
+    """Per-stage timings, failure counts and resume throughput for this process.
+
+    Stages are timed with `with TELEMETRY.timer(stage):`. Worker processes
+    record into their own registry and send take() snapshots back with
+    their results, which the parent merge()s, so the parent's registry
+    covers the whole batch. Recording is a bisect and a few additions under
+    a lock, cheap enough to leave on.
+    """
+
+    def __init__(self, enabled: bool = TELEMETRY_ENABLED):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.stages: Dict[str, StageStats] = {}
+        self.resumes = 0
+        self.started = None
+        self.last_finished = None
+        # (time, resumes so far) at each finish in the last TELEMETRY_RATE_WINDOW seconds,
+        # and the resumes finished before those, for the live rate
+        self.marks = deque()
+        self.window_base = 0
+
+    def timer(self, stage: str, file_path: str = None):
+        """Context manager timing one run of a stage; an exception counts as a failure"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, stage, file_path)
+
+    def observe(self, stage: str, seconds: float, file_path: str = None, failed: bool = False):
+        if not self.enabled:
+            return
+        with self.lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.observe(seconds, file_path)
+            if failed:
+                stats.failures += 1
+
+    def fail(self, stage: str):
+        """Count a failure that was handled without raising"""
+        if not self.enabled:
+            return
+        with self.lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.failures += 1
+
+    def mark_start(self):
+        """Start the docs/sec clock, unless a batch since the last reset already did"""
+        with self.lock:
+            if self.started is None:
+                self.started = time.monotonic()
+
+    def count_resumes(self, count: int = 1):
+        """Note finished resumes, for the docs/sec figures"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self.lock:
+            if self.started is None:
+                self.started = now
+            self.resumes += count
+            self.last_finished = now
+            self.marks.append((now, self.resumes))
+            self._drop_old_marks(now)
+
+    def _drop_old_marks(self, now: float):
+        while self.marks and now - self.marks[0][0] > TELEMETRY_RATE_WINDOW:
+            self.window_base = self.marks.popleft()[1]
+
+    def take(self) -> Dict[str, StageStats]:
+        """Hand over the stage stats recorded so far and start afresh; used to ship them out of workers"""
+        with self.lock:
+            stages, self.stages = self.stages, {}
+        return stages
+
+    def merge(self, stages: Optional[Dict[str, StageStats]]):
+        """Add stage stats taken from another process"""
+        if not stages or not self.enabled:
+            return
+        with self.lock:
+            for stage, other in stages.items():
+                stats = self.stages.get(stage)
+                if stats is None:
+                    self.stages[stage] = other
+                else:
+                    stats.merge(other)
+
+    def reset(self):
+        with self.lock:
+            self.stages = {}
+            self.resumes = 0
+            self.started = None
+            self.last_finished = None
+            self.marks.clear()
+            self.window_base = 0
+
+    def rate(self) -> float:
+        """Resumes per second over the last TELEMETRY_RATE_WINDOW seconds (less, early in a batch)"""
+        now = time.monotonic()
+        with self.lock:
+            if self.started is None:
+                return 0.0
+            self._drop_old_marks(now)
+            elapsed = min(TELEMETRY_RATE_WINDOW, now - self.started)
+            return (self.resumes - self.window_base) / elapsed if elapsed > 0 else 0.0
+
+    def overall_rate(self) -> float:
+        """Resumes per second from the start of the first batch to the last finished resume"""
+        with self.lock:
+            if self.started is None or self.last_finished is None:
+                return 0.0
+            elapsed = self.last_finished - self.started
+            return self.resumes / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """One line for a status bar: throughput, the slowest stage by p95, and failures"""
+        with self.lock:
+            stages = list(self.stages.items())
+            resumes = self.resumes
+        if not stages and not resumes:
+            return ""
+        parts = [f"{self.rate():.1f} docs/s"]
+        if stages:
+            stage, stats = max(stages, key=lambda item: item[1].quantile(0.95))
+            parts.append(f"slowest stage: {stage} p95 {stats.quantile(0.95) * 1000:.0f} ms")
+        failures = sum(stats.failures for _, stats in stages)
+        if failures:
+            parts.append(f"{failures} failures")
+        return " | ".join(parts)
+
+    def to_dict(self) -> Dict:
+        with self.lock:
+            stages = {stage: stats for stage, stats in sorted(self.stages.items())}
+            resumes = self.resumes
+        return {
+            'resumes': resumes,
+            'docs_per_second': round(self.overall_rate(), 3),
+            'stages': {
+                stage: {
+                    'count': stats.count,
+                    'failures': stats.failures,
+                    'total_seconds': round(stats.total, 6),
+                    **{f'p{round(q * 100)}_seconds': round(stats.quantile(q), 6) for q in QUANTILES},
+                    'slowest_files': [{'file_path': path, 'seconds': round(seconds, 6)}
+                                      for seconds, path in stats.slowest],
+                }
+                for stage, stats in stages.items()
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """Stats in the Prometheus text exposition format, for node_exporter's textfile collector"""
+        with self.lock:
+            stages = sorted(self.stages.items())
+            resumes = self.resumes
+        lines = ["# HELP resume_stage_seconds Time spent in each processing stage",
+                 "# TYPE resume_stage_seconds histogram"]
+        for stage, stats in stages:
+            cumulative = 0
+            for bound, count in zip(TELEMETRY_BUCKETS, stats.buckets):
+                cumulative += count
+                lines.append(f'resume_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'resume_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {stats.count}')
+            lines.append(f'resume_stage_seconds_sum{{stage="{stage}"}} {stats.total:.6f}')
+            lines.append(f'resume_stage_seconds_count{{stage="{stage}"}} {stats.count}')
+        lines += ["# HELP resume_stage_failures_total Failed runs of each processing stage",
+                  "# TYPE resume_stage_failures_total counter"]
+        lines += [f'resume_stage_failures_total{{stage="{stage}"}} {stats.failures}' for stage, stats in stages]
+        lines += ["# HELP resumes_processed_total Resumes processed",
+                  "# TYPE resumes_processed_total counter",
+                  f"resumes_processed_total {resumes}",
+                  "# HELP resumes_per_second Resumes processed per second since the first one",
+                  "# TYPE resumes_per_second gauge",
+                  f"resumes_per_second {self.overall_rate():.3f}"]
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str):
+        """Write the stats as Prometheus text (.prom) or JSON (anything else).
+
+        The file is replaced atomically, so a collector never reads half of it.
+        """
+        path = Path(path)
+        content = self.to_prometheus() if path.suffix == '.prom' else json.dumps(self.to_dict(), indent=2)
+        temp_path = path.with_name(path.name + '.tmp')
+        temp_path.write_text(content, encoding='utf-8')
+        os.replace(temp_path, path)
+
+
+# Shared by everything running in this process
+TELEMETRY = Telemetry()
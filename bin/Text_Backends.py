@@ -0,0 +1,500 @@
+import codecs
+import mmap
+import os
+import re
+import zipfile
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+from xml.etree import ElementTree
+
+from resume_config import PDF_TEXT_BACKEND, TEXT_ENCODINGS
+
+# Markers pdfminer leaves for glyphs it can't map to text
+_UNMAPPED_GLYPH = re.compile(r'\(cid:\d+\)|\ufffd')
+
+# A page looks broken when unmapped glyphs make up more than this share of
+# its characters, or single letters more than this share of its words
+_BROKEN_GLYPH_SHARE = 0.05
+_BROKEN_SINGLE_LETTER_SHARE = 0.5
+_MIN_WORDS_TO_JUDGE = 20
+
+# Formats without pages are streamed in blocks of about this many characters
+BLOCK_CHARS = 64 * 1024
+
+
+def looks_broken(text: str) -> bool:
+    """Whether extracted page text looks garbled: unmapped glyphs or letters split into single characters"""
+    if not text.strip():
+        return False
+    glyph_chars = sum(len(match) for match in _UNMAPPED_GLYPH.findall(text))
+    if glyph_chars > _BROKEN_GLYPH_SHARE * len(text):
+        return True
+    words = text.split()
+    if len(words) < _MIN_WORDS_TO_JUDGE:
+        return False
+    single_letters = sum(1 for word in words if len(word) == 1 and word.isalpha())
+    return single_letters > _BROKEN_SINGLE_LETTER_SHARE * len(words)
+
+
+def iter_blocks(lines: Iterable[str], block_chars: int = BLOCK_CHARS) -> Iterator[str]:
+    """Join lines into blocks of about block_chars, each ending on a whole line"""
+    block = []
+    size = 0
+    for line in lines:
+        block.append(line)
+        size += len(line) + 1
+        if size >= block_chars:
+            yield "\n".join(block)
+            block = []
+            size = 0
+    if block:
+        yield "\n".join(block)
+
+
+class TextBackend:
+    """Turns a document into text, one page (or block, for formats without pages) at a time"""
+    name = ''
+    # Whether max_pages counts real pages; block-streamed formats are read in full
+    page_limited = False
+
+    def iter_pages(self, file_path: Path, max_pages: int = None, first_page: int = 0) -> Iterator[str]:
+        """Yield the text of pages first_page up to (not including) max_pages"""
+        raise NotImplementedError
+
+
+class PdfMinerBackend(TextBackend):
+    """Plain text straight from pdfminer.six, without pdfplumber's char and line objects"""
+    name = 'pdfminer'
+    page_limited = True
+
+    def iter_pages(self, file_path: Path, max_pages: int = None, first_page: int = 0) -> Iterator[str]:
+        from io import StringIO
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        manager = PDFResourceManager(caching=True)
+        output = StringIO()
+        with open(file_path, 'rb') as fp, TextConverter(manager, output, laparams=LAParams()) as device:
+            interpreter = PDFPageInterpreter(manager, device)
+            for page in islice(PDFPage.get_pages(fp), first_page, max_pages):
+                interpreter.process_page(page)
+                # TextConverter separates text boxes with blank lines and ends pages with
+                # a form feed; drop both so lines follow each other as in pdfplumber's output
+                yield '\n'.join(line for line in output.getvalue().splitlines() if line.strip())
+                output.seek(0)
+                output.truncate()
+
+
+class PdfPlumberBackend(TextBackend):
+    """pdfplumber's extract_text, which clusters characters itself and copes with more layouts"""
+    name = 'pdfplumber'
+    page_limited = True
+
+    def iter_pages(self, file_path: Path, max_pages: int = None, first_page: int = 0) -> Iterator[str]:
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            for page in islice(pdf.pages, first_page, max_pages):
+                yield page.extract_text() or ''
+
+
+class FallbackBackend(TextBackend):
+    """Reads with a fast backend, switching to a fallback from the first page that looks broken"""
+    name = 'auto'
+    page_limited = True
+
+    def __init__(self, fast: TextBackend, fallback: TextBackend):
+        self.fast = fast
+        self.fallback = fallback
+
+    def iter_pages(self, file_path: Path, max_pages: int = None, first_page: int = 0) -> Iterator[str]:
+        page_number = first_page
+        for text in self.fast.iter_pages(file_path, max_pages, first_page):
+            if looks_broken(text):
+                yield from self.fallback.iter_pages(file_path, max_pages, page_number)
+                return
+            yield text
+            page_number += 1
+
+
+class DocxBackend(TextBackend):
+    """Paragraph text streamed from a DOCX's XML parts, without building python-docx objects.
+    
+    The body comes first, then headers, then footers, so header text such
+    as a company name is never taken for the first lines of the resume.
+    Paragraphs, text boxes included, are emitted in document order, one per
+    line. A table row is one line with its cells separated by tabs, as
+    python-docx readers lay it out, so a label stays next to its value.
+    """
+    name = 'docx'
+
+    def iter_pages(self, file_path: Path, max_pages: int = None, first_page: int = 0) -> Iterator[str]:
+        return islice(iter_blocks(iter_docx_paragraphs(file_path)), first_page, max_pages)
+
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_PARAGRAPH = _W + 'p'
+_TEXT = _W + 't'
+_TAB = _W + 'tab'
+_BREAKS = (_W + 'br', _W + 'cr')
+_PARAGRAPH_PROPERTIES = _W + 'pPr'
+_TABLE = _W + 'tbl'
+_ROW = _W + 'tr'
+_CELL = _W + 'tc'
+# Text boxes are stored twice, as DrawingML and as a VML fallback; only the first is read
+_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+_HEADER_PART = re.compile(r'word/header(\d*)\.xml')
+_FOOTER_PART = re.compile(r'word/footer(\d*)\.xml')
+
+
+def _numbered_parts(names: Iterable[str], pattern: re.Pattern) -> List[str]:
+    """Part names matching pattern, by their number: header2.xml comes before header10.xml"""
+    numbered = []
+    for name in names:
+        match = pattern.fullmatch(name)
+        if match:
+            numbered.append((int(match.group(1) or 0), name))
+    return [name for _, name in sorted(numbered)]
+
+
+def iter_docx_paragraphs(file_path: Path) -> Iterator[str]:
+    """Text of every paragraph in a DOCX's body, headers and footers, read straight from the zip"""
+    with zipfile.ZipFile(file_path) as archive:
+        names = archive.namelist()
+        parts = (['word/document.xml']
+                 + _numbered_parts(names, _HEADER_PART)
+                 + _numbered_parts(names, _FOOTER_PART))
+        for part in parts:
+            if part in names:
+                with archive.open(part) as xml:
+                    yield from _iter_part_paragraphs(xml)
+
+
+def _iter_part_paragraphs(xml) -> Iterator[str]:
+    open_paragraphs = []  # text runs of the paragraphs being read; nested for text boxes
+    open_rows = []  # per table row being read, its cells' paragraphs; nested for tables in cells
+    skipped = 0
+    in_properties = 0
+
+    def finish(text: str) -> Iterator[str]:
+        # Inside a table cell, text joins the cell's row instead of becoming a line
+        if open_rows and open_rows[-1]:
+            open_rows[-1][-1].append(text)
+        else:
+            yield text
+
+    for event, element in ElementTree.iterparse(xml, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if tag == _FALLBACK:
+                skipped += 1
+            elif skipped:
+                continue
+            elif tag == _PARAGRAPH_PROPERTIES:
+                in_properties += 1
+            elif tag == _PARAGRAPH:
+                open_paragraphs.append([])
+            elif tag == _ROW:
+                open_rows.append([])
+            elif tag == _CELL and open_rows:
+                open_rows[-1].append([])
+            continue
+
+        if tag == _FALLBACK:
+            skipped -= 1
+            element.clear()
+        elif skipped:
+            continue
+        elif tag == _PARAGRAPH_PROPERTIES:
+            in_properties -= 1
+        elif tag == _TABLE:
+            element.clear()
+        elif tag == _ROW:
+            cells = open_rows.pop()
+            yield from finish('\t'.join(' '.join(text for text in cell if text) for cell in cells))
+        elif not open_paragraphs:
+            continue
+        elif tag == _TEXT:
+            open_paragraphs[-1].append(element.text or '')
+        elif tag == _TAB and not in_properties:
+            open_paragraphs[-1].append('\t')
+        elif tag in _BREAKS:
+            open_paragraphs[-1].append('\n')
+        elif tag == _PARAGRAPH:
+            yield from finish(''.join(open_paragraphs.pop()))
+            # Drop what has been read so memory stays flat on long documents
+            element.clear()
+
+
+class OdtBackend(TextBackend):
+    """Paragraphs and headings streamed from an ODT's content.xml, tables and frames included"""
+    name = 'odt'
+
+    def iter_pages(self, file_path: Path, max_pages: int = None, first_page: int = 0) -> Iterator[str]:
+        return islice(iter_blocks(iter_odt_paragraphs(file_path)), first_page, max_pages)
+
+
+_TEXT_NS = '{urn:oasis:names:tc:opendocument:xmlns:text:1.0}'
+_ODT_PARAGRAPHS = (_TEXT_NS + 'p', _TEXT_NS + 'h')
+_ODT_SPACES = _TEXT_NS + 's'
+_ODT_TAB = _TEXT_NS + 'tab'
+_ODT_LINE_BREAK = _TEXT_NS + 'line-break'
+
+
+def _odt_text(element, parts: list):
+    """Text of an ODT paragraph, leaving out paragraphs nested in it (they are emitted on their own)"""
+    if element.text:
+        parts.append(element.text)
+    for child in element:
+        if child.tag == _ODT_SPACES:
+            parts.append(' ' * int(child.get(_TEXT_NS + 'c', 1)))
+        elif child.tag == _ODT_TAB:
+            parts.append('\t')
+        elif child.tag == _ODT_LINE_BREAK:
+            parts.append('\n')
+        elif child.tag not in _ODT_PARAGRAPHS:
+            _odt_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def iter_odt_paragraphs(file_path: Path) -> Iterator[str]:
+    """Text of every paragraph and heading in an ODT body, read straight from the zip"""
+    with zipfile.ZipFile(file_path) as archive, archive.open('content.xml') as xml:
+        depth = 0
+        for event, element in ElementTree.iterparse(xml, events=('start', 'end')):
+            if element.tag not in _ODT_PARAGRAPHS:
+                continue
+            if event == 'start':
+                depth += 1
+                continue
+            depth -= 1
+            parts = []
+            _odt_text(element, parts)
+            yield ''.join(parts)
+            # Nested paragraphs keep their tails until the outermost one has been read
+            if depth == 0:
+                element.clear()
+
+
+class PlainTextBackend(TextBackend):
+    """Memory-mapped text file, decoded block by block in the first TEXT_ENCODINGS entry that fits"""
+    name = 'txt'
+
+    def iter_pages(self, file_path: Path, max_pages: int = None, first_page: int = 0) -> Iterator[str]:
+        return islice(self._iter_blocks(file_path), first_page, max_pages)
+
+    def _iter_blocks(self, file_path: Path) -> Iterator[str]:
+        with open(file_path, 'rb') as f:
+            if not os.fstat(f.fileno()).st_size:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                encoding, start = detect_encoding(data[:BLOCK_CHARS])
+                decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+                carry = ''
+                for offset in range(start, len(data), BLOCK_CHARS):
+                    text = (carry + decoder.decode(data[offset:offset + BLOCK_CHARS])).replace('\r\n', '\n')
+                    # Blocks end on a whole line so patterns never see a line cut in two
+                    cut = text.rfind('\n') + 1
+                    if cut:
+                        yield text[:cut - 1]
+                    carry = text[cut:]
+                carry += decoder.decode(b'', final=True)
+                if carry:
+                    yield carry
+
+
+_BOMS = [
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+
+
+def detect_encoding(sample: bytes):
+    """(encoding, bytes to skip) for a text file, from its byte order mark or the first encoding that decodes the sample"""
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding, len(bom)
+    for encoding in TEXT_ENCODINGS:
+        try:
+            # Not final: the sample may end part-way through a character
+            codecs.getincrementaldecoder(encoding)().decode(sample)
+        except UnicodeDecodeError:
+            continue
+        return encoding, 0
+    return TEXT_ENCODINGS[-1], 0
+
+
+class RtfBackend(TextBackend):
+    """Body text of an RTF file, tokenized straight off a memory map"""
+    name = 'rtf'
+
+    def iter_pages(self, file_path: Path, max_pages: int = None, first_page: int = 0) -> Iterator[str]:
+        return islice(iter_blocks(iter_rtf_lines(file_path)), first_page, max_pages)
+
+
+_RTF_TOKEN = re.compile(rb"\\([a-zA-Z]+)(-?\d+)? ?|\\'([0-9a-fA-F]{2})|\\(.)|([{}])|([^\\{}\r\n]+)", re.DOTALL)
+
+# Groups whose content is formatting or metadata rather than text
+_RTF_SKIPPED_DESTINATIONS = {
+    b'fonttbl', b'colortbl', b'stylesheet', b'info', b'pict', b'object', b'themedata',
+    b'colorschememapping', b'latentstyles', b'datastore', b'xmlnstbl', b'listtable',
+    b'listoverridetable', b'rsidtbl', b'generator', b'filetbl', b'revtbl', b'header',
+    b'footer', b'headerl', b'headerr', b'headerf', b'footerl', b'footerr', b'footerf',
+}
+_RTF_LINE_ENDS = {b'par', b'line', b'row', b'sect', b'page'}
+_RTF_CHARACTERS = {b'tab': '\t', b'cell': '\t', b'emdash': '\u2014', b'endash': '\u2013',
+                   b'lquote': '\u2018', b'rquote': '\u2019', b'ldblquote': '\u201c', b'rdblquote': '\u201d',
+                   b'bullet': '\u2022'}
+
+
+def iter_rtf_lines(file_path: Path) -> Iterator[str]:
+    """Lines of body text in an RTF file; headers, footers and other destinations are skipped"""
+    with open(file_path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from _parse_rtf(data)
+
+
+def _rtf_codec(codepage: str) -> str:
+    try:
+        return codecs.lookup(codepage).name
+    except LookupError:
+        return 'cp1252'
+
+
+def _parse_rtf(data) -> Iterator[str]:
+    codepage = 'cp1252'
+    stack = []
+    skipping = False
+    unicode_skip = 1  # ANSI fallback characters written after each \uN
+    pending_skip = 0
+    line = []
+    raw = bytearray()  # \'hh bytes, decoded together so multi-byte code pages work
+
+    def flush_raw():
+        if raw:
+            line.append(raw.decode(codepage, errors='replace'))
+            raw.clear()
+
+    for match in _RTF_TOKEN.finditer(data):
+        word, argument, hex_byte, symbol, brace, text = match.groups()
+
+        if pending_skip:
+            if hex_byte:
+                pending_skip -= 1
+                continue
+            if text:
+                dropped = min(pending_skip, len(text))
+                text = text[dropped:]
+                pending_skip -= dropped
+                if not text:
+                    continue
+            else:
+                pending_skip = 0
+
+        if brace == b'{':
+            stack.append((skipping, unicode_skip))
+        elif brace == b'}':
+            if stack:
+                skipping, unicode_skip = stack.pop()
+        elif skipping:
+            continue
+        elif hex_byte:
+            raw.append(int(hex_byte, 16))
+        elif word:
+            flush_raw()
+            if word in _RTF_SKIPPED_DESTINATIONS:
+                skipping = True
+            elif word == b'ansicpg' and argument:
+                codepage = _rtf_codec(f'cp{int(argument)}')
+            elif word == b'uc' and argument:
+                unicode_skip = int(argument)
+            elif word == b'u' and argument:
+                line.append(chr(int(argument) % 0x10000))
+                pending_skip = unicode_skip
+            elif word in _RTF_LINE_ENDS:
+                yield ''.join(line)
+                line = []
+            elif word in _RTF_CHARACTERS:
+                line.append(_RTF_CHARACTERS[word])
+        elif symbol:
+            flush_raw()
+            if symbol == b'*':
+                # Destinations marked \* are optional and never body text
+                skipping = True
+            elif symbol in (b'\n', b'\r'):
+                yield ''.join(line)
+                line = []
+            elif symbol in (b'\\', b'{', b'}'):
+                line.append(symbol.decode('ascii'))
+            elif symbol == b'~':
+                line.append('\u00a0')
+        elif text:
+            flush_raw()
+            line.append(text.decode(codepage, errors='replace'))
+
+    flush_raw()
+    if line:
+        yield ''.join(line)
+
+
+PDF_BACKENDS: Dict[str, TextBackend] = {
+    'pdfminer': PdfMinerBackend(),
+    'pdfplumber': PdfPlumberBackend(),
+}
+PDF_BACKENDS['auto'] = FallbackBackend(PDF_BACKENDS['pdfminer'], PDF_BACKENDS['pdfplumber'])
+
+# Backend for each sniffed format; 'pdf' resolves through PDF_BACKENDS
+FORMAT_BACKENDS: Dict[str, TextBackend] = {
+    'docx': DocxBackend(),
+    'odt': OdtBackend(),
+    'rtf': RtfBackend(),
+    'txt': PlainTextBackend(),
+}
+
+# Extensions offered for each format, used when a file's contents don't settle it
+FORMAT_EXTENSIONS = {
+    'pdf': ('.pdf',),
+    'docx': ('.docx',),
+    'odt': ('.odt',),
+    'rtf': ('.rtf',),
+    'txt': ('.txt',),
+}
+SUPPORTED_EXTENSIONS = tuple(extension for extensions in FORMAT_EXTENSIONS.values() for extension in extensions)
+
+_ODT_MIMETYPE = b'mimetypeapplication/vnd.oasis.opendocument.text'
+
+
+def sniff_format(file_path) -> Optional[str]:
+    """Format of a file from its first bytes, falling back to its extension"""
+    suffix = Path(file_path).suffix.lower()
+    with open(file_path, 'rb') as f:
+        head = f.read(len(_ODT_MIMETYPE) + 30)
+
+    if head.startswith(b'%PDF-'):
+        return 'pdf'
+    if head.startswith(b'{\\rtf'):
+        return 'rtf'
+    if head.startswith(b'PK\x03\x04'):
+        # ODF packages store an uncompressed mimetype entry first; anything else zipped is taken as DOCX
+        if head[30:].startswith(_ODT_MIMETYPE):
+            return 'odt'
+        return 'docx'
+    for format_name, extensions in FORMAT_EXTENSIONS.items():
+        if suffix in extensions:
+            return format_name
+    return None
+
+
+def backend_for(file_path, pdf_backend: str = None) -> Optional[TextBackend]:
+    """Backend that reads this file, or None for unsupported types; pdf_backend overrides PDF_TEXT_BACKEND"""
+    format_name = sniff_format(file_path)
+    if format_name == 'pdf':
+        return PDF_BACKENDS[pdf_backend or PDF_TEXT_BACKEND]
+    return FORMAT_BACKENDS.get(format_name)
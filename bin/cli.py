@@ -0,0 +1,158 @@
+"""Headless batch processing: streams one JSON line per processed resume.
+
+Never imports PyQt6, so it can run from cron jobs and containers:
+
+    python bin/cli.py resumes/ extra.pdf --role engineer --min-age 25 -j 8 > results.jsonl
+
+-o can be given more than once, and each file gets the format its
+extension asks for: CSV (.csv), an Excel workbook (.xlsx), or JSON lines.
+Rows are written as resumes finish, so an import can pick them up while a
+batch still runs; an XLSX workbook is complete once the run ends:
+
+    python bin/cli.py resumes/ -o candidates.csv -o candidates.xlsx
+
+With --watch, the given directories are processed and then watched: every
+resume that arrives or changes later is processed and appended as another
+line, until interrupted (an XLSX workbook is written afresh instead). A
+changed resume appears again under the same file_path, and its latest line
+wins:
+
+    python bin/cli.py inbox/ --watch -o results.jsonl
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from Batch_Processor import iter_processed_resumes, default_worker_count
+from Extraction_Cache import DEFAULT_CACHE_PATH
+from Folder_Watcher import FolderWatcher
+from Result_Sinks import SINK_FORMATS, open_sink
+from Telemetry import TELEMETRY
+from Text_Backends import SUPPORTED_EXTENSIONS
+from resume_config import NER_BATCH_SIZE, NER_PROCESSES, WATCH_POLL_INTERVAL
+
+
+
+def iter_resume_paths(paths: List[str]) -> Iterator[str]:
+    """Expand the given files and directories into resume file paths"""
+    for path in map(Path, paths):
+        if path.is_dir():
+            for child in sorted(path.rglob('*')):
+                if child.is_file() and child.suffix.lower() in SUPPORTED_EXTENSIONS:
+                    yield str(child)
+        elif path.is_file():
+            yield str(path)
+        else:
+            print(f"Skipping missing path: {path}", file=sys.stderr)
+
+
+def criteria_from_args(args) -> Dict:
+    """Build the filtering criteria dictionary from the parsed options"""
+    criteria = {
+        'min_age': args.min_age,
+        'max_age': args.max_age,
+        'location': args.location,
+        'role': args.role,
+        'education': args.education,
+        'nationality': args.nationality,
+    }
+    return {key: value for key, value in criteria.items() if value is not None}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Extract candidate profiles from resumes as JSON lines")
+    parser.add_argument('paths', nargs='+', help="Resume files or directories to scan")
+    parser.add_argument('-o', '--output', action='append', default=[],
+                        help="Write results to this file instead of stdout, as CSV for .csv, "
+                             "an Excel workbook for .xlsx, else JSON lines; may be repeated")
+    parser.add_argument('--format', choices=[fmt for fmt in SINK_FORMATS if fmt != 'xlsx'], default='jsonl',
+                        help="Format written to stdout when no --output is given (default: %(default)s)")
+    parser.add_argument('-j', '--workers', type=int, default=default_worker_count(),
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument('--cache', default=str(DEFAULT_CACHE_PATH),
+                        help="Extraction cache database (default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true', help="Disable the extraction cache")
+    parser.add_argument('--ner-batch-size', type=int, default=NER_BATCH_SIZE,
+                        help="Resumes per nlp.pipe batch (default: %(default)s)")
+    parser.add_argument('--ner-processes', type=int, default=NER_PROCESSES,
+                        help="Processes used by nlp.pipe when --workers is 1 (default: %(default)s)")
+    parser.add_argument('--no-dedupe', action='store_true',
+                        help="Analyse every resume, even one duplicating an earlier resume of the batch")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep watching the given directories and process resumes as they arrive or change")
+    parser.add_argument('--poll-interval', type=float, default=WATCH_POLL_INTERVAL,
+                        help="Seconds between directory scans when inotify is unavailable (default: %(default)s)")
+    parser.add_argument('--telemetry',
+                        help="Write per-stage timings to this file when done (and after every watched batch): "
+                             "Prometheus text for .prom, else JSON")
+
+    criteria = parser.add_argument_group("filtering criteria")
+    criteria.add_argument('--min-age', type=int)
+    criteria.add_argument('--max-age', type=int)
+    criteria.add_argument('--location')
+    criteria.add_argument('--role')
+    criteria.add_argument('--education')
+    criteria.add_argument('--nationality')
+    return parser
+
+
+def iter_watched_batches(args) -> Iterator[List[str]]:
+    """Lists of resume paths that appeared or changed in the watched directories; never ends"""
+    directories = [path for path in args.paths if Path(path).is_dir()]
+    for path in set(args.paths) - set(directories):
+        print(f"Skipping {path}: only directories can be watched", file=sys.stderr)
+    watcher = FolderWatcher(directories, poll_interval=args.poll_interval)
+    try:
+        yield from watcher
+    finally:
+        watcher.close()
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    criteria = criteria_from_args(args)
+    cache_path = None if args.no_cache else args.cache
+    batches = iter_watched_batches(args) if args.watch else [list(iter_resume_paths(args.paths))]
+
+    sinks = []
+    try:
+        if args.output:
+            for path in args.output:
+                sinks.append(open_sink(path, append=args.watch))
+        else:
+            sinks.append(open_sink(None, args.format))
+    except OSError as e:
+        for sink in sinks:
+            sink.close()
+        print(f"Cannot open output: {e}", file=sys.stderr)
+        return 1
+    
+    try:
+        for file_paths in batches:
+            # A pool only pays for its start-up on batches bigger than one NER batch
+            workers = args.workers if len(file_paths) > args.ner_batch_size or not args.watch else 1
+            profiles = iter_processed_resumes(file_paths, criteria, workers, cache_path,
+                                              args.ner_batch_size, args.ner_processes,
+                                              dedupe=not args.no_dedupe)
+            for profile in profiles:
+                for sink in sinks:
+                    sink.write([profile])
+            if args.telemetry:
+                TELEMETRY.export(args.telemetry)
+    except KeyboardInterrupt:
+        if not args.watch:
+            raise
+    finally:
+        for sink in sinks:
+            sink.close()
+    
+    summary = TELEMETRY.summary()
+    if summary:
+        print(summary, file=sys.stderr)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
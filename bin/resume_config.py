@@ -2,6 +2,108 @@
 # Contains all lists, patterns, and mappings used in resume processing
 import re
 
+# spaCy model used for named entity recognition
+SPACY_MODEL = "en_core_web_sm"
+
+# Batched NER settings: resumes per nlp.pipe batch and processes used by nlp.pipe
+NER_BATCH_SIZE = 32
+NER_PROCESSES = 1
+
+# Characters fed to NER per purpose: the header window searched for names
+# and the header plus location-labelled lines searched for places
+NAME_WINDOW_CHARS = 800
+NAME_ENTITY_MAX_START = 300
+LOCATION_HEADER_CHARS = 600
+LOCATION_WINDOW_CHARS = 2000
+LOCATION_HINT_PATTERN = re.compile(r'\b(?:address|location|residence|city|country|based|lives?|resident)\b', re.IGNORECASE)
+
+# PDF pages read per resume. PDF_MAX_PAGES caps them (None reads them all);
+# pages past the cap are dropped without notice, so only set it when long
+# PDFs are known to hold nothing but appendices. Reading also stops once every
+# PDF_STOP_FIELDS field has been found without NER, checked after pages 1, 2,
+# 4, 8, ... The list holds the fields nearly every resume has: one that is
+# often absent, like age, would keep every page being read, and one left out
+# (age, residence, nationality) is only searched for in the pages read by
+# then, which hold the personal details on all but unusual layouts. An empty
+# list reads every page. Formats without pages are always read in full
+PDF_MAX_PAGES = None
+PDF_STOP_FIELDS = ['name', 'email', 'phone', 'education', 'current_role']
+
+# Backend that turns PDFs into text: 'pdfplumber', 'pdfminer' (plain text
+# straight from pdfminer.six: faster, but it reads table-layout CVs column by
+# column, parting labels from their values), or 'auto' (pdfminer, switching to
+# pdfplumber from the first page whose text looks garbled, which does not catch
+# reordered text). Only leave pdfplumber once benchmarks/pdf_backends.py shows
+# that on a sample of your resumes every file keeps at least
+# PDF_FAST_MIN_SIMILARITY of pdfplumber's word order
+PDF_TEXT_BACKEND = 'pdfplumber'
+PDF_FAST_MIN_SIMILARITY = 0.95
+
+# Encodings tried, in order, on text files without a byte order mark
+TEXT_ENCODINGS = ['utf-8', 'cp1256', 'latin-1']
+
+# Seconds one pattern may spend scanning one resume before it is cut off
+REGEX_TIME_BUDGET = 0.5
+
+# Processing thread signalling: results reach the GUI in lists of up to
+# RESULT_BATCH_SIZE profiles, at least every RESULT_BATCH_INTERVAL_MS while
+# results keep coming; progress is reported at most every PROGRESS_INTERVAL_MS
+RESULT_BATCH_SIZE = 200
+RESULT_BATCH_INTERVAL_MS = 100
+PROGRESS_INTERVAL_MS = 250
+
+# Watch mode: inbox directories are rescanned every WATCH_POLL_INTERVAL seconds
+# when inotify is unavailable, or while a file is still being written; a file
+# is read once it is unchanged between two scans or WATCH_SETTLE_SECONDS old
+WATCH_POLL_INTERVAL = 2.0
+WATCH_SETTLE_SECONDS = 2.0
+
+# Multi-worker batches run as a staged pipeline: read (threads) -> parse and
+# analyse (worker processes) -> score -> results, joined by queues holding at
+# most PIPELINE_QUEUE_SIZE resumes so memory stays flat however fast reading
+# is. The concurrency settings are tasks in flight per stage; None means one
+# per worker process. Set STAGED_PIPELINE = False for plain chunked workers
+STAGED_PIPELINE = True
+PIPELINE_QUEUE_SIZE = 64
+PIPELINE_READ_CONCURRENCY = 8
+PIPELINE_PARSE_CONCURRENCY = None
+PIPELINE_ANALYSE_CONCURRENCY = None
+# Longest an NER batch waits to fill up before it is analysed part-full
+PIPELINE_BATCH_WAIT_MS = 50
+
+# Stage telemetry: latencies are counted into histogram buckets with these
+# upper bounds in seconds; the live docs/sec covers the last
+# TELEMETRY_RATE_WINDOW seconds, and the TELEMETRY_SLOW_FILES slowest files
+# are kept per stage
+TELEMETRY_ENABLED = True
+TELEMETRY_BUCKETS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+TELEMETRY_RATE_WINDOW = 10.0
+TELEMETRY_SLOW_FILES = 10
+
+# CV export: only candidates scoring at least EXPORT_MIN_MATCH_SCORE are
+# exported. The template is parsed once per process; exports of at least
+# EXPORT_PARALLEL_MIN CVs are filled in EXPORT_WORKERS processes (None = one
+# per core), EXPORT_CHUNK_SIZE CVs per task
+EXPORT_TEMPLATE_PATH = "temp.docx"
+EXPORT_MIN_MATCH_SCORE = 0.4
+EXPORT_WORKERS = None
+EXPORT_CHUNK_SIZE = 50
+EXPORT_PARALLEL_MIN = 100
+
+# Near-duplicate resumes: right after text extraction, a resume whose words
+# match an earlier one in the batch reuses that first copy's fields instead
+# of being analysed. One sharing an estimated DEDUPE_SIMILARITY of their
+# DEDUPE_SHINGLE_WORDS-word runs with it is only reported as a duplicate and
+# analysed in full, since another candidate on the same template differs in
+# a few fields at most. Runs of single words would measure shared
+# vocabulary, not shared text. DEDUPE_SIGNATURE_SIZE MinHash values per
+# resume are looked up in DEDUPE_BANDS bands (the size must divide evenly)
+DEDUPE_RESUMES = True
+DEDUPE_SIMILARITY = 0.8
+DEDUPE_SHINGLE_WORDS = 3
+DEDUPE_SIGNATURE_SIZE = 64
+DEDUPE_BANDS = 16
+
 EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
 PHONE_PATTERN = re.compile(r'[\+]?[1-9]?[0-9]{7,14}')
 AGE_PATTERN = re.compile(r'\b(?:age|years old|yr old)\s*:?\s*(\d{1,2})\b', re.IGNORECASE)
@@ -279,6 +381,44 @@ FALSE_POSITIVE_NAMES = {
 # CV section headers
 CV_SECTIONS = ['qualification', 'education', 'experience', 'contact']
 
+# Section header lines the segmenter splits resumes on; letter-spaced forms
+# like "E D U C A T I O N" and stretched Arabic headers match too
+SECTION_HEADERS = {
+    'contact': [
+        'contact', 'contact information', 'contact info', 'contact details', 'personal information',
+        'personal info', 'personal details', 'personal data', 'البيانات الشخصية', 'بيانات شخصية',
+        'المعلومات الشخصية', 'معلومات الاتصال', 'بيانات الاتصال',
+    ],
+    'education': [
+        'education', 'educational background', 'education and training', 'academic background',
+        'academic qualification', 'academic qualifications', 'educational qualifications',
+        'qualification', 'qualifications', 'التعليم', 'المؤهلات العلمية', 'المؤهالت العلمية',
+        'المؤهل العلمي', 'المؤهل الدراسي',
+    ],
+    'experience': [
+        'experience', 'experiences', 'work experience', 'professional experience', 'employment',
+        'employment history', 'work history', 'career history', 'practical experience',
+        'الخبرة', 'الخبرات', 'الخبرة العملية', 'الخبرات العملية',
+    ],
+    'other': [
+        'skills', 'technical skills', 'computer skills', 'languages', 'language skills',
+        'certifications', 'certificates', 'courses', 'training', 'training courses', 'projects',
+        'references', 'hobbies', 'interests', 'summary', 'professional summary', 'objective',
+        'career objective', 'profile', 'achievements', 'awards', 'activities',
+        'المهارات', 'اللغات', 'الدورات التدريبية', 'الشهادات', 'الهوايات',
+    ],
+}
+
+# Sections each field extractor scans before falling back to the whole resume;
+# 'header' is the text above the first section header
+FIELD_SECTIONS = {
+    'name': ['header', 'contact'],
+    'current_residence': ['header', 'contact'],
+    'nationality': ['contact', 'header'],
+    'education': ['education'],
+    'current_role': ['experience', 'header', 'contact'],
+}
+
 # Education/degree patterns
 EDUCATION_KEYWORDS = {
     'degree', 'bachelor', 'master', 'phd', 'diploma', 'certificate', 'b.sc', 'b.eng', 'b.a', 'm.sc', 'm.eng', 'm.a', 'dvm', 'd.v.m',
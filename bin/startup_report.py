@@ -0,0 +1,76 @@
+"""Startup-time report: import time per module for the GUI entry point.
+
+Runs the import in a fresh interpreter with ``-X importtime`` and prints the
+slowest top-level packages. Exits non-zero when the total import time goes
+over ``--budget-ms`` or when a module that should load lazily is imported
+at startup, so it can guard against startup regressions:
+
+    python bin/startup_report.py --budget-ms 400
+"""
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Heavy modules that must only be imported on first use
+LAZY_MODULES = ('spacy', 'pdfplumber', 'pdfminer', 'docx', 'docx2pdf')
+
+
+def measure_imports(module: str) -> List[Tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for every import made by `import module`"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=str(Path(__file__).resolve().parent),
+        capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "import failed")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def summarize(imports: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """Total self time per top-level package, in microseconds"""
+    totals = defaultdict(int)
+    for name, self_us, _ in imports:
+        totals[name.split('.')[0]] += self_us
+    return dict(totals)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report import time per module at startup")
+    parser.add_argument('--module', default='GUI', help="Module imported at startup (default: %(default)s)")
+    parser.add_argument('--top', type=int, default=15, help="Number of packages to list")
+    parser.add_argument('--budget-ms', type=float, help="Fail when total import time exceeds this")
+    args = parser.parse_args(argv)
+
+    imports = measure_imports(args.module)
+    totals = summarize(imports)
+    total_ms = sum(totals.values()) / 1000
+
+    print(f"{'package':<30}{'import ms':>12}")
+    for package, self_us in sorted(totals.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{package:<30}{self_us / 1000:>12.1f}")
+    print(f"{'total':<30}{total_ms:>12.1f}")
+
+    failed = False
+    eager = sorted(set(totals) & set(LAZY_MODULES))
+    if eager:
+        print(f"Imported at startup but should load lazily: {', '.join(eager)}")
+        failed = True
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"Startup imports took {total_ms:.1f} ms, over the {args.budget_ms:.1f} ms budget")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())